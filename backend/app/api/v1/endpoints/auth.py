@@ -4,12 +4,23 @@ Endpoints pour l'authentification
 Ce fichier contient:
 - POST /inscription - Créer un nouveau compte utilisateur
 - POST /connexion - Se connecter et obtenir un token JWT
+
+Les deux endpoints sont async et utilisent la session async (get_async_db) :
+bcrypt tourne dans le pool borné de app.core.auth (503 s'il est saturé),
+aucun thread du threadpool partagé n'est occupé pendant le hashage.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.auth import hash_password, verify_password, create_access_token
+from app.core.database import get_async_db
+from app.core.auth import (
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
+    create_access_token,
+    invalidate_cached_user
+)
 from app.models.utilisateur import Utilisateur
 from app.schemas.auth import (
     UtilisateurInscription,
@@ -32,9 +43,9 @@ router = APIRouter()
     summary="Créer un nouveau compte utilisateur",
     description="Inscrit un nouvel utilisateur et retourne un token JWT"
 )
-def inscription(
+async def inscription(
     user_data: UtilisateurInscription,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Créer un nouveau compte utilisateur et recevoir un token JWT
@@ -64,9 +75,10 @@ def inscription(
     """
     
     # 1. Vérifier si l'utilisateur existe déjà
-    existing_user = db.query(Utilisateur).filter(
-        Utilisateur.nom_utilisateur == user_data.nom_utilisateur
-    ).first()
+    result = await db.execute(
+        select(Utilisateur).where(Utilisateur.nom_utilisateur == user_data.nom_utilisateur)
+    )
+    existing_user = result.scalar_one_or_none()
     
     if existing_user:
         raise HTTPException(
@@ -75,7 +87,7 @@ def inscription(
         )
     
     # 2. Hasher le mot de passe
-    hashed_password = hash_password(user_data.mot_de_passe)
+    hashed_password = await hash_password_async(user_data.mot_de_passe)
     
     # 3. Créer le nouvel utilisateur
     new_user = Utilisateur(
@@ -85,8 +97,8 @@ def inscription(
     
     # 4. Sauvegarder en base de données
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)  # Récupérer l'ID et date_creation générés
+    await db.commit()
+    await db.refresh(new_user)  # Récupérer l'ID et date_creation générés
     
     # 5. Créer un token JWT pour l'utilisateur (connexion automatique)
     access_token = create_access_token(
@@ -110,9 +122,9 @@ def inscription(
     summary="Se connecter et obtenir un token JWT",
     description="Authentifie un utilisateur et retourne un token JWT"
 )
-def connexion(
+async def connexion(
     credentials: UtilisateurConnexion,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Se connecter et obtenir un token JWT
@@ -146,9 +158,10 @@ def connexion(
     """
     
     # 1. Chercher l'utilisateur dans la base de données
-    user = db.query(Utilisateur).filter(
-        Utilisateur.nom_utilisateur == credentials.nom_utilisateur
-    ).first()
+    result = await db.execute(
+        select(Utilisateur).where(Utilisateur.nom_utilisateur == credentials.nom_utilisateur)
+    )
+    user = result.scalar_one_or_none()
     
     # 2. Vérifier que l'utilisateur existe
     if not user:
@@ -159,13 +172,20 @@ def connexion(
         )
     
     # 3. Vérifier le mot de passe
-    if not verify_password(credentials.mot_de_passe, user.mot_de_passe_hash):
+    if not await verify_password_async(credentials.mot_de_passe, user.mot_de_passe_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nom d'utilisateur ou mot de passe incorrect",
             headers={"WWW-Authenticate": "Bearer"}
         )
     
+    # 3b. BCRYPT_ROUNDS a changé depuis la création du hash : on re-hashe
+    #     avec le nouveau coût (seul moment où le mot de passe est connu)
+    if needs_rehash(user.mot_de_passe_hash):
+        user.mot_de_passe_hash = await hash_password_async(credentials.mot_de_passe)
+        await db.commit()
+        invalidate_cached_user(user.nom_utilisateur)
+    
     # 4. Créer le token JWT
     access_token = create_access_token(
         data={
@@ -0,0 +1,233 @@
+"""
+Endpoints d'export en flux (NDJSON / CSV)
+
+Routes disponibles :
+- GET /exports/player-game-scores : Scores fantasy par match (PlayerGameScore)
+- GET /exports/team-scores : Scores quotidiens des équipes (FantasyTeamScore)
+
+Pour les analyses sur une saison complète, sans pagination :
+- Les lignes sont lues par paquets de EXPORT_CHUNK_ROWS avec yield_per
+  (curseur côté serveur en PostgreSQL : la requête n'est jamais chargée
+  entièrement en mémoire)
+- Chaque paquet est encodé puis envoyé aussitôt (Transfer-Encoding: chunked)
+- Mémoire constante quel que soit le nombre de lignes exportées
+
+Formats :
+- ndjson : un objet JSON par ligne (application/x-ndjson)
+- csv : en-tête + une ligne par score (text/csv)
+"""
+import csv
+import io
+from datetime import date
+from enum import Enum
+from typing import Iterator, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.models.utilisateur import Utilisateur
+from app.models.player import Player
+from app.models.player_game_score import PlayerGameScore
+from app.models.player_team_history import PlayerTeamHistory
+from app.models.fantasy_team import FantasyTeam
+from app.models.fantasy_team_score import FantasyTeamScore
+
+router = APIRouter(prefix="/exports", tags=["📤 Exports"])
+
+# Nombre de lignes lues (et envoyées) par paquet
+EXPORT_CHUNK_ROWS = 1000
+
+
+class ExportFormat(str, Enum):
+    """Formats d'export disponibles"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+# ========================================
+# ENCODAGE EN FLUX
+# ========================================
+
+def stream_rows(db: Session, statement, columns: list, export_format: ExportFormat) -> Iterator[bytes]:
+    """
+    Exécute la requête avec yield_per et encode chaque paquet de lignes
+
+    Args:
+        db: Session de base de données
+        statement: SELECT de colonnes (pas d'entités ORM : rien ne s'accumule
+                   dans l'identity map de la session)
+        columns: Noms des colonnes, dans l'ordre du SELECT
+        export_format: ndjson ou csv
+
+    Yields:
+        Un bloc d'octets par paquet de EXPORT_CHUNK_ROWS lignes
+    """
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue().encode()
+
+    result = db.execute(statement.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+
+    for partition in result.partitions():
+        if export_format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(partition)
+            yield buffer.getvalue().encode()
+        else:
+            yield b"".join(
+                orjson.dumps(dict(zip(columns, row))) + b"\n"
+                for row in partition
+            )
+
+
+def export_response(db: Session, statement, export_format: ExportFormat, filename: str) -> StreamingResponse:
+    """Réponse en flux (Transfer-Encoding: chunked, pas de Content-Length)"""
+    columns = [column.name for column in statement.selected_columns]
+    extension = "csv" if export_format == ExportFormat.CSV else "ndjson"
+
+    return StreamingResponse(
+        stream_rows(db, statement, columns, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+
+# ========================================
+# ENDPOINT 1 : GET /exports/player-game-scores
+# ========================================
+
+@router.get("/player-game-scores")
+def export_player_game_scores(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson ou csv"),
+    start_date: Optional[date] = Query(None, description="Premier jour inclus (AAAA-MM-JJ)"),
+    end_date: Optional[date] = Query(None, description="Dernier jour inclus (AAAA-MM-JJ)"),
+    player_id: Optional[int] = Query(None, description="Un seul joueur"),
+    team: Optional[str] = Query(None, max_length=3, description="Code équipe NBA du joueur le jour du match (ex: LAL)"),
+    db: Session = Depends(get_db),
+    current_user: Utilisateur = Depends(get_current_user)
+):
+    """
+    📤 Exporte les scores fantasy par match (statistiques brutes + score)
+
+    Une ligne par joueur et par match, triées par date puis par id.
+    L'équipe est celle du joueur le jour du match (PlayerTeamHistory),
+    ou son équipe actuelle si l'historique ne couvre pas cette date.
+
+    **Exemple :**
+    ```
+    GET /exports/player-game-scores?format=csv&start_date=2025-10-21&team=DEN
+    ```
+    """
+    # Équipe le jour du match, à défaut l'équipe actuelle
+    team_as_of = func.coalesce(PlayerTeamHistory.team, Player.team_abbreviation)
+
+    statement = select(
+        PlayerGameScore.id,
+        PlayerGameScore.game_date,
+        PlayerGameScore.player_id,
+        Player.full_name.label("player_name"),
+        team_as_of.label("team"),
+        PlayerGameScore.opponent,
+        PlayerGameScore.minutes_played,
+        PlayerGameScore.points,
+        PlayerGameScore.rebounds,
+        PlayerGameScore.assists,
+        PlayerGameScore.steals,
+        PlayerGameScore.blocks,
+        PlayerGameScore.turnovers,
+        PlayerGameScore.personal_fouls,
+        PlayerGameScore.field_goals_made,
+        PlayerGameScore.field_goals_attempted,
+        PlayerGameScore.three_pointers_made,
+        PlayerGameScore.three_pointers_attempted,
+        PlayerGameScore.free_throws_made,
+        PlayerGameScore.free_throws_attempted,
+        PlayerGameScore.base_score,
+        PlayerGameScore.efficiency_bonus,
+        PlayerGameScore.performance_bonus,
+        PlayerGameScore.penalty,
+        PlayerGameScore.fantasy_score
+    ).join(
+        Player, Player.id == PlayerGameScore.player_id
+    ).outerjoin(
+        PlayerTeamHistory,
+        and_(
+            PlayerTeamHistory.player_id == PlayerGameScore.player_id,
+            PlayerTeamHistory.covers(PlayerGameScore.game_date)
+        )
+    )
+
+    if start_date:
+        statement = statement.where(PlayerGameScore.game_date >= start_date)
+    if end_date:
+        statement = statement.where(PlayerGameScore.game_date <= end_date)
+    if player_id:
+        statement = statement.where(PlayerGameScore.player_id == player_id)
+    if team:
+        statement = statement.where(team_as_of == team.upper())
+
+    statement = statement.order_by(PlayerGameScore.game_date, PlayerGameScore.id)
+
+    return export_response(db, statement, format, "player_game_scores")
+
+
+# ========================================
+# ENDPOINT 2 : GET /exports/team-scores
+# ========================================
+
+@router.get("/team-scores")
+def export_team_scores(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson ou csv"),
+    start_date: Optional[date] = Query(None, description="Premier jour inclus (AAAA-MM-JJ)"),
+    end_date: Optional[date] = Query(None, description="Dernier jour inclus (AAAA-MM-JJ)"),
+    team_id: Optional[int] = Query(None, description="Une seule équipe fantasy"),
+    league_id: Optional[int] = Query(None, description="Toutes les équipes d'une ligue"),
+    db: Session = Depends(get_db),
+    current_user: Utilisateur = Depends(get_current_user)
+):
+    """
+    📤 Exporte les scores quotidiens des équipes fantasy
+
+    Une ligne par équipe et par jour, triées par date puis par id.
+
+    **Exemple :**
+    ```
+    GET /exports/team-scores?format=ndjson&league_id=1&start_date=2025-10-21
+    ```
+    """
+    statement = select(
+        FantasyTeamScore.id,
+        FantasyTeamScore.score_date,
+        FantasyTeamScore.fantasy_team_id,
+        FantasyTeam.name.label("team_name"),
+        FantasyTeam.league_id,
+        FantasyTeamScore.total_score,
+        FantasyTeamScore.players_who_played
+    ).join(FantasyTeam, FantasyTeam.id == FantasyTeamScore.fantasy_team_id)
+
+    if start_date:
+        statement = statement.where(FantasyTeamScore.score_date >= start_date)
+    if end_date:
+        statement = statement.where(FantasyTeamScore.score_date <= end_date)
+    if team_id:
+        statement = statement.where(FantasyTeamScore.fantasy_team_id == team_id)
+    if league_id:
+        statement = statement.where(FantasyTeam.league_id == league_id)
+
+    statement = statement.order_by(FantasyTeamScore.score_date, FantasyTeamScore.id)
+
+    return export_response(db, statement, format, "team_scores")
@@ -13,7 +13,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
-from app.models.league import League, LeagueType
+from app.models.league import League, LeagueType, WaiverMode
 from app.models.utilisateur import Utilisateur
 from app.schemas.league import (
     LeagueCreate,
@@ -88,6 +88,8 @@ def create_league(
         type=LeagueType.PRIVATE,  # Toujours PRIVATE
         max_teams=league_data.max_teams,
         salary_cap=league_data.salary_cap,
+        waiver_mode=WaiverMode(league_data.waiver_mode.value),
+        faab_budget=league_data.faab_budget,
         commissioner_id=current_user.id,  # L'utilisateur devient commissaire
         is_active=True
     )
@@ -4,18 +4,21 @@ Endpoints API pour les joueurs NBA (Players)
 Ces endpoints permettent de :
 - Lister les joueurs disponibles avec filtres avancés
 - Rechercher par nom, position, équipe
+- Autocompléter un nom (barre de recherche)
 - Obtenir les détails d'un joueur
 
 URL de base : /api/v1/players
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional
+from typing import Optional, List
 
 from app.core.database import get_db
+from app.core.player_catalog import get_catalog, paginate_players, SORT_KEYS
+from app.core.responses import model_response
+from app.core.search import name_search_filter, name_search_rank
 from app.models.player import Player, Position
-from app.schemas.player import PlayerRead, PlayerDetail, PlayerList
+from app.schemas.player import PlayerRead, PlayerReadList, PlayerDetail, PlayerList, PlayerSuggestion
 
 router = APIRouter()
 
@@ -26,7 +29,9 @@ router = APIRouter()
 
 @router.get("/", response_model=PlayerList)
 def get_players(
-    skip: int = Query(0, ge=0, description="Nombre de résultats à sauter"),
+    skip: int = Query(0, ge=0, description="Nombre de résultats à sauter (préférer cursor)"),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé par la page précédente (next_cursor)"),
+    include_total: bool = Query(True, description="Calculer le total (première page uniquement)"),
     limit: int = Query(20, ge=1, le=1000, description="Nombre de résultats max"),
     position: Optional[Position] = Query(None, description="Filtrer par poste"),
     team: Optional[str] = Query(None, max_length=3, description="Code équipe NBA"),
@@ -41,98 +46,140 @@ def get_players(
     """
     📋 Liste tous les joueurs NBA disponibles
     
+    Servi depuis le catalogue en mémoire (app.core.player_catalog) :
+    filtres et tri sans requête SQL.
+    
     **Filtres disponibles :**
     - `position` : PG, SG, SF, PF, C
     - `team` : Code NBA (ex: LAL, BOS, MIA)
     - `min_salary` / `max_salary` : Fourchette de salaire
-    - `search` : Recherche par nom (prénom ou nom)
+    - `search` : Recherche par nom (insensible aux accents : "jokic" trouve "Jokić")
     - `is_active` : Exclure les blessés/inactifs
     
     **Tri :**
     - `sort_by` : fantasy_cost (défaut), avg_fantasy_score_last_15, last_name
     - `sort_order` : desc (défaut) ou asc
     
-    **Pagination :**
-    - `skip` : Offset (défaut: 0)
-    - `limit` : Max 100 résultats (défaut: 20)
+    **Pagination (par curseur) :**
+    - `limit` : Taille de la page (défaut: 20)
+    - `cursor` : Passer le `next_cursor` de la réponse précédente pour la page suivante
+      (coût constant quelle que soit la profondeur, contrairement à `skip`)
+    - `include_total` : Le total n'est calculé que sur la première page (sans curseur)
+    - `skip` : Offset classique, conservé pour compatibilité
     
     **Exemple :**
     ```
     GET /players?position=PG&min_salary=5000000&sort_by=fantasy_cost&limit=10
     ```
     """
-    # Construction de la requête de base
-    query = db.query(Player)
+    # Catalogue en mémoire (aucune requête SQL hors rafraîchissement du snapshot)
+    catalog = get_catalog(db)
     
     # Dictionnaire pour tracker les filtres appliqués
     filters_applied = {}
     
     # Filtre par activité (par défaut: actifs uniquement)
     if is_active is not None:
-        query = query.filter(Player.is_active == is_active)
         filters_applied["is_active"] = is_active
     
     # Filtre par position
     if position:
-        query = query.filter(Player.position == position)
         filters_applied["position"] = position.value
     
     # Filtre par équipe
-    if team:
-        team_upper = team.upper()
-        query = query.filter(Player.team_abbreviation == team_upper)
+    team_upper = team.upper() if team else None
+    if team_upper:
         filters_applied["team"] = team_upper
     
     # Filtre par salaire (fourchette)
     if min_salary:
-        query = query.filter(Player.fantasy_cost >= min_salary)
         filters_applied["min_salary"] = min_salary
     
     if max_salary:
-        query = query.filter(Player.fantasy_cost <= max_salary)
         filters_applied["max_salary"] = max_salary
     
-    # Recherche par nom (insensible à la casse)
+    # Recherche par nom (insensible à la casse et aux accents)
     if search:
-        search_pattern = f"%{search.lower()}%"
-        query = query.filter(
-            or_(
-                Player.first_name.ilike(search_pattern),
-                Player.last_name.ilike(search_pattern)
-            )
-        )
         filters_applied["search"] = search
     
-    # Comptage total AVANT pagination
-    total = query.count()
+    players = catalog.search(
+        position=position,
+        team=team_upper,
+        min_salary=min_salary or None,
+        max_salary=max_salary or None,
+        search=search,
+        is_active=is_active
+    )
     
-    # Tri
-    valid_sort_fields = {
-        "fantasy_cost": Player.fantasy_cost,
-        "avg_fantasy_score_last_15": Player.avg_fantasy_score_last_15,
-        "last_name": Player.last_name
-    }
+    # Comptage total AVANT pagination (première page uniquement)
+    total = len(players) if include_total and not cursor else None
     
-    if sort_by not in valid_sort_fields:
+    # Tri : fantasy_cost, avg_fantasy_score_last_15 (NULL = 0) ou last_name
+    if sort_by not in SORT_KEYS:
         sort_by = "fantasy_cost"
     
-    sort_column = valid_sort_fields[sort_by]
-    
-    if sort_order.lower() == "asc":
-        query = query.order_by(sort_column.asc())
-    else:
-        query = query.order_by(sort_column.desc())
-    
-    # Pagination
-    players = query.offset(skip).limit(limit).all()
+    # Pagination par curseur (tri + id pour départager les égalités)
+    page, next_cursor = paginate_players(
+        players,
+        sort_by,
+        descending=sort_order.lower() != "asc",
+        limit=limit,
+        cursor=cursor,
+        skip=skip
+    )
     
-    return PlayerList(
-        players=players,
+    # Validation de la page en un appel, puis sérialisation directe
+    # (jusqu'à 1000 joueurs : pas de revalidation ni de jsonable_encoder)
+    return model_response(PlayerList.model_construct(
+        players=PlayerReadList.validate_python(page, from_attributes=True),
         total=total,
         skip=skip,
         limit=limit,
+        next_cursor=next_cursor,
         filters_applied=filters_applied
-    )
+    ))
+
+
+# ========================================
+# GET /players/autocomplete - Suggestions pour la barre de recherche
+# ========================================
+# ⚠️ Déclaré AVANT /{player_id} pour ne pas être capturé par cette route
+
+@router.get("/autocomplete", response_model=List[PlayerSuggestion])
+def autocomplete_players(
+    q: str = Query(..., min_length=2, max_length=50, description="Début ou partie du nom"),
+    limit: int = Query(10, ge=1, le=20, description="Nombre de suggestions"),
+    db: Session = Depends(get_db)
+):
+    """
+    🔎 Suggestions de joueurs pendant la saisie
+    
+    - Insensible à la casse et aux accents ("doncic" → Luka Dončić)
+    - Classé par pertinence (similarité trigramme en PostgreSQL)
+    - Joueurs actifs uniquement, colonnes minimales (requête servie par l'index)
+    
+    **Exemple :**
+    ```
+    GET /players/autocomplete?q=jok&limit=5
+    ```
+    """
+    dialect_name = db.get_bind().dialect.name
+    
+    suggestions = db.query(
+        Player.id,
+        Player.full_name,
+        Player.position,
+        Player.team_abbreviation,
+        Player.fantasy_cost
+    ).filter(
+        Player.is_active == True,
+        name_search_filter(Player.search_name, q, dialect_name)
+    ).order_by(
+        name_search_rank(Player.search_name, q, dialect_name),
+        Player.fantasy_cost.desc()
+    ).limit(limit).all()
+    
+    return [PlayerSuggestion.model_validate(row) for row in suggestions]
 
 
 # ========================================
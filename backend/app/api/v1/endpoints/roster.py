@@ -6,30 +6,40 @@ Routes disponibles :
 - POST /teams/{team_id}/roster : Ajouter un joueur au roster
 - DELETE /teams/{team_id}/roster/{player_id} : Retirer un joueur
 - GET /teams/{team_id}/available-players : Lister les joueurs disponibles
+- POST /teams/{team_id}/waiver-claims : Déposer une demande de waiver (ligues privées)
+- PUT /teams/{team_id}/lineup : Remplacer tout le roster en une fois
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, insert, delete, update
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.idempotency import IdempotentRequest, get_idempotency
+from app.core.ownership import OwnershipBitmap, build_league_bitmap, get_league_bitmap, lock_league, lock_team
+from app.core.player_catalog import get_catalog, paginate_players
+from app.core.responses import model_response
 from app.models.utilisateur import Utilisateur
 from app.models.fantasy_team import FantasyTeam
 from app.models.fantasy_team_player import FantasyTeamPlayer, RosterSlot
-from app.models.player import Player
+from app.models.player import Player, Position
 from app.models.transfer import Transfer, TransferType, TransferStatus
-from app.models.league import League, LeagueType
+from app.models.league import League, LeagueType, WaiverMode
 from app.schemas.roster import (
     RosterRead,
     RosterSlotRead,
     AddPlayerToRoster,
     AddPlayerResponse,
     AvailablePlayerRead,
-    AvailablePlayersResponse
+    AvailablePlayersResponse,
+    WaiverClaimCreate,
+    WaiverClaimRead,
+    LineupSubmit
 )
-from app.schemas.player import PlayerRead
+from app.schemas.player import PlayerRead, PlayerReadList
 
 router = APIRouter(prefix="/teams", tags=["roster"])
 
@@ -66,8 +76,13 @@ def get_team_roster(
     - UTIL (Utility / Sixième Homme - n'importe quel poste)
     """
     
-    # 1. Vérifier que l'équipe existe
-    team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
+    # 1. Charger en UNE requête : l'équipe, ses slots et leurs joueurs
+    #    (transfers_this_week est un compteur tenu à jour par les écritures,
+    #     remis à 0 chaque lundi par le worker : aucun comptage de Transfer)
+    team = db.query(FantasyTeam).options(
+        joinedload(FantasyTeam.players).joinedload(FantasyTeamPlayer.player)
+    ).filter(FantasyTeam.id == team_id).first()
+    
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,14 +96,9 @@ def get_team_roster(
             detail="Vous n'êtes pas propriétaire de cette équipe"
         )
     
-    # 3. Récupérer tous les joueurs du roster
-    roster_players = db.query(FantasyTeamPlayer).filter(
-        FantasyTeamPlayer.fantasy_team_id == team_id
-    ).all()
-    
-    # 4. Créer un dictionnaire position -> joueur
+    # 3-4. Créer un dictionnaire position -> joueur (déjà chargés, aucune requête)
     roster_dict = {}
-    for roster_player in roster_players:
+    for roster_player in team.players:
         roster_dict[roster_player.roster_slot.value] = {
             'player': roster_player.player,
             'acquired_salary': roster_player.salary_at_acquisition,
@@ -122,20 +132,6 @@ def get_team_roster(
     salary_cap_used = team.salary_cap_used or 0.0
     salary_cap_remaining = SALARY_CAP_MAX - salary_cap_used
     
-    # 7. Compter les transferts de cette semaine
-    # (On compte les transferts depuis le dernier lundi)
-    today = datetime.now().date()
-    days_since_monday = today.weekday()  # 0 = lundi, 6 = dimanche
-    last_monday = today - timedelta(days=days_since_monday)
-    
-    transfers_this_week = db.query(Transfer).filter(
-        and_(
-            Transfer.fantasy_team_id == team_id,
-            Transfer.status == TransferStatus.COMPLETED,
-            Transfer.processed_at >= last_monday
-        )
-    ).count()
-    
     # 8. Déterminer le statut du roster
     is_complete = bool(team.is_roster_complete)
     roster_status = "ACTIVE" if is_complete else "CONSTRUCTION"
@@ -147,7 +143,7 @@ def get_team_roster(
         roster=roster_slots,
         salary_cap_used=salary_cap_used,
         salary_cap_remaining=salary_cap_remaining,
-        transfers_this_week=transfers_this_week if is_complete else 0,
+        transfers_this_week=team.transfers_this_week if is_complete else 0,
         is_roster_complete=is_complete,
         roster_status=roster_status
     )
@@ -162,7 +158,8 @@ def add_player_to_roster(
     team_id: int,
     data: AddPlayerToRoster,
     current_user: Utilisateur = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency: IdempotentRequest = Depends(get_idempotency)
 ):
     """
     ➕ Ajoute un joueur au roster
@@ -177,8 +174,15 @@ def add_player_to_roster(
     Pour les autres : le joueur doit avoir le bon poste
     
     Mode Solo League : Transferts libres sans limitation
+    
+    Header optionnel `Idempotency-Key` : un essai rejoué renvoie la réponse
+    d'origine sans modifier le roster
     """
     
+    # 0. Requête rejouée (même Idempotency-Key) : réponse d'origine
+    if idempotency.replay is not None:
+        return idempotency.replay
+    
     # 1. Vérifier que l'équipe existe
     team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
     if not team:
@@ -244,41 +248,50 @@ def add_player_to_roster(
             detail=f"{player.full_name} est déjà dans votre roster"
         )
     
-    # 7. Vérifier le salary cap
-    current_cap = team.salary_cap_used or 0.0
-    new_cap = current_cap + player.fantasy_cost
-    
-    if new_cap > SALARY_CAP_MAX:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Salary cap dépassé : ${new_cap/1_000_000:.1f}M > $60M. Budget restant : ${(SALARY_CAP_MAX - current_cap)/1_000_000:.1f}M"
-        )
-    
-    # 8. Mode Solo League : Pas de cooldown ni de limite de transferts
-    # Les validations restantes : budget et positions
-    
-    # 9. Mode Solo League : Pas de limite de transferts
+    # 7-9. Mode Solo League : Pas de cooldown ni de limite de transferts
+    # Le salary cap est vérifié de façon atomique à l'étape 11
     
     # 10. Vérifier si la ligue est PRIVATE et si le joueur est déjà pris
-    # Note : En MVP, on utilise seulement SOLO League, donc ce check est inactif
-    league = db.query(League).filter(League.id == team.league_id).first()
-    if league and league.type == LeagueType.PRIVATE:
+    ownership = None
+    if team.league.type == LeagueType.PRIVATE:
+        # Ligue verrouillée jusqu'au commit : les ajouts d'une même ligue privée sont sérialisés
+        league = lock_league(db, team.league_id)
+        
         # Dans les ligues privées, un joueur ne peut être que dans une seule équipe
-        player_taken = db.query(FantasyTeamPlayer).join(FantasyTeam).filter(
-            and_(
-                FantasyTeamPlayer.player_id == data.player_id,
-                FantasyTeam.league_id == league.id
-            )
-        ).first()
+        # (lecture d'un bit au lieu d'une jointure sur tous les rosters de la ligue)
+        ownership = get_league_bitmap(db, league)
         
-        if player_taken:
-            other_team = player_taken.team
+        if data.player_id in ownership:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"{player.full_name} est déjà dans l'équipe '{other_team.name}' de cette ligue privée"
+                detail=f"{player.full_name} appartient déjà à une autre équipe de cette ligue privée"
             )
     
-    # 11. Tout est OK ! Ajouter le joueur au roster
+    # 11. Réserver le salary cap : UPDATE conditionnel atomique
+    # (deux ajouts simultanés ne peuvent pas dépasser le cap : la condition
+    #  est réévaluée par la base sur la ligne verrouillée par l'UPDATE)
+    cap_reserved = db.execute(
+        update(FantasyTeam)
+        .where(
+            FantasyTeam.id == team_id,
+            FantasyTeam.salary_cap_used + player.fantasy_cost <= SALARY_CAP_MAX
+        )
+        .values(salary_cap_used=FantasyTeam.salary_cap_used + player.fantasy_cost)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    
+    if not cap_reserved:
+        db.rollback()
+        db.refresh(team)
+        current_cap = team.salary_cap_used or 0.0
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Salary cap dépassé : ${(current_cap + player.fantasy_cost)/1_000_000:.1f}M > $60M. Budget restant : ${(SALARY_CAP_MAX - current_cap)/1_000_000:.1f}M"
+        )
+    
+    # 12. Ajouter le joueur au roster
+    # Les contraintes uniques (équipe, poste) et (équipe, joueur) protègent
+    # contre un ajout concurrent sur le même poste ou du même joueur
     new_roster_player = FantasyTeamPlayer(
         fantasy_team_id=team_id,
         player_id=data.player_id,
@@ -288,13 +301,23 @@ def add_player_to_roster(
     )
     db.add(new_roster_player)
     
-    # 12. Mettre à jour le salary cap de l'équipe
-    team.salary_cap_used = new_cap
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"La position {data.position_slot.value} vient d'être occupée ou {player.full_name} est déjà dans votre roster"
+        )
+    
+    if ownership is not None:
+        ownership.add(data.player_id)
+        league.ownership_bitmap = ownership.to_bytes()
     
     # 13. Vérifier si le roster est maintenant complet (6/6 joueurs)
     roster_count = db.query(FantasyTeamPlayer).filter(
         FantasyTeamPlayer.fantasy_team_id == team_id
-    ).count() + 1  # +1 pour le joueur qu'on vient d'ajouter
+    ).count()
     
     if roster_count >= 6 and not team.is_roster_complete:
         team.is_roster_complete = 1  # Marquer le roster comme complet
@@ -311,10 +334,12 @@ def add_player_to_roster(
             processed_at=datetime.now()
         )
         db.add(transfer)
+        team.transfers_this_week = FantasyTeam.transfers_this_week + 1  # Incrément atomique
     
     # 15. Commit
     db.commit()
     db.refresh(team)
+    new_cap = team.salary_cap_used
     
     # 16. Préparer le message de retour
     message = f"{player.full_name} a été ajouté à votre roster en position {data.position_slot.value}"
@@ -326,15 +351,15 @@ def add_player_to_roster(
     # Mode Solo League : Transferts illimités
     transfers_remaining = 999
     
-    # 17. Retourner la réponse
-    return AddPlayerResponse(
+    # 17. Retourner la réponse (mémorisée pour les essais rejoués)
+    return idempotency.save(AddPlayerResponse(
         message=message,
         player_added=PlayerRead.model_validate(player),
         position_slot=data.position_slot,
         salary_cap_used=new_cap,
         salary_cap_remaining=SALARY_CAP_MAX - new_cap,
         transfers_remaining_this_week=transfers_remaining
-    )
+    ), status_code=status.HTTP_201_CREATED)
 
 
 # ========================================
@@ -346,7 +371,8 @@ def remove_player_from_roster(
     team_id: int,
     player_id: int,
     current_user: Utilisateur = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency: IdempotentRequest = Depends(get_idempotency)
 ):
     """
     ➖ Retire un joueur du roster
@@ -362,8 +388,15 @@ def remove_player_from_roster(
     - L'équipe existe et appartient à l'utilisateur
     - Le joueur est bien dans le roster
     - Moins de 2 transferts cette semaine
+    
+    Header optionnel `Idempotency-Key` : un essai rejoué renvoie la réponse
+    d'origine (pas de 2e Transfer DROP)
     """
     
+    # 0. Requête rejouée (même Idempotency-Key) : réponse d'origine
+    if idempotency.replay is not None:
+        return idempotency.replay
+    
     # 1. Vérifier que l'équipe existe
     team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
     if not team:
@@ -398,11 +431,46 @@ def remove_player_from_roster(
     # 5. Récupérer le joueur pour le message
     player = db.query(Player).filter(Player.id == player_id).first()
     
-    # 6. Libérer le salary cap
-    team.salary_cap_used = (team.salary_cap_used or 0.0) - roster_player.salary_at_acquisition
+    freed_slot = roster_player.roster_slot
+    freed_salary = roster_player.salary_at_acquisition
+    
+    # Verrous pris avant toute écriture (même ordre que l'ajout et le lineup) :
+    # ligue privée, puis équipe
+    league = lock_league(db, team.league_id) if team.league.type == LeagueType.PRIVATE else None
+    lock_team(db, team_id)
+    
+    # 6. Supprimer le joueur du roster (DELETE conditionnel : si un retrait
+    #    concurrent l'a déjà supprimé, on ne libère pas le cap une 2e fois)
+    removed = db.execute(
+        delete(FantasyTeamPlayer)
+        .where(FantasyTeamPlayer.id == roster_player.id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    
+    if not removed:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ce joueur n'est pas dans votre roster"
+        )
+    
+    # 7. Libérer le salary cap et compter le transfert
+    #    (UPDATE atomique, pas de lecture-écriture en Python)
+    db.execute(
+        update(FantasyTeam)
+        .where(FantasyTeam.id == team_id)
+        .values(
+            salary_cap_used=FantasyTeam.salary_cap_used - freed_salary,
+            transfers_this_week=FantasyTeam.transfers_this_week + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
     
-    # 7. Supprimer le joueur du roster
-    db.delete(roster_player)
+    # Ligue privée : le joueur redevient libre
+    if league is not None:
+        ownership = get_league_bitmap(db, league)
+        ownership.discard(player_id)
+        league.ownership_bitmap = ownership.to_bytes()
     
     # 8. Créer un Transfer de type DROP (pour le cooldown)
     transfer = Transfer(
@@ -410,22 +478,23 @@ def remove_player_from_roster(
         player_id=player_id,
         transfer_type=TransferType.DROP,
         status=TransferStatus.COMPLETED,
-        salary_at_transfer=roster_player.salary_at_acquisition,
+        salary_at_transfer=freed_salary,
         processed_at=datetime.now()
     )
     db.add(transfer)
     
     # 9. Commit
     db.commit()
+    db.refresh(team)
     
-    # 10. Retourner la confirmation
-    return {
+    # 10. Retourner la confirmation (mémorisée pour les essais rejoués)
+    return idempotency.save({
         "message": f"{player.full_name} a été retiré de votre roster",
         "player_removed": PlayerRead.model_validate(player),
-        "position_freed": roster_player.roster_slot.value,
-        "salary_cap_freed": roster_player.salary_at_acquisition,
+        "position_freed": freed_slot.value,
+        "salary_cap_freed": freed_salary,
         "salary_cap_remaining": SALARY_CAP_MAX - team.salary_cap_used
-    }
+    })
 
 
 # ========================================
@@ -441,7 +510,9 @@ def get_available_players(
     team_nba: Optional[str] = Query(None, description="Filtrer par équipe NBA (ex: LAL, GSW)"),
     max_salary: Optional[float] = Query(None, description="Salaire maximum en dollars"),
     search: Optional[str] = Query(None, description="Rechercher par nom"),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Offset (préférer cursor)"),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé par la page précédente (next_cursor)"),
+    include_total: bool = Query(True, description="Calculer le total (première page uniquement)"),
     limit: int = Query(50, ge=1, le=100)
 ):
     """
@@ -459,20 +530,41 @@ def get_available_players(
     - max_salary : Budget max
     - search : Recherche par nom
     
+    Servi depuis le catalogue joueurs en mémoire ; les joueurs déjà pris
+    sont exclus par lecture du bitmap de la ligue (aucune jointure).
+    
+    Pagination par curseur : tri par salaire décroissant, passer `next_cursor`
+    dans `cursor` pour la page suivante. Le total n'est calculé que sur la
+    première page.
+    
     Chaque joueur indique :
     - is_affordable : True si achetable avec le budget restant
     - has_cooldown : True si viré dans les 7 derniers jours
     - cooldown_ends : Date de fin du cooldown
     """
     
-    # 1. Vérifier que l'équipe existe
-    team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
-    if not team:
+    # 1. Charger l'équipe, la ligue (type + bitmap) et le roster (1 seule requête)
+    team_rows = db.query(
+        FantasyTeam,
+        League.type,
+        League.ownership_bitmap,
+        FantasyTeamPlayer.roster_slot,
+        FantasyTeamPlayer.player_id
+    ).join(
+        League, League.id == FantasyTeam.league_id
+    ).outerjoin(
+        FantasyTeamPlayer, FantasyTeamPlayer.fantasy_team_id == FantasyTeam.id
+    ).filter(FantasyTeam.id == team_id).all()
+    
+    if not team_rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Équipe introuvable"
         )
     
+    team, league_type, league_bitmap = team_rows[0][0], team_rows[0][1], team_rows[0][2]
+    roster_rows = [row for row in team_rows if row.roster_slot is not None]
+    
     # 2. Vérifier la propriété
     if team.owner_id != current_user.id:
         raise HTTPException(
@@ -484,95 +576,367 @@ def get_available_players(
     salary_cap_used = team.salary_cap_used or 0.0
     salary_cap_remaining = SALARY_CAP_MAX - salary_cap_used
     
-    # 4. Trouver les positions libres
-    roster_count = db.query(FantasyTeamPlayer).filter(
-        FantasyTeamPlayer.fantasy_team_id == team_id
-    ).count()
+    # 4. Positions libres (déduites de la requête ci-dessus)
+    occupied_slots = {row.roster_slot for row in roster_rows}
+    available_positions = [slot.value for slot in RosterSlot if slot not in occupied_slots]
     
-    available_positions = []
-    all_positions = ['PG', 'SG', 'SF', 'PF', 'C', 'UTIL']
+    # 5-6. Joueurs exclus (lecture de bits, sans jointure)
+    # - Ligue PRIVATE : bitmap des joueurs pris dans la ligue
+    # - Sinon : joueurs déjà dans le roster de l'équipe
+    if league_type == LeagueType.PRIVATE:
+        if league_bitmap is None:
+            excluded = build_league_bitmap(db, team.league_id)
+        else:
+            excluded = OwnershipBitmap(league_bitmap)
+    else:
+        excluded = OwnershipBitmap.from_ids(row.player_id for row in roster_rows)
     
-    for pos in all_positions:
-        exists = db.query(FantasyTeamPlayer).filter(
-            and_(
-                FantasyTeamPlayer.fantasy_team_id == team_id,
-                FantasyTeamPlayer.roster_slot == RosterSlot(pos)
-            )
-        ).first()
-        if not exists:
-            available_positions.append(pos)
-    
-    # 5. Récupérer les IDs des joueurs déjà dans le roster
-    roster_player_ids = [
-        rp.player_id for rp in db.query(FantasyTeamPlayer.player_id).filter(
-            FantasyTeamPlayer.fantasy_team_id == team_id
-        ).all()
+    # 7-8. Filtrer le catalogue en mémoire (joueurs actifs, filtres, budget)
+    try:
+        position_filter = Position(position.upper()) if position else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Position invalide. Doit être : PG, SG, SF, PF, C"
+        )
+    
+    candidates = get_catalog(db).search(
+        position=position_filter,
+        team=team_nba.upper() if team_nba else None,
+        # Par défaut, ne montrer que les joueurs abordables
+        max_salary=max_salary or salary_cap_remaining,
+        search=search,
+        is_active=True
+    )
+    candidates = [player for player in candidates if player.id not in excluded]
+    
+    # 9. Compter le total (première page uniquement)
+    total_count = len(candidates) if include_total and not cursor else None
+    
+    # 10. Appliquer la pagination par curseur (salaire décroissant, puis id)
+    players, next_cursor = paginate_players(
+        candidates,
+        "fantasy_cost",
+        descending=True,
+        limit=limit,
+        cursor=cursor,
+        skip=skip
+    )
+    
+    # 11. Construire la liste des joueurs disponibles (Mode Solo League - pas de cooldown)
+    #     Joueurs validés en un appel ; les enveloppes sont construites sans revalidation
+    available_players = [
+        AvailablePlayerRead.model_construct(
+            player=player_read,
+            is_affordable=player_read.fantasy_cost <= salary_cap_remaining,
+            has_cooldown=False,  # Pas de cooldown en Solo League
+            cooldown_ends=None
+        )
+        for player_read in PlayerReadList.validate_python(players, from_attributes=True)
     ]
     
-    # 6. Dans les Private Leagues, exclure les joueurs déjà pris
-    league = db.query(League).filter(League.id == team.league_id).first()
-    excluded_player_ids = roster_player_ids.copy()
+    # 12. Retourner la réponse (sérialisée directement par pydantic-core)
+    return model_response(AvailablePlayersResponse.model_construct(
+        team_id=team_id,
+        salary_cap_remaining=salary_cap_remaining,
+        available_positions=available_positions,
+        players=available_players,
+        total_count=total_count,
+        next_cursor=next_cursor
+    ))
+
+
+# ========================================
+# ENDPOINT 5 : POST /teams/{team_id}/waiver-claims
+# ========================================
+
+@router.post("/{team_id}/waiver-claims", response_model=WaiverClaimRead, status_code=status.HTTP_201_CREATED)
+def create_waiver_claim(
+    team_id: int,
+    data: WaiverClaimCreate,
+    current_user: Utilisateur = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    📝 Dépose une demande de waiver (ligues privées)
     
-    if league and league.type == LeagueType.PRIVATE:
-        # Récupérer tous les joueurs pris dans cette ligue
-        taken_players = db.query(FantasyTeamPlayer.player_id).join(FantasyTeam).filter(
-            FantasyTeam.league_id == league.id
-        ).all()
-        excluded_player_ids.extend([tp.player_id for tp in taken_players])
+    La demande reste PENDING jusqu'au traitement du lundi :
+    - Mode ROLLING : attribution selon la waiver priority
+    - Mode FAAB : enchère à l'aveugle, la plus grosse enchère l'emporte
     
-    # 7. Construire la requête de base (joueurs actifs non pris)
-    query = db.query(Player).filter(
-        and_(
-            Player.is_active == True,
-            ~Player.id.in_(excluded_player_ids)
+    Les vérifications de disponibilité et de salary cap sont refaites
+    au moment du traitement (l'état du roster peut changer d'ici là).
+    """
+    
+    # 1. Vérifier que l'équipe existe et appartient à l'utilisateur
+    team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
+    if not team:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Équipe introuvable"
         )
-    )
     
-    # 8. Appliquer les filtres
-    if position:
-        query = query.filter(Player.position == position.upper())
+    if team.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Vous n'êtes pas propriétaire de cette équipe"
+        )
     
-    if team_nba:
-        query = query.filter(Player.team == team_nba.upper())
+    # 2. Les waivers n'existent que dans les ligues privées
+    league = db.query(League).filter(League.id == team.league_id).first()
+    if not league or league.type != LeagueType.PRIVATE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Les demandes de waiver sont réservées aux ligues privées"
+        )
     
-    if max_salary:
-        query = query.filter(Player.fantasy_cost <= max_salary)
-    else:
-        # Par défaut, ne montrer que les joueurs abordables
-        query = query.filter(Player.fantasy_cost <= salary_cap_remaining)
-    
-    if search:
-        query = query.filter(
-            or_(
-                Player.first_name.ilike(f"%{search}%"),
-                Player.last_name.ilike(f"%{search}%"),
-                Player.full_name.ilike(f"%{search}%")
+    # 3. Vérifier que le joueur existe et est actif
+    player = db.query(Player).filter(Player.id == data.player_id).first()
+    if not player or not player.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Joueur introuvable ou inactif"
+        )
+    
+    # 4. Vérifier l'enchère (mode FAAB)
+    bid_amount = None
+    if league.waiver_mode == WaiverMode.FAAB:
+        if data.bid_amount is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Une enchère (bid_amount) est obligatoire dans une ligue FAAB"
+            )
+        
+        faab_remaining = league.faab_budget if team.faab_remaining is None else team.faab_remaining
+        if data.bid_amount > faab_remaining:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Enchère supérieure au budget FAAB restant (${faab_remaining})"
             )
+        bid_amount = data.bid_amount
+    
+    # 5. Enregistrer la demande
+    claim = Transfer(
+        fantasy_team_id=team_id,
+        player_id=player.id,
+        transfer_type=TransferType.ADD,
+        status=TransferStatus.PENDING,
+        roster_slot=data.position_slot.value,
+        salary_at_transfer=player.fantasy_cost,
+        bid_amount=bid_amount
+    )
+    db.add(claim)
+    db.commit()
+    db.refresh(claim)
+    
+    return WaiverClaimRead(
+        id=claim.id,
+        fantasy_team_id=claim.fantasy_team_id,
+        player_id=claim.player_id,
+        roster_slot=claim.roster_slot,
+        bid_amount=claim.bid_amount,
+        status=claim.status.value,
+        date_creation=claim.date_creation
+    )
+
+
+# ========================================
+# ENDPOINT 6 : PUT /teams/{team_id}/lineup
+# ========================================
+
+@router.put("/{team_id}/lineup", response_model=RosterRead)
+def submit_lineup(
+    team_id: int,
+    data: LineupSubmit,
+    current_user: Utilisateur = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    🧩 Remplace tout le roster en une seule requête (6 postes)
+    
+    Remplace six appels à POST /teams/{team_id}/roster :
+    toutes les validations sont faites en mémoire, puis le changement
+    est appliqué dans UNE transaction (tout ou rien).
+    
+    Validations :
+    1. L'équipe existe et appartient à l'utilisateur
+    2. Tous les joueurs existent et sont actifs
+    3. Chaque joueur correspond à son poste (sauf UTIL)
+    4. Ligue PRIVATE : aucun joueur n'appartient à une autre équipe
+    5. Le salary cap n'est pas dépassé (60M$ max)
+    
+    Un joueur déjà dans le roster garde son salaire gelé, même s'il change de poste.
+    """
+    
+    # 1. Charger l'équipe
+    team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
+    if not team:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Équipe introuvable"
+        )
+    
+    if team.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Vous n'êtes pas propriétaire de cette équipe"
         )
     
-    # 9. Compter le total
-    total_count = query.count()
+    # Verrous (même ordre que l'ajout et le retrait) : ligue privée, puis équipe.
+    # Le roster est lu APRÈS le verrou : un ajout ou un lineup concurrent
+    # sur cette équipe attend notre commit au lieu de heurter uq_team_slot.
+    league = lock_league(db, team.league_id) if team.league.type == LeagueType.PRIVATE else None
+    team = lock_team(db, team_id)
+    current_rows = db.query(FantasyTeamPlayer).filter(FantasyTeamPlayer.fantasy_team_id == team_id).all()
     
-    # 10. Appliquer la pagination
-    players = query.order_by(Player.fantasy_cost.desc()).offset(skip).limit(limit).all()
+    current_by_player = {row.player_id: row for row in current_rows}
+    new_lineup = {slot.position_slot: slot.player_id for slot in data.lineup}
     
-    # 11. Construire la liste des joueurs disponibles (Mode Solo League - pas de cooldown)
-    available_players = []
-    for player in players:
-        is_affordable = player.fantasy_cost <= salary_cap_remaining
+    # 2. Charger tous les joueurs demandés (1 requête)
+    players = {
+        player.id: player
+        for player in db.query(Player).filter(Player.id.in_(list(new_lineup.values()))).all()
+    }
+    
+    for slot, player_id in new_lineup.items():
+        player = players.get(player_id)
+        if not player or not player.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Joueur {player_id} introuvable ou inactif"
+            )
         
-        available_players.append(AvailablePlayerRead(
-            player=PlayerRead.model_validate(player),
-            is_affordable=is_affordable,
-            has_cooldown=False,  # Pas de cooldown en Solo League
-            cooldown_ends=None
-        ))
+        # 3. Compatibilité position/joueur (sauf pour UTIL)
+        if slot != RosterSlot.UTIL and player.position.value != slot.value:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{player.full_name} est {player.position.value}, pas {slot.value}. Utilisez la position UTIL pour ce joueur."
+            )
     
-    # 12. Retourner la réponse
-    return AvailablePlayersResponse(
-        team_id=team_id,
-        salary_cap_remaining=salary_cap_remaining,
-        available_positions=available_positions,
-        players=available_players,
-        total_count=total_count
-    )
+    # 4. Ligue PRIVATE : disponibilité (ligue verrouillée jusqu'au commit)
+    ownership = None
+    if league is not None:
+        ownership = get_league_bitmap(db, league)
+        for player_id in new_lineup.values():
+            if player_id not in current_by_player and player_id in ownership:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{players[player_id].full_name} appartient déjà à une autre équipe de cette ligue privée"
+                )
+    
+    # 5. Salary cap : salaire gelé pour les joueurs conservés, prix actuel pour les nouveaux
+    salaries = {
+        player_id: (
+            current_by_player[player_id].salary_at_acquisition
+            if player_id in current_by_player
+            else players[player_id].fantasy_cost
+        )
+        for player_id in new_lineup.values()
+    }
+    new_cap = sum(salaries.values())
+    
+    if new_cap > SALARY_CAP_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Salary cap dépassé : ${new_cap/1_000_000:.1f}M > $60M"
+        )
+    
+    # 6. Calculer le diff (postes inchangés = aucune écriture)
+    unchanged = {
+        (row.roster_slot, row.player_id) for row in current_rows
+    } & set(new_lineup.items())
+    rows_to_delete = [
+        row.id for row in current_rows if (row.roster_slot, row.player_id) not in unchanged
+    ]
+    rows_to_insert = [
+        {
+            "fantasy_team_id": team_id,
+            "player_id": player_id,
+            "roster_slot": slot,
+            "salary_at_acquisition": salaries[player_id],
+            "date_acquired": (
+                current_by_player[player_id].date_acquired
+                if player_id in current_by_player
+                else datetime.now()
+            )
+        }
+        for slot, player_id in new_lineup.items()
+        if (slot, player_id) not in unchanged
+    ]
+    
+    dropped_ids = set(current_by_player) - set(new_lineup.values())
+    added_ids = set(new_lineup.values()) - set(current_by_player)
+    
+    # 7. Salary cap : UPDATE conditionnel atomique (même règle que l'ajout)
+    cap_delta = new_cap - sum(row.salary_at_acquisition for row in current_rows)
+    cap_updated = db.execute(
+        update(FantasyTeam)
+        .where(
+            FantasyTeam.id == team_id,
+            FantasyTeam.salary_cap_used + cap_delta <= SALARY_CAP_MAX
+        )
+        .values(salary_cap_used=FantasyTeam.salary_cap_used + cap_delta)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    
+    if not cap_updated:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Salary cap dépassé : ${new_cap/1_000_000:.1f}M > $60M"
+        )
+    
+    # 8. Appliquer en bulk (DELETE puis INSERT : les contraintes d'unicité restent respectées)
+    try:
+        if rows_to_delete:
+            db.execute(delete(FantasyTeamPlayer).where(FantasyTeamPlayer.id.in_(rows_to_delete)))
+        if rows_to_insert:
+            db.execute(insert(FantasyTeamPlayer), rows_to_insert)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Le roster vient d'être modifié par une autre requête, réessayez"
+        )
+    
+    # 9. Historique des transferts (SEULEMENT si le roster était déjà complet)
+    if team.is_roster_complete and (dropped_ids or added_ids):
+        now = datetime.now()
+        db.execute(insert(Transfer), [
+            {
+                "fantasy_team_id": team_id,
+                "player_id": player_id,
+                "transfer_type": TransferType.DROP,
+                "status": TransferStatus.COMPLETED,
+                "salary_at_transfer": current_by_player[player_id].salary_at_acquisition,
+                "processed_at": now
+            }
+            for player_id in dropped_ids
+        ] + [
+            {
+                "fantasy_team_id": team_id,
+                "player_id": player_id,
+                "transfer_type": TransferType.ADD,
+                "status": TransferStatus.COMPLETED,
+                "salary_at_transfer": salaries[player_id],
+                "processed_at": now
+            }
+            for player_id in added_ids
+        ])
+        team.transfers_this_week = FantasyTeam.transfers_this_week + len(dropped_ids) + len(added_ids)
+    
+    # 10. Mettre à jour l'équipe (et le bitmap de la ligue privée)
+    team.is_roster_complete = 1
+    
+    if ownership is not None:
+        for player_id in dropped_ids:
+            ownership.discard(player_id)
+        for player_id in added_ids:
+            ownership.add(player_id)
+        league.ownership_bitmap = ownership.to_bytes()
+    
+    # 11. Un seul commit pour tout le lineup
+    db.commit()
+    db.expire_all()
+    
+    return get_team_roster(team_id, current_user, db)
@@ -5,16 +5,19 @@ from datetime import datetime, timedelta
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import and_, func, desc
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.responses import ORJSONResponse
 from app.models.utilisateur import Utilisateur
 from app.models.fantasy_team import FantasyTeam
 from app.models.fantasy_team_score import FantasyTeamScore
-from app.models.fantasy_team_player import FantasyTeamPlayer
+from app.models.fantasy_team_score_player import FantasyTeamScorePlayer
+from app.models.player import Player
 from app.models.player_game_score import PlayerGameScore
 from app.models.league import League, LeagueType
+from app.models.player_team_history import PlayerTeamHistory
 
 router = APIRouter()
 
@@ -37,7 +40,7 @@ def get_team_score_history(
     - Informations de l'équipe
     - Liste des scores quotidiens
     - Statistiques (total, moyenne, meilleur jour)
-    - Détail des joueurs pour chaque jour
+    - Meilleurs contributeurs de la période (points figés à chaque calcul)
     """
     # Vérifier que l'équipe existe
     team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
@@ -66,8 +69,26 @@ def get_team_score_history(
         best_day = None
         worst_day = None
     
-    # Construire la réponse
-    return {
+    # Meilleurs contributeurs : somme des points de chaque joueur aligné
+    # (lineups enregistrées au calcul, sans relire PlayerGameScore)
+    contributors = db.query(
+        Player.id,
+        Player.full_name,
+        func.sum(FantasyTeamScorePlayer.points).label("total_points"),
+        func.count(FantasyTeamScorePlayer.points).label("games_played"),
+        func.max(FantasyTeamScorePlayer.points).label("best_game")
+    ).join(
+        FantasyTeamScore, FantasyTeamScore.id == FantasyTeamScorePlayer.team_score_id
+    ).join(
+        Player, Player.id == FantasyTeamScorePlayer.player_id
+    ).filter(
+        FantasyTeamScore.fantasy_team_id == team_id,
+        FantasyTeamScore.score_date >= start_date,
+        FantasyTeamScorePlayer.points.isnot(None)
+    ).group_by(Player.id, Player.full_name).order_by(desc("total_points")).limit(3).all()
+    
+    # Construire la réponse (sérialisée directement par orjson)
+    return ORJSONResponse({
         "team": {
             "id": team.id,
             "name": team.name,
@@ -91,14 +112,25 @@ def get_team_score_history(
                 "score": round(worst_day.total_score, 1) if worst_day else 0
             }
         },
+        "best_contributors": [
+            {
+                "player_id": contributor.id,
+                "full_name": contributor.full_name,
+                "total_points": round(contributor.total_points, 1),
+                "games_played": contributor.games_played,
+                "best_game": round(contributor.best_game, 1)
+            }
+            for contributor in contributors
+        ],
         "daily_scores": [
             {
                 "date": score.score_date.isoformat(),
-                "total_score": round(score.total_score, 1)
+                "total_score": round(score.total_score, 1),
+                "players_who_played": score.players_who_played
             }
             for score in daily_scores
         ]
-    }
+    })
 
 
 @router.get("/teams/{team_id}/scores/{date}")
@@ -117,93 +149,111 @@ def get_team_score_detail(
     
     **Retourne :**
     - Score total de l'équipe
-    - Score détaillé de chaque joueur (stats complètes)
-    """
-    # Vérifier l'équipe
-    team = db.query(FantasyTeam).filter(FantasyTeam.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=404, detail=f"Équipe avec l'ID {team_id} introuvable")
+    - Score détaillé de chaque joueur aligné ce jour-là (stats complètes)
     
-    # Parser la date
+    Une seule requête : score du jour → lineup figée au calcul →
+    joueur → score du joueur ce jour-là → équipe NBA à cette date.
+    """
+    # 1. Parser la date
     try:
         target_date = datetime.strptime(date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez YYYY-MM-DD")
     
-    # Récupérer le score de l'équipe pour ce jour
-    team_score = db.query(FantasyTeamScore).filter(
+    # 2. Score, lineup du jour et stats de chaque joueur (une ligne par poste)
+    rows = db.query(
+        FantasyTeam.id.label("team_id"),
+        FantasyTeam.name.label("team_name"),
+        FantasyTeamScore.total_score,
+        FantasyTeamScore.players_who_played,
+        FantasyTeamScorePlayer.roster_slot,
+        Player.id.label("player_id"),
+        Player.full_name,
+        Player.position,
+        Player.team_abbreviation,
+        PlayerTeamHistory.team.label("team_on_date"),
+        FantasyTeamScorePlayer.points.label("contribution"),
+        PlayerGameScore.id.label("game_score_id"),
+        PlayerGameScore.minutes_played,
+        PlayerGameScore.points,
+        PlayerGameScore.rebounds,
+        PlayerGameScore.assists,
+        PlayerGameScore.steals,
+        PlayerGameScore.blocks,
+        PlayerGameScore.turnovers
+    ).select_from(FantasyTeamScore).join(
+        FantasyTeam, FantasyTeam.id == FantasyTeamScore.fantasy_team_id
+    ).outerjoin(
+        FantasyTeamScorePlayer, FantasyTeamScorePlayer.team_score_id == FantasyTeamScore.id
+    ).outerjoin(
+        Player, Player.id == FantasyTeamScorePlayer.player_id
+    ).outerjoin(
+        PlayerGameScore,
+        and_(
+            PlayerGameScore.player_id == FantasyTeamScorePlayer.player_id,
+            PlayerGameScore.game_date == FantasyTeamScore.score_date
+        )
+    ).outerjoin(
+        PlayerTeamHistory,
+        and_(
+            PlayerTeamHistory.player_id == FantasyTeamScorePlayer.player_id,
+            PlayerTeamHistory.covers(FantasyTeamScore.score_date)
+        )
+    ).filter(
         FantasyTeamScore.fantasy_team_id == team_id,
         FantasyTeamScore.score_date == target_date
-    ).first()
+    ).order_by(FantasyTeamScorePlayer.id).all()
     
-    if not team_score:
+    # 3. Aucune ligne : équipe inexistante ou pas de score ce jour-là
+    if not rows:
+        team_exists = db.query(FantasyTeam.id).filter(FantasyTeam.id == team_id).first()
+        if not team_exists:
+            raise HTTPException(status_code=404, detail=f"Équipe avec l'ID {team_id} introuvable")
         raise HTTPException(
             status_code=404,
             detail=f"Aucun score trouvé pour l'équipe {team_id} à la date {date}"
         )
     
-    # Récupérer le roster de l'équipe (au moment du match)
-    roster = db.query(FantasyTeamPlayer).filter(
-        FantasyTeamPlayer.fantasy_team_id == team_id
-    ).all()
-    
-    # Pour chaque joueur, récupérer son score du jour
+    # 4. Construire le détail de chaque joueur (points figés au calcul)
+    # (scores calculés avant l'enregistrement des lineups : liste vide)
     player_scores = []
-    for roster_slot in roster:
-        player = roster_slot.player
-        
-        # Score du joueur pour ce jour
-        game_score = db.query(PlayerGameScore).filter(
-            PlayerGameScore.player_id == player.id,
-            PlayerGameScore.game_date == target_date
-        ).first()
+    for row in rows:
+        if row.player_id is None:
+            continue
         
-        if game_score:
-            player_scores.append({
-                "position_slot": roster_slot.roster_slot.value,
-                "player": {
-                    "id": player.id,
-                    "full_name": player.full_name,
-                    "position": player.position.value,
-                    "team": player.team_abbreviation
-                },
-                "played": True,
-                "minutes": game_score.minutes_played,
-                "stats": {
-                    "points": game_score.points,
-                    "rebounds": game_score.rebounds,
-                    "assists": game_score.assists,
-                    "steals": game_score.steals,
-                    "blocks": game_score.blocks,
-                    "turnovers": game_score.turnovers
-                },
-                "fantasy_score": round(game_score.fantasy_score, 1)
-            })
-        else:
-            # Joueur n'a pas joué (repos/blessé)
-            player_scores.append({
-                "position_slot": roster_slot.roster_slot.value,
-                "player": {
-                    "id": player.id,
-                    "full_name": player.full_name,
-                    "position": player.position.value,
-                    "team": player.team_abbreviation
-                },
-                "played": False,
-                "minutes": 0,
-                "stats": None,
-                "fantasy_score": 0.0
-            })
+        played = row.contribution is not None
+        has_stats = row.game_score_id is not None
+        player_scores.append({
+            "position_slot": row.roster_slot.value,
+            "player": {
+                "id": row.player_id,
+                "full_name": row.full_name,
+                "position": row.position.value,
+                "team": row.team_on_date or row.team_abbreviation
+            },
+            "played": played,
+            "minutes": row.minutes_played if has_stats else 0,
+            "stats": {
+                "points": row.points,
+                "rebounds": row.rebounds,
+                "assists": row.assists,
+                "steals": row.steals,
+                "blocks": row.blocks,
+                "turnovers": row.turnovers
+            } if has_stats else None,
+            "fantasy_score": round(row.contribution, 1) if played else 0.0
+        })
     
-    return {
+    return ORJSONResponse({
         "team": {
-            "id": team.id,
-            "name": team.name
+            "id": rows[0].team_id,
+            "name": rows[0].team_name
         },
         "date": target_date.isoformat(),
-        "total_score": round(team_score.total_score, 1),
+        "total_score": round(rows[0].total_score, 1),
+        "players_who_played": rows[0].players_who_played,
         "player_scores": player_scores
-    }
+    })
 
 
 @router.get("/leagues/solo/leaderboard")
@@ -303,7 +353,7 @@ def get_league_leaderboard(
     # Limiter le nombre de résultats
     rankings = rankings[:limit]
     
-    return {
+    return ORJSONResponse({
         "league": {
             "id": league.id,
             "name": league.name,
@@ -317,4 +367,4 @@ def get_league_leaderboard(
         "total_teams": len(teams),
         "displayed_teams": len(rankings),
         "leaderboard": rankings
-    }
+    })
@@ -14,6 +14,7 @@ from typing import List
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.idempotency import IdempotentRequest, get_idempotency
 from app.models.utilisateur import Utilisateur
 from app.models.fantasy_team import FantasyTeam
 from app.models.league import League, LeagueType
@@ -36,7 +37,8 @@ router = APIRouter()
 def create_fantasy_team(
     team_data: FantasyTeamCreate,
     db: Session = Depends(get_db),
-    current_user: Utilisateur = Depends(get_current_user)
+    current_user: Utilisateur = Depends(get_current_user),
+    idempotency: IdempotentRequest = Depends(get_idempotency)
 ):
     """
     ## Créer une nouvelle équipe fantasy dans une ligue
@@ -57,8 +59,14 @@ def create_fantasy_team(
     - Pour les PRIVATE leagues : max_teams ne doit pas être dépassé
     - Le salary_cap_used commence à 0
     - La waiver_priority est attribuée automatiquement (dernier arrivé)
+    
+    **Header optionnel :** `Idempotency-Key` (un essai rejoué renvoie l'équipe déjà créée)
     """
     
+    # 0. Requête rejouée (même Idempotency-Key) : réponse d'origine
+    if idempotency.replay is not None:
+        return idempotency.replay
+    
     # 1. Vérifier que la ligue existe et est active
     league = db.query(League).filter(League.id == team_data.league_id).first()
     if not league:
@@ -118,7 +126,7 @@ def create_fantasy_team(
     db.commit()
     db.refresh(new_team)
     
-    return new_team
+    return idempotency.save(FantasyTeamRead.model_validate(new_team), status_code=status.HTTP_201_CREATED)
 
 
 # ========================================
@@ -279,6 +287,10 @@ def delete_team(
         )
     
     # Supprimer l'équipe
+    # Ligue privée : ses joueurs redeviennent libres → bitmap reconstruit au prochain accès
+    if team.league.type == LeagueType.PRIVATE:
+        team.league.ownership_bitmap = None
+    
     db.delete(team)
     db.commit()
     
@@ -1,12 +1,16 @@
 """
 Endpoints pour les utilisateurs
+
+Les endpoints d'administration sont async et utilisent la session async
+(get_async_db) : aucune requête SQL ne bloque la boucle d'événements.
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.auth import get_current_user
+from app.core.database import get_async_db
+from app.core.auth import get_current_user_async, invalidate_cached_user
 from app.models.utilisateur import Utilisateur
 from app.schemas.auth import UtilisateurResponse
 
@@ -31,8 +35,8 @@ async def obtenir_utilisateur(utilisateur_id: int):
 
 @router.get("/admin/all", response_model=List[UtilisateurResponse])
 async def get_all_users(
-    db: Session = Depends(get_db),
-    current_user: Utilisateur = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Utilisateur = Depends(get_current_user_async)
 ):
     """
     Liste tous les utilisateurs de la plateforme
@@ -47,16 +51,16 @@ async def get_all_users(
         )
     
     # Récupérer tous les utilisateurs
-    users = db.query(Utilisateur).order_by(Utilisateur.date_creation.desc()).all()
+    result = await db.execute(select(Utilisateur).order_by(Utilisateur.date_creation.desc()))
     
-    return users
+    return result.scalars().all()
 
 
 @router.patch("/admin/{user_id}/promote", response_model=UtilisateurResponse)
 async def promote_user_to_admin(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: Utilisateur = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Utilisateur = Depends(get_current_user_async)
 ):
     """
     Promouvoir un utilisateur en administrateur
@@ -69,7 +73,7 @@ async def promote_user_to_admin(
             detail="Accès réservé aux administrateurs"
         )
     
-    user = db.query(Utilisateur).filter(Utilisateur.id == user_id).first()
+    user = await db.get(Utilisateur, user_id)
     
     if not user:
         raise HTTPException(
@@ -84,8 +88,8 @@ async def promote_user_to_admin(
         )
     
     user.is_admin = True
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    invalidate_cached_user(user.nom_utilisateur)  # Droits relus à sa prochaine requête
     
     return user
 
@@ -93,8 +97,8 @@ async def promote_user_to_admin(
 @router.patch("/admin/{user_id}/demote", response_model=UtilisateurResponse)
 async def demote_admin_to_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: Utilisateur = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Utilisateur = Depends(get_current_user_async)
 ):
     """
     Rétrograder un administrateur en utilisateur normal
@@ -107,7 +111,7 @@ async def demote_admin_to_user(
             detail="Accès réservé aux administrateurs"
         )
     
-    user = db.query(Utilisateur).filter(Utilisateur.id == user_id).first()
+    user = await db.get(Utilisateur, user_id)
     
     if not user:
         raise HTTPException(
@@ -128,7 +132,7 @@ async def demote_admin_to_user(
         )
     
     user.is_admin = False
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    invalidate_cached_user(user.nom_utilisateur)  # Droits relus à sa prochaine requête
     
     return user
@@ -0,0 +1,200 @@
+"""
+Archive colonnaire des scores par match (Parquet)
+
+Les analyses historiques (moyennes sur une saison, distributions, etc.)
+ne passent plus par la table player_game_scores (stockage en lignes,
+base OLTP de l'API) : elles lisent une copie Parquet, en colonnes.
+
+Organisation (partitions Hive, découvertes automatiquement par pyarrow) :
+
+    ARCHIVE_DIR/player_game_scores/
+        season=2025-26/
+            month=2025-10/
+                day-2025-10-21.parquet   ← un fichier par jour terminé
+                day-2025-10-22.parquet
+            month=2025-11/
+                part-0.parquet           ← saison terminée : 1 fichier par mois
+
+Écriture : app.worker.tasks.archive_scores (pipeline quotidien)
+Lecture  : open_archive(), load_scores(), player_season_averages()
+           Fichiers non compressés, mappés en mémoire (mmap) : les pages des
+           colonnes lues sont prises directement dans le cache du système,
+           sans read() ni décompression ; les agrégations pyarrow.compute
+           sont vectorisées.
+"""
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from app.core.config import settings
+
+# Colonnes archivées (statistiques brutes + score final, sans le détail JSON)
+SCORES_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("game_date", pa.date32()),
+    ("player_id", pa.int32()),
+    ("player_name", pa.string()),
+    ("team", pa.string()),
+    ("position", pa.string()),
+    ("opponent", pa.string()),
+    ("minutes_played", pa.int16()),
+    ("points", pa.int16()),
+    ("rebounds", pa.int16()),
+    ("assists", pa.int16()),
+    ("steals", pa.int16()),
+    ("blocks", pa.int16()),
+    ("turnovers", pa.int16()),
+    ("personal_fouls", pa.int16()),
+    ("field_goals_made", pa.int16()),
+    ("field_goals_attempted", pa.int16()),
+    ("three_pointers_made", pa.int16()),
+    ("three_pointers_attempted", pa.int16()),
+    ("free_throws_made", pa.int16()),
+    ("free_throws_attempted", pa.int16()),
+    ("base_score", pa.float64()),
+    ("efficiency_bonus", pa.float64()),
+    ("performance_bonus", pa.float64()),
+    ("penalty", pa.float64()),
+    ("fantasy_score", pa.float64()),
+])
+
+# Lecture des fichiers par mmap (voir open_archive)
+ARCHIVE_FILESYSTEM = fs.LocalFileSystem(use_mmap=True)
+
+# Colonnes de partition (noms des dossiers season=... / month=...)
+PARTITIONING = ds.partitioning(
+    pa.schema([("season", pa.string()), ("month", pa.string())]),
+    flavor="hive"
+)
+
+
+# ========================================
+# ORGANISATION DES FICHIERS
+# ========================================
+
+def season_of(day: date) -> str:
+    """
+    Saison NBA d'une date (la saison commence en octobre)
+
+    Exemple: 2025-10-21 → "2025-26", 2026-04-10 → "2025-26"
+    """
+    start_year = day.year if day.month >= 10 else day.year - 1
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def season_start(season: str) -> date:
+    """Premier jour de la saison (1er octobre)"""
+    return date(int(season[:4]), 10, 1)
+
+
+def season_end(season: str) -> date:
+    """Dernier jour de la saison (30 septembre, playoffs et intersaison compris)"""
+    return date(int(season[:4]) + 1, 9, 30)
+
+
+def archive_root(root: Optional[str] = None) -> Path:
+    """Dossier racine de l'archive des scores par match"""
+    return Path(root or settings.ARCHIVE_DIR) / "player_game_scores"
+
+
+def month_dir(day: date, root: Optional[str] = None) -> Path:
+    """Dossier de partition d'une date (season=.../month=...)"""
+    return archive_root(root) / f"season={season_of(day)}" / f"month={day:%Y-%m}"
+
+
+def day_file(day: date, root: Optional[str] = None) -> Path:
+    """Fichier Parquet d'une journée"""
+    return month_dir(day, root) / f"day-{day.isoformat()}.parquet"
+
+
+# ========================================
+# LECTURE (mmap)
+# ========================================
+
+def open_archive(root: Optional[str] = None) -> Optional[ds.Dataset]:
+    """
+    Ouvre l'archive comme un seul dataset Arrow (None si l'archive est vide)
+
+    Les fichiers sont mappés en mémoire : seules les pages des colonnes
+    effectivement lues sont chargées par le système. Ils sont écrits sans
+    compression (voir archive_scores) : ces pages sont décodées sur place,
+    sans passer par un tampon de décompression.
+    """
+    path = archive_root(root)
+    if not path.exists() or not any(path.rglob("*.parquet")):
+        return None
+
+    return ds.dataset(
+        str(path),
+        schema=SCORES_SCHEMA.append(pa.field("season", pa.string())).append(pa.field("month", pa.string())),
+        format="parquet",
+        partitioning=PARTITIONING,
+        filesystem=ARCHIVE_FILESYSTEM
+    )
+
+
+def load_scores(
+    season: Optional[str] = None,
+    player_id: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    root: Optional[str] = None
+) -> pa.Table:
+    """
+    Charge les scores archivés (filtres poussés jusqu'aux fichiers)
+
+    Le filtre de saison élimine les dossiers entiers sans les ouvrir.
+
+    Args:
+        season: Ex: "2025-26" (toutes les saisons si None)
+        player_id: Un seul joueur
+        columns: Colonnes à lire (toutes si None)
+    """
+    dataset = open_archive(root)
+    if dataset is None:
+        return SCORES_SCHEMA.empty_table() if columns is None else SCORES_SCHEMA.empty_table().select(columns)
+
+    condition = None
+    if season is not None:
+        condition = ds.field("season") == season
+    if player_id is not None:
+        player_condition = ds.field("player_id") == player_id
+        condition = player_condition if condition is None else condition & player_condition
+
+    return dataset.to_table(columns=columns or SCORES_SCHEMA.names, filter=condition)
+
+
+def player_season_averages(season: str, min_games: int = 1, root: Optional[str] = None) -> pa.Table:
+    """
+    Moyennes par joueur sur une saison (agrégation vectorisée)
+
+    Returns:
+        Table Arrow (player_id, games, avg_fantasy_score, avg_points,
+        avg_minutes), triée par moyenne fantasy décroissante
+    """
+    table = load_scores(
+        season=season,
+        columns=["player_id", "fantasy_score", "points", "minutes_played"],
+        root=root
+    )
+
+    grouped = table.group_by("player_id").aggregate([
+        ("fantasy_score", "count"),
+        ("fantasy_score", "mean"),
+        ("points", "mean"),
+        ("minutes_played", "mean"),
+    ])
+    averages = pa.table({
+        "player_id": grouped["player_id"],
+        "games": grouped["fantasy_score_count"],
+        "avg_fantasy_score": grouped["fantasy_score_mean"],
+        "avg_points": grouped["points_mean"],
+        "avg_minutes": grouped["minutes_played_mean"],
+    })
+
+    averages = averages.filter(pc.greater_equal(averages["games"], min_games))
+    return averages.sort_by([("avg_fantasy_score", "descending")])
@@ -2,21 +2,28 @@
 Gestion de l'authentification JWT avec HS256
 
 Ce fichier gère:
-- Hashage des mots de passe avec bcrypt
+- Hashage des mots de passe avec bcrypt (pool de threads dédié)
 - Création de tokens JWT
 - Vérification de tokens JWT
 - Dépendance get_current_user pour protéger les endpoints
+- Cache des utilisateurs authentifiés (aucune requête SQL par appel)
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt  # ← Utiliser bcrypt directement
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.utilisateur import Utilisateur
 
 # Schéma OAuth2 pour extraire le token depuis le header Authorization
@@ -27,6 +34,22 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login
 # PARTIE 1: HASHAGE DES MOTS DE PASSE
 # ========================================
 
+# bcrypt coûte ~250ms de CPU par appel (BCRYPT_ROUNDS=12). Les endpoints
+# d'authentification sont async : ils attendent le hashage (await) dans
+# ce pool dédié sans occuper de thread du threadpool partagé de FastAPI.
+# Un afflux de connexions avant les matchs ne bloque donc plus les
+# endpoints synchrones. bcrypt relâche le GIL : le débit augmente avec
+# le nombre de cœurs (AUTH_HASH_WORKERS).
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.AUTH_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+
+# Contrôle d'admission : au-delà de workers + file d'attente, on refuse
+# tout de suite (503) au lieu d'empiler des requêtes qui expireront
+_hash_slots = threading.BoundedSemaphore(settings.AUTH_HASH_WORKERS + settings.AUTH_HASH_QUEUE_LIMIT)
+
+
 def hash_password(password: str) -> str:
     """
     Hash un mot de passe en clair avec bcrypt
@@ -40,8 +63,8 @@ def hash_password(password: str) -> str:
     # Convertir le mot de passe en bytes
     password_bytes = password.encode('utf-8')
     
-    # Générer un salt et hasher
-    salt = bcrypt.gensalt()
+    # Générer un salt (avec le facteur de coût configuré) et hasher
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Retourner le hash sous forme de string
@@ -67,6 +90,49 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Le hash a-t-il été créé avec un autre facteur de coût que BCRYPT_ROUNDS ?
+
+    Format bcrypt : $2b$<coût>$<salt + hash>
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def _run_hash(function, *args):
+    """
+    Exécute une fonction bcrypt dans le pool dédié sans bloquer la boucle
+
+    Raises:
+        HTTPException 503: Si le pool et sa file d'attente sont pleins
+    """
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Trop de connexions simultanées, réessayez dans quelques secondes",
+            headers={"Retry-After": "1"}
+        )
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, function, *args)
+    finally:
+        _hash_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() exécuté dans le pool bcrypt"""
+    return await _run_hash(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() exécuté dans le pool bcrypt"""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
 # ========================================
 # PARTIE 2: TOKENS JWT
 # ========================================
@@ -130,7 +196,42 @@ def decode_access_token(token: str) -> Optional[str]:
 
 
 # ========================================
-# PARTIE 3: DÉPENDANCE FASTAPI
+# PARTIE 3: CACHE DES UTILISATEURS
+# ========================================
+
+# Nom d'utilisateur (sub du token) → copie détachée de l'Utilisateur
+# Chaque requête authentifiée évite ainsi le SELECT sur utilisateurs ;
+# une modification (promote/demote) appelle invalidate_cached_user()
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+def _detached_copy(user: Utilisateur) -> Utilisateur:
+    """
+    Copie de l'utilisateur hors de toute session (colonnes uniquement)
+
+    La copie n'est jamais modifiée ni attachée : chaque requête en obtient
+    sa propre instance via db.merge(..., load=False), sans requête SQL.
+    """
+    copy = Utilisateur(**{
+        attribute.key: getattr(user, attribute.key)
+        for attribute in inspect(Utilisateur).column_attrs
+    })
+    make_transient_to_detached(copy)
+    return copy
+
+
+def invalidate_cached_user(username: str):
+    """Force la relecture en base de cet utilisateur à sa prochaine requête"""
+    _user_cache.pop(username)
+
+
+def clear_user_cache():
+    """Vide le cache des utilisateurs (tests)"""
+    _user_cache.clear()
+
+
+# ========================================
+# PARTIE 4: DÉPENDANCE FASTAPI
 # ========================================
 
 async def get_current_user(
@@ -155,20 +256,60 @@ async def get_current_user(
     Raises:
         HTTPException 401: Si le token est invalide ou l'utilisateur n'existe pas
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Impossible de valider les identifiants",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    credentials_exception = _credentials_exception()
     
     # Décoder le token
     username = decode_access_token(token)
     if username is None:
         raise credentials_exception
     
-    # Chercher l'utilisateur en BDD
+    # Utilisateur déjà résolu récemment : rattaché à la session sans requête
+    cached = _user_cache.get(username)
+    if cached is not None:
+        return db.merge(cached, load=False)
+    
+    # Sinon, chercher l'utilisateur en BDD
     user = db.query(Utilisateur).filter(Utilisateur.nom_utilisateur == username).first()
     if user is None:
         raise credentials_exception
     
-    return user
\ No newline at end of file
+    _user_cache.set(username, _detached_copy(user))
+    return user
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Utilisateur:
+    """
+    Équivalent de get_current_user pour les endpoints qui utilisent get_async_db
+    
+    Même cache d'utilisateurs ; l'utilisateur retourné est rattaché à la
+    session async de l'endpoint.
+    """
+    credentials_exception = _credentials_exception()
+    
+    username = decode_access_token(token)
+    if username is None:
+        raise credentials_exception
+    
+    cached = _user_cache.get(username)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+    
+    result = await db.execute(select(Utilisateur).where(Utilisateur.nom_utilisateur == username))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise credentials_exception
+    
+    _user_cache.set(username, _detached_copy(user))
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    """Erreur 401 commune aux deux dépendances"""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Impossible de valider les identifiants",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Cache mémoire à durée de vie limitée (TTL) et taille bornée (LRU)
+
+Utilisé pour les petits états de l'API qui n'ont pas besoin d'être en base
+(ex: réponses rejouées par Idempotency-Key). Local au processus : chaque
+instance de l'API a le sien.
+
+- Une entrée expire `ttl` secondes après son écriture
+- Au-delà de `maxsize` entrées, la moins récemment utilisée est évincée
+- Thread-safe (les endpoints synchrones tournent dans un pool de threads)
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Dictionnaire avec expiration et éviction LRU
+
+    Exemple:
+        cache = TTLCache(maxsize=1000, ttl=60)
+        cache.set("clé", valeur)
+        cache.get("clé")  # → valeur (ou None si expirée/absente)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # clé → (expire_at, valeur)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expire_at, value = entry
+            if expire_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def setdefault(self, key, value):
+        """
+        Écrit `value` seulement si la clé est absente (ou expirée)
+
+        Returns:
+            La valeur présente dans le cache après l'appel (atomique :
+            un seul appelant concurrent « gagne » la clé)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                return entry[1]
+
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -6,8 +6,11 @@ Ce fichier crée la connexion à PostgreSQL et fournit:
 - SessionLocal: Pour créer des sessions de BDD
 - Base: La classe de base pour tous nos modèles
 - get_db(): Fonction pour obtenir une session BDD dans FastAPI
+- async_engine / AsyncSessionLocal / get_async_db(): la même chose en
+  async (asyncpg), pour les endpoints `async def`
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -29,6 +32,22 @@ SessionLocal = sessionmaker(
     bind=engine        # On lie au moteur créé ci-dessus
 )
 
+# Engine async (asyncpg) : une requête lente ne bloque ni la boucle
+# d'événements ni un thread, un seul worker uvicorn peut donc en
+# attendre beaucoup en parallèle
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    echo=settings.DEBUG
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # Pas de rechargement implicite (impossible en async) après commit
+)
+
 # Base est la classe parente de tous nos modèles
 # Tous nos modèles (User, Player, etc.) vont hériter de Base
 Base = declarative_base()
@@ -52,3 +71,17 @@ def get_db():
         yield db  # Donne la session à celui qui appelle
     finally:
         db.close()  # Ferme toujours la session à la fin
+
+
+async def get_async_db():
+    """
+    Générateur de session async (équivalent de get_db pour les endpoints async)
+    
+    Exemple d'utilisation:
+        @app.get("/users")
+        async def get_users(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(User))
+            return result.scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,142 @@
+"""
+Requêtes idempotentes (header Idempotency-Key)
+
+Les clients mobiles rejouent POST /teams, POST /teams/{id}/roster et
+DELETE /teams/{id}/roster/{player_id} quand le réseau coupe. Sans
+protection, chaque nouvel essai repasse toutes les validations et peut
+créer des Transfer en double.
+
+Le client envoie un header `Idempotency-Key: <uuid>` (le même pour tous
+les essais d'une action) :
+- 1er passage : la requête est exécutée, sa réponse (2xx) est mémorisée
+- Essais suivants : la réponse d'origine est renvoyée telle quelle,
+  sans toucher à la base
+- Même clé pour une requête différente (autre URL ou autre corps) : 422
+- Même clé pendant que la 1re requête est en cours : 409
+
+Les réponses sont gardées IDEMPOTENCY_TTL_SECONDS (cache mémoire du
+processus, clé = utilisateur + Idempotency-Key). Sans header, rien ne change.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.auth import get_current_user
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.utilisateur import Utilisateur
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# (user_id, Idempotency-Key) → _Entry
+_store = TTLCache(maxsize=settings.IDEMPOTENCY_MAX_KEYS, ttl=settings.IDEMPOTENCY_TTL_SECONDS)
+
+
+class _Entry:
+    """Requête enregistrée : empreinte + réponse (None tant qu'elle est en cours)"""
+    __slots__ = ("fingerprint", "status_code", "content")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.status_code = None
+        self.content = None
+
+
+class IdempotentRequest:
+    """
+    Contexte injecté dans l'endpoint
+
+    Usage:
+        if idempotency.replay is not None:
+            return idempotency.replay
+        ...
+        return idempotency.save(reponse, status_code=201)
+    """
+
+    def __init__(self, key: Optional[tuple] = None, entry: Optional[_Entry] = None, owner: bool = False):
+        self._key = key
+        self._entry = entry
+        self._owner = owner  # True = cette requête exécute l'action
+        self.saved = False
+
+    @property
+    def replay(self) -> Optional[JSONResponse]:
+        """Réponse d'origine si la requête a déjà été traitée, sinon None"""
+        if self._entry is None or self._owner:
+            return None
+        return JSONResponse(content=self._entry.content, status_code=self._entry.status_code)
+
+    def save(self, content: Any, status_code: int = status.HTTP_200_OK) -> Any:
+        """Mémorise la réponse pour les essais suivants et la renvoie inchangée"""
+        if self._owner:
+            self._entry.content = jsonable_encoder(content)
+            self._entry.status_code = status_code
+            self.saved = True
+        return content
+
+
+def _fingerprint(request: Request, body: bytes) -> str:
+    """Empreinte de la requête (méthode, URL, corps)"""
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(str(request.url.path).encode())
+    digest.update(str(request.url.query).encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def get_idempotency(
+    request: Request,
+    current_user: Utilisateur = Depends(get_current_user)
+):
+    """
+    Dépendance FastAPI : lit le header Idempotency-Key
+
+    Si l'action échoue (exception ou erreur 4xx), la clé est libérée :
+    le client peut réessayer avec la même clé.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key:
+        yield IdempotentRequest()
+        return
+
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} trop longue ({MAX_KEY_LENGTH} caractères max)"
+        )
+
+    fingerprint = _fingerprint(request, await request.body())
+    cache_key = (current_user.id, key)
+    new_entry = _Entry(fingerprint)
+    entry = _store.setdefault(cache_key, new_entry)
+
+    if entry is not new_entry:
+        if entry.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_HEADER} déjà utilisée pour une autre requête"
+            )
+        if entry.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Une requête avec cette Idempotency-Key est déjà en cours de traitement"
+            )
+        yield IdempotentRequest(cache_key, entry)
+        return
+
+    idempotency = IdempotentRequest(cache_key, entry, owner=True)
+    try:
+        yield idempotency
+    finally:
+        if not idempotency.saved:
+            _store.pop(cache_key)
+
+
+def clear_idempotency_store():
+    """Vide les réponses mémorisées (tests)"""
+    _store.clear()
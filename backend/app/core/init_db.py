@@ -15,6 +15,7 @@ from app.models.fantasy_team_player import FantasyTeamPlayer, RosterSlot
 from app.models.player_game_score import PlayerGameScore
 from app.models.fantasy_team_score import FantasyTeamScore
 from app.models.transfer import Transfer, TransferType, TransferStatus
+from app.models.player_team_history import PlayerTeamHistory
 
 
 def init_db():
@@ -30,6 +31,7 @@ def init_db():
     6. player_game_scores (Phase 2)
     7. fantasy_team_scores (Phase 2)
     8. transfers (Phase 2)
+    9. player_team_history (historique des trades NBA)
     """
     print("🔨 Création de toutes les tables...")
     print("\n📋 Modèles importés:")
@@ -41,6 +43,14 @@ def init_db():
     print("   ✅ PlayerGameScore (scores quotidiens)")
     print("   ✅ FantasyTeamScore (scores équipe)")
     print("   ✅ Transfer (historique transferts)")
+    print("   ✅ PlayerTeamHistory (historique équipes NBA)")
+    
+    # Extension trigramme (index de recherche sur players.search_name)
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy import text
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        print("\n🔎 Extension pg_trgm activée")
     
     # Cette ligne magique crée TOUTES les tables définies dans Base
     Base.metadata.create_all(bind=engine)
@@ -68,6 +78,14 @@ def init_db():
             print(f"   ✅ Ligue SOLO créée avec ID: {solo_league.id}")
         else:
             print(f"\n🌍 Ligue SOLO déjà existante (ID: {solo_league.id})")
+        
+        # Remplir search_name pour les joueurs créés avant son ajout
+        players_to_index = session.query(Player).filter(Player.search_name.is_(None)).all()
+        if players_to_index:
+            for player in players_to_index:
+                player.full_name = player.full_name  # Déclenche la normalisation
+            session.commit()
+            print(f"   🔎 search_name rempli pour {len(players_to_index)} joueurs")
     
     # Vérifier que toutes les tables ont bien été créées
     from sqlalchemy import inspect
@@ -87,7 +105,8 @@ def init_db():
         'fantasy_team_players',
         'player_game_scores',
         'fantasy_team_scores',
-        'transfers'
+        'transfers',
+        'player_team_history'
     ]
     
     missing = set(expected_tables) - set(tables)
@@ -0,0 +1,104 @@
+"""
+Bitmap de propriété des joueurs (ligues PRIVATE)
+
+Dans une ligue privée, un joueur NBA ne peut appartenir qu'à une seule
+équipe. Au lieu de joindre FantasyTeamPlayer → FantasyTeam à chaque
+vérification, chaque ligue garde un bitmap indexé par player_id :
+bit à 1 = joueur pris dans la ligue.
+
+- Persisté dans League.ownership_bitmap (quelques dizaines d'octets
+  pour ~600 joueurs), donc partagé entre l'API et le worker
+- Mis à jour dans la MÊME transaction que le roster (ajout, retrait,
+  waivers), sous verrou de la ligue (SELECT ... FOR UPDATE)
+- NULL = bitmap à reconstruire (ex: équipe supprimée), reconstruit
+  à la demande en une requête
+"""
+from sqlalchemy.orm import Session
+
+from app.models.league import League
+from app.models.fantasy_team import FantasyTeam
+from app.models.fantasy_team_player import FantasyTeamPlayer
+
+
+class OwnershipBitmap:
+    """
+    Ensemble de player_id stocké bit à bit
+
+    S'utilise comme un set : `player_id in bitmap`, add(), discard()
+    """
+    __slots__ = ("_bits",)
+
+    def __init__(self, data: bytes = b""):
+        self._bits = bytearray(data or b"")
+
+    @classmethod
+    def from_ids(cls, player_ids) -> "OwnershipBitmap":
+        bitmap = cls()
+        for player_id in player_ids:
+            bitmap.add(player_id)
+        return bitmap
+
+    def __contains__(self, player_id: int) -> bool:
+        byte_index = player_id >> 3
+        return byte_index < len(self._bits) and bool(self._bits[byte_index] & (1 << (player_id & 7)))
+
+    def add(self, player_id: int):
+        byte_index = player_id >> 3
+        if byte_index >= len(self._bits):
+            self._bits.extend(bytes(byte_index + 1 - len(self._bits)))
+        self._bits[byte_index] |= 1 << (player_id & 7)
+
+    def discard(self, player_id: int):
+        byte_index = player_id >> 3
+        if byte_index < len(self._bits):
+            self._bits[byte_index] &= ~(1 << (player_id & 7)) & 0xFF
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+
+def build_league_bitmap(db: Session, league_id: int) -> OwnershipBitmap:
+    """Reconstruit le bitmap d'une ligue depuis les rosters (1 requête)"""
+    player_ids = db.query(FantasyTeamPlayer.player_id).join(FantasyTeam).filter(
+        FantasyTeam.league_id == league_id
+    ).all()
+    return OwnershipBitmap.from_ids(player_id for (player_id,) in player_ids)
+
+
+def get_league_bitmap(db: Session, league: League) -> OwnershipBitmap:
+    """
+    Bitmap de la ligue (reconstruit et enregistré sur la ligue s'il est absent)
+
+    Le commit reste à l'appelant.
+    """
+    if league.ownership_bitmap is None:
+        bitmap = build_league_bitmap(db, league.id)
+        league.ownership_bitmap = bitmap.to_bytes()
+        return bitmap
+
+    return OwnershipBitmap(league.ownership_bitmap)
+
+
+def lock_league(db: Session, league_id: int) -> League:
+    """
+    Charge la ligue en la verrouillant (SELECT ... FOR UPDATE)
+
+    Sérialise les modifications de roster d'une même ligue privée : deux
+    ajouts simultanés du même joueur ne peuvent plus passer tous les deux.
+    (Sans effet en SQLite.)
+    """
+    return db.query(League).filter(League.id == league_id).with_for_update().first()
+
+
+def lock_team(db: Session, team_id: int) -> FantasyTeam:
+    """
+    Charge l'équipe en la verrouillant (SELECT ... FOR UPDATE)
+
+    Sérialise les modifications du roster d'une équipe (lineup, retrait) :
+    l'UPDATE conditionnel du salary cap de l'ajout prend le même verrou.
+    Ordre des verrous : ligue (si privée) → équipe → lignes du roster.
+    (Sans effet en SQLite.)
+    """
+    return db.query(FantasyTeam).filter(
+        FantasyTeam.id == team_id
+    ).with_for_update().populate_existing().first()
@@ -0,0 +1,66 @@
+"""
+Pagination par curseur (keyset pagination)
+
+Au lieu de OFFSET (qui relit toutes les lignes sautées), on repart de la
+dernière ligne renvoyée : tri (valeur, id), page suivante = lignes
+strictement après (dernière valeur, dernier id).
+Le coût d'une page est le même quelle que soit sa profondeur.
+Utilisé par app.core.player_catalog.paginate_players.
+
+Le curseur est opaque pour le client : base64 d'un JSON
+{"s": clé de tri, "v": valeur de tri, "id": id de la dernière ligne}.
+"""
+import base64
+import json
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    """Construit le curseur opaque pointant après la ligne (value, row_id)"""
+    payload = json.dumps({"s": sort_key, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, value_types: Optional[Tuple[type, ...]] = None):
+    """
+    Décode un curseur
+
+    Args:
+        cursor: Curseur opaque reçu du client
+        sort_key: Tri attendu (ex: "fantasy_cost:desc")
+        value_types: Types acceptés pour la valeur de tri (ex: (int, float)) ;
+                     un curseur modifié à la main ne doit pas casser la comparaison
+
+    Returns:
+        (valeur de tri, id)
+
+    Raises:
+        HTTPException 400 si le curseur est invalide ou créé pour un autre tri
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, row_id = payload["v"], int(payload["id"])
+        cursor_sort_key = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Curseur de pagination invalide"
+        )
+
+    if value_types is not None and (isinstance(value, bool) or not isinstance(value, value_types)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Curseur de pagination invalide"
+        )
+
+    if cursor_sort_key != sort_key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Curseur créé pour un autre tri, recommencez depuis la première page"
+        )
+
+    return value, row_id
+
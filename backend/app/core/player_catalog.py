@@ -0,0 +1,227 @@
+"""
+Catalogue des joueurs NBA en mémoire (snapshot immuable)
+
+La table players ne change que lors des tâches du worker (sync_players,
+update_salaries, detect_nba_trades). Plutôt que de relancer une requête
+SQL filtrée à chaque appel de GET /players, l'API garde en mémoire un
+snapshot de tous les joueurs avec des index prêts à l'emploi :
+- par poste (PG, SG, SF, PF, C)
+- par équipe NBA (LAL, GSW, ...)
+- par salaire (liste triée, recherche par dichotomie)
+
+Rafraîchissement :
+- Toutes les CATALOG_REFRESH_SECONDS secondes, une requête légère
+  (COUNT + MAX(last_updated)) vérifie si la table a changé ;
+  si oui, le snapshot est reconstruit puis remplacé d'un coup
+  (les requêtes en cours gardent l'ancien, jamais d'état intermédiaire)
+- invalidate_catalog() force la reconstruction au prochain appel
+  (appelée en fin de tâche quand worker et API partagent le processus)
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.search import normalize_name
+from app.models.player import Player
+
+
+class CatalogPlayer:
+    """
+    Joueur du catalogue (lecture seule)
+
+    Mêmes noms d'attributs que Player : PlayerRead.model_validate() fonctionne
+    directement. __slots__ = pas de __dict__ par joueur (empreinte mémoire réduite).
+    """
+    __slots__ = (
+        "id", "external_api_id", "first_name", "last_name", "full_name", "search_name",
+        "position", "team", "team_abbreviation", "fantasy_cost",
+        "avg_fantasy_score_last_15", "games_played_last_20", "is_active"
+    )
+
+    def __init__(self, row):
+        for attribute in self.__slots__:
+            setattr(self, attribute, getattr(row, attribute))
+        if self.search_name is None:
+            self.search_name = normalize_name(self.full_name)
+
+
+# Tris disponibles : valeur de tri d'un joueur (NULL traité comme 0, comme en SQL)
+SORT_KEYS = {
+    "fantasy_cost": lambda p: p.fantasy_cost,
+    "avg_fantasy_score_last_15": lambda p: p.avg_fantasy_score_last_15 or 0.0,
+    "last_name": lambda p: p.last_name,
+}
+
+# Type de la valeur de tri stockée dans le curseur (validé au décodage)
+SORT_VALUE_TYPES = {
+    "fantasy_cost": (int, float),
+    "avg_fantasy_score_last_15": (int, float),
+    "last_name": (str,),
+}
+
+
+class PlayerCatalog:
+    """
+    Snapshot immuable de la table players
+
+    Attributs:
+        version: (nombre de joueurs, dernière mise à jour) au moment du chargement
+        players: Tous les joueurs (tuple trié par id)
+        by_position: {Position: tuple de joueurs}
+        by_team: {code équipe: tuple de joueurs}
+        by_cost: Joueurs triés par salaire croissant (+ costs pour la dichotomie)
+    """
+
+    def __init__(self, players: list, version: tuple):
+        self.version = version
+        self.players = tuple(sorted(players, key=lambda p: p.id))
+
+        by_position = {}
+        by_team = {}
+        for player in self.players:
+            by_position.setdefault(player.position, []).append(player)
+            by_team.setdefault(player.team_abbreviation, []).append(player)
+        self.by_position = {key: tuple(value) for key, value in by_position.items()}
+        self.by_team = {key: tuple(value) for key, value in by_team.items()}
+
+        self.by_cost = tuple(sorted(self.players, key=lambda p: (p.fantasy_cost, p.id)))
+        self._costs = [player.fantasy_cost for player in self.by_cost]
+
+    def salary_range(self, min_salary=None, max_salary=None) -> tuple:
+        """Joueurs dont le salaire est dans [min_salary, max_salary] (dichotomie)"""
+        start = bisect_left(self._costs, min_salary) if min_salary is not None else 0
+        end = bisect_right(self._costs, max_salary) if max_salary is not None else len(self._costs)
+        return self.by_cost[start:end]
+
+    def search(
+        self,
+        position=None,
+        team=None,
+        min_salary=None,
+        max_salary=None,
+        search=None,
+        is_active=None
+    ) -> list:
+        """
+        Filtre le catalogue (mêmes filtres que GET /players)
+
+        On part du plus petit index applicable (poste, équipe ou fourchette
+        de salaire) puis on applique les autres filtres en Python.
+        """
+        candidates = [self.players]
+        if position is not None:
+            candidates.append(self.by_position.get(position, ()))
+        if team is not None:
+            candidates.append(self.by_team.get(team, ()))
+        if min_salary is not None or max_salary is not None:
+            candidates.append(self.salary_range(min_salary, max_salary))
+        candidates = min(candidates, key=len)
+
+        term = normalize_name(search) if search else None
+
+        return [
+            player for player in candidates
+            if (is_active is None or player.is_active == is_active)
+            and (position is None or player.position == position)
+            and (team is None or player.team_abbreviation == team)
+            and (min_salary is None or player.fantasy_cost >= min_salary)
+            and (max_salary is None or player.fantasy_cost <= max_salary)
+            and (term is None or term in player.search_name)
+        ]
+
+
+def paginate_players(players: list, sort_by: str, descending: bool, limit: int, cursor=None, skip: int = 0):
+    """
+    Trie et pagine une liste de joueurs du catalogue
+
+    Tri (valeur, id), curseur opaque (voir app.core.pagination).
+
+    Returns:
+        (joueurs de la page, curseur de la page suivante ou None)
+    """
+    sort_value = SORT_KEYS[sort_by]
+    sort_key = f"{sort_by}:{'desc' if descending else 'asc'}"
+    ordered = sorted(players, key=lambda p: (sort_value(p), p.id), reverse=descending)
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_key, SORT_VALUE_TYPES[sort_by])
+        position = bisect_after(ordered, (value, last_id), sort_value, descending)
+        ordered = ordered[position:]
+    elif skip:
+        ordered = ordered[skip:]
+
+    page = ordered[:limit]
+    if len(ordered) <= limit:
+        return page, None
+
+    last = page[-1]
+    return page, encode_cursor(sort_key, sort_value(last), last.id)
+
+
+def bisect_after(ordered: list, boundary: tuple, sort_value, descending: bool) -> int:
+    """Index du premier joueur strictement après `boundary` = (valeur, id) dans l'ordre de tri"""
+    low, high = 0, len(ordered)
+    while low < high:
+        middle = (low + high) // 2
+        key = (sort_value(ordered[middle]), ordered[middle].id)
+        is_after = key < boundary if descending else key > boundary
+        if is_after:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+# ========================================
+# SNAPSHOT COURANT (partagé par les requêtes)
+# ========================================
+
+_catalog = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _table_version(db: Session) -> tuple:
+    """Signature de la table players : change à chaque INSERT/UPDATE/DELETE"""
+    count, last_updated = db.query(func.count(Player.id), func.max(Player.last_updated)).one()
+    return count, last_updated
+
+
+def get_catalog(db: Session) -> PlayerCatalog:
+    """
+    Retourne le snapshot courant (reconstruit si la table a changé)
+
+    Hors rafraîchissement, aucune requête SQL n'est exécutée.
+    """
+    global _catalog, _checked_at
+
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - _checked_at < settings.CATALOG_REFRESH_SECONDS:
+        return catalog
+
+    with _lock:
+        # Un autre thread a pu rafraîchir pendant l'attente du verrou
+        if _catalog is not None and time.monotonic() - _checked_at < settings.CATALOG_REFRESH_SECONDS:
+            return _catalog
+
+        version = _table_version(db)
+        if _catalog is None or _catalog.version != version:
+            rows = db.query(*[getattr(Player, attribute) for attribute in CatalogPlayer.__slots__]).all()
+            # Remplacement atomique : le nouveau snapshot est complet avant d'être publié
+            _catalog = PlayerCatalog([CatalogPlayer(row) for row in rows], version)
+
+        _checked_at = time.monotonic()
+        return _catalog
+
+
+def invalidate_catalog():
+    """Force la reconstruction du snapshot au prochain appel de get_catalog()"""
+    global _catalog, _checked_at
+    with _lock:
+        _catalog = None
+        _checked_at = 0.0
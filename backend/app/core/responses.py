@@ -0,0 +1,37 @@
+"""
+Réponses JSON rapides
+
+Par défaut, FastAPI revalide la valeur retournée contre response_model,
+la convertit avec jsonable_encoder (Python pur, récursif) puis la passe
+à json.dumps. Sur une liste de 1000 joueurs, c'est l'essentiel du temps
+de la requête.
+
+- ORJSONResponse est la classe de réponse par défaut de l'application
+  (app.main) : sérialisation orjson au lieu de json.dumps
+- model_response() : un modèle Pydantic déjà construit est sérialisé en
+  une passe par pydantic-core (Rust), sans revalidation ni jsonable_encoder
+- Les endpoints qui retournent des dict renvoient ORJSONResponse(...)
+  directement (orjson gère date/datetime nativement)
+
+response_model reste déclaré sur les routes pour la documentation OpenAPI.
+"""
+from fastapi import status
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+
+__all__ = ["ORJSONResponse", "model_response"]
+
+
+def model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Sérialise un modèle Pydantic directement en JSON (mêmes alias que FastAPI)
+
+    Args:
+        model: Réponse déjà validée (ou construite avec model_construct)
+        status_code: Code HTTP
+    """
+    return Response(
+        content=model.model_dump_json(by_alias=True),
+        status_code=status_code,
+        media_type="application/json"
+    )
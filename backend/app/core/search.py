@@ -0,0 +1,69 @@
+"""
+Recherche de joueurs par nom
+
+- normalize_name(): forme normalisée d'un nom (minuscules, sans accents)
+  stockée dans Player.search_name
+- name_search_filter() / name_search_rank(): condition et tri SQL
+
+En PostgreSQL, Player.search_name porte un index GIN trigramme (pg_trgm) :
+LIKE '%...%' et l'opérateur de similarité % utilisent l'index au lieu
+d'un scan séquentiel, et similarity() sert à classer les résultats.
+En SQLite (tests), on retombe sur un LIKE classé par préfixe.
+"""
+import unicodedata
+
+from sqlalchemy import case, func, or_
+
+# Lettres sans décomposition Unicode (NFKD ne les ramène pas à l'ASCII)
+_EXTRA_LETTERS = str.maketrans({"đ": "d", "ł": "l", "ø": "o", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+
+def normalize_name(value: str) -> str:
+    """
+    Normalise un nom pour la recherche
+
+    Exemple: "Nikola Jokić" → "nikola jokic", "Luka  Dončić" → "luka doncic"
+    """
+    if not value:
+        return ""
+
+    decomposed = unicodedata.normalize("NFKD", value.lower().translate(_EXTRA_LETTERS))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.split())
+
+
+def _like_pattern(term: str) -> str:
+    """Motif LIKE '%term%' (les caractères spéciaux de LIKE sont échappés)"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def name_search_filter(column, search: str, dialect_name: str):
+    """
+    Condition SQL : le nom normalisé contient la recherche
+
+    En PostgreSQL, on accepte aussi les noms proches (opérateur trigramme %),
+    ce qui tolère les fautes de frappe ("jokic" ↔ "jockic").
+    """
+    term = normalize_name(search)
+    condition = column.like(_like_pattern(term), escape="\\")
+
+    if dialect_name == "postgresql":
+        condition = or_(condition, column.op("%")(term))
+
+    return condition
+
+
+def name_search_rank(column, search: str, dialect_name: str):
+    """
+    Tri SQL par pertinence (meilleur résultat en premier)
+
+    - PostgreSQL : similarity() trigramme décroissante
+    - Autres : les noms qui commencent par la recherche d'abord
+    """
+    term = normalize_name(search)
+
+    if dialect_name == "postgresql":
+        return func.similarity(column, term).desc()
+
+    return case((column.like(f"{term}%"), 0), else_=1)
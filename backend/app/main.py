@@ -5,14 +5,16 @@ NBA Fantasy League - Starting Six
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1.endpoints import auth, leagues, teams, players, roster, scores, utilisateurs  
+from app.core.responses import ORJSONResponse
+from app.api.v1.endpoints import auth, leagues, teams, players, roster, scores, utilisateurs, exports
 
 # Créer l'application FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="API pour gérer votre équipe de fantasy basketball NBA",
     version="1.0.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse  # Sérialisation orjson pour toutes les réponses
 )
 
 # Configuration CORS (pour permettre les requêtes depuis le frontend)
@@ -73,6 +75,13 @@ app.include_router(
     tags=["📊 Scores & Leaderboard"]
 )
 
+# Inclure les routes d'export en flux (NDJSON / CSV)
+app.include_router(
+    exports.router,
+    prefix=f"{settings.API_V1_STR}",
+    tags=["📤 Exports"]
+)
+
 # Route de santé (health check)
 @app.get("/health", tags=["🏥 Santé"])
 def health_check():
@@ -5,18 +5,21 @@ Ce fichier centralise l'import de tous les modèles.
 Cela permet à SQLAlchemy de créer toutes les tables en une seule fois.
 """
 from app.models.utilisateur import Utilisateur
-from app.models.league import League, LeagueType
+from app.models.league import League, LeagueType, WaiverMode
 from app.models.player import Player, Position
 from app.models.fantasy_team import FantasyTeam
 from app.models.fantasy_team_player import FantasyTeamPlayer, RosterSlot
 from app.models.player_game_score import PlayerGameScore
 from app.models.fantasy_team_score import FantasyTeamScore
+from app.models.fantasy_team_score_player import FantasyTeamScorePlayer
 from app.models.transfer import Transfer, TransferType, TransferStatus
+from app.models.player_team_history import PlayerTeamHistory
 
 __all__ = [
     "Utilisateur",
     "League",
     "LeagueType",
+    "WaiverMode",
     "Player",
     "Position",
     "FantasyTeam",
@@ -24,7 +27,9 @@ __all__ = [
     "RosterSlot",
     "PlayerGameScore",
     "FantasyTeamScore",
+    "FantasyTeamScorePlayer",
     "Transfer",
     "TransferType",
     "TransferStatus",
+    "PlayerTeamHistory",
 ]
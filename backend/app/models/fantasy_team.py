@@ -22,6 +22,7 @@ class FantasyTeam(Base):
         league_id: ID de la ligue dans laquelle joue cette équipe
         salary_cap_used: Somme des salaires des joueurs actuels
         waiver_priority: Priorité dans le système de waiver (PRIVATE leagues)
+        faab_remaining: Budget FAAB restant (PRIVATE leagues en mode FAAB)
         transfers_this_week: Nombre de transferts effectués cette semaine
         total_score: Score total accumulé depuis le début de la saison
         rank: Classement actuel dans la ligue
@@ -102,6 +103,14 @@ class FantasyTeam(Base):
     # Ordre inverse du classement: dernier = priorité 1, premier = priorité N
     # NULL pour SOLO leagues (pas de waiver system)
     
+    # Budget FAAB restant (PRIVATE leagues en mode FAAB)
+    faab_remaining = Column(
+        Integer,
+        nullable=True,
+        default=None
+    )
+    # NULL = aucune enchère gagnée, budget complet de la ligue (league.faab_budget)
+    
     # Nombre de transferts effectués cette semaine
     transfers_this_week = Column(
         Integer,
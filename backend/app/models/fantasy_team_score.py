@@ -36,10 +36,10 @@ class FantasyTeamScore(Base):
         score_date: Date du score
         total_score: Score total du jour (somme des 6 joueurs)
         players_who_played: Nombre de joueurs qui ont joué ce jour
-        details: JSON avec le détail de chaque joueur
     
     Relations:
         fantasy_team: L'équipe fantasy
+        lineup: Les 6 joueurs alignés ce jour-là (FantasyTeamScorePlayer)
     """
     
     __tablename__ = "fantasy_team_scores"
@@ -93,6 +93,13 @@ class FantasyTeamScore(Base):
         back_populates="daily_scores"
     )
     
+    # Lineup du jour (figée au moment du calcul)
+    lineup = relationship(
+        "FantasyTeamScorePlayer",
+        back_populates="team_score",
+        cascade="all, delete-orphan"
+    )
+    
     # === CONTRAINTES ===
     
     # Une équipe ne peut avoir qu'un seul score par jour
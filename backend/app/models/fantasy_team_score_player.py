@@ -0,0 +1,114 @@
+"""
+Modèle SQLAlchemy pour la table FantasyTeamScorePlayer
+
+Lineup figée d'une équipe fantasy pour un score quotidien, avec la
+contribution de chaque joueur. Le roster change (transferts, waivers) :
+le détail d'un score passé doit montrer les joueurs alignés ce jour-là,
+pas le roster actuel, et leurs points sans relire PlayerGameScore.
+
+Index inversé joueur → équipes à une date (ix_team_score_players_player_date) :
+quand le score d'un joueur change (correction de stats, match tardif),
+seules les équipes qui l'alignaient ce jour-là sont recalculées
+(voir rescore_teams_for_players dans app.worker.tasks.calculate_team_scores).
+"""
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+from app.models.fantasy_team_player import RosterSlot
+
+
+class FantasyTeamScorePlayer(Base):
+    """
+    Modèle FantasyTeamScorePlayer - Joueur aligné pour un score quotidien
+
+    Écrit par le calcul des scores d'équipes (une ligne par poste),
+    en même temps que le FantasyTeamScore correspondant.
+
+    Attributs:
+        id: Identifiant unique
+        team_score_id: ID du score quotidien de l'équipe
+        player_id: ID du joueur NBA aligné
+        score_date: Date du score (copie de FantasyTeamScore.score_date)
+        roster_slot: Poste occupé ce jour-là (PG, SG, SF, PF, C, UTIL)
+        points: Score fantasy du joueur ce jour-là (NULL = n'a pas joué)
+
+    Relations:
+        team_score: Le score quotidien de l'équipe
+        player: Joueur NBA
+
+    Contraintes:
+        - Un seul joueur par poste et par score
+
+    Index:
+        - (player_id, score_date, team_score_id) : équipes qui alignaient
+          un joueur à une date, sans lire fantasy_team_scores
+    """
+
+    __tablename__ = "fantasy_team_score_players"
+
+    # === COLONNES ===
+
+    id = Column(
+        Integer,
+        primary_key=True,
+        index=True,
+        autoincrement=True
+    )
+
+    # ID du score quotidien (supprimé avec lui)
+    team_score_id = Column(
+        Integer,
+        ForeignKey("fantasy_team_scores.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # ID du joueur NBA
+    player_id = Column(
+        Integer,
+        ForeignKey("players.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    # Indexé via ix_team_score_players_player_date (player_id en tête)
+
+    # Date du score (dénormalisée pour l'index joueur → équipes)
+    score_date = Column(
+        Date,
+        nullable=False
+    )
+
+    # Poste occupé ce jour-là
+    roster_slot = Column(
+        SQLEnum(RosterSlot),
+        nullable=False
+    )
+
+    # Contribution du joueur au score de l'équipe
+    points = Column(
+        Float,
+        nullable=True
+    )
+    # NULL = pas de match (repos, blessé) : compte 0 dans le total
+    # Un score de 0 ou négatif reste un match joué
+
+    # === RELATIONS ===
+
+    team_score = relationship(
+        "FantasyTeamScore",
+        back_populates="lineup"
+    )
+
+    player = relationship("Player")
+
+    # === CONTRAINTES ===
+
+    __table_args__ = (
+        # Un seul joueur par poste pour un score donné
+        UniqueConstraint('team_score_id', 'roster_slot', name='uq_team_score_slot'),
+        # Équipes qui alignaient un joueur à une date: player_id = ? AND score_date = ?
+        Index('ix_team_score_players_player_date', 'player_id', 'score_date', 'team_score_id'),
+    )
+
+    def __repr__(self):
+        return f"<FantasyTeamScorePlayer(team_score_id={self.team_score_id}, player_id={self.player_id}, slot={self.roster_slot.value})>"
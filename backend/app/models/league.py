@@ -5,7 +5,7 @@ Une ligue peut être:
 - SOLO: Publique, tout le monde joue ensemble, pas de limite de joueurs uniques
 - PRIVATE: Privée, 8-12 joueurs, chaque joueur NBA ne peut appartenir qu'à 1 équipe
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, LargeBinary, Enum as SQLEnum, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -37,6 +37,22 @@ class LeagueType(enum.Enum):
     PRIVATE = "PRIVATE"
 
 
+class WaiverMode(enum.Enum):
+    """
+    Mode d'attribution des waivers (ligues PRIVATE uniquement)
+
+    ROLLING: Priorité tournante
+        - L'équipe la mieux placée est servie, puis passe en dernière position
+
+    FAAB: Enchères à l'aveugle (Free Agent Acquisition Budget)
+        - Chaque équipe dispose d'un budget pour la saison (faab_budget)
+        - La plus grosse enchère l'emporte, la waiver priority départage les égalités
+        - Le montant de l'enchère gagnante est déduit du budget de l'équipe
+    """
+    ROLLING = "ROLLING"
+    FAAB = "FAAB"
+
+
 class League(Base):
     """
     Modèle League - Représente une ligue de fantasy basketball
@@ -48,6 +64,9 @@ class League(Base):
         commissioner_id: ID de l'utilisateur créateur (pour PRIVATE uniquement)
         max_teams: Nombre maximum d'équipes (8-12 pour PRIVATE, illimité pour SOLO)
         salary_cap: Plafond salarial (par défaut 60M$)
+        waiver_mode: Mode d'attribution des waivers (ROLLING ou FAAB)
+        faab_budget: Budget FAAB de chaque équipe pour la saison
+        ownership_bitmap: Joueurs pris dans la ligue, un bit par player_id (PRIVATE)
         is_active: La ligue est-elle active?
         start_date: Date de début de la saison
         end_date: Date de fin de la saison
@@ -108,6 +127,29 @@ class League(Base):
         default=60_000_000
     )
     
+    # Mode d'attribution des waivers (PRIVATE uniquement)
+    waiver_mode = Column(
+        SQLEnum(WaiverMode),
+        nullable=False,
+        default=WaiverMode.ROLLING
+    )
+
+    # Budget FAAB de chaque équipe pour la saison (mode FAAB)
+    faab_budget = Column(
+        Integer,
+        nullable=False,
+        default=100
+    )
+    # Exemple: 100 → une équipe peut enchérir au total 100$ sur la saison
+    
+    # Joueurs pris dans la ligue (PRIVATE uniquement), voir app/core/ownership.py
+    ownership_bitmap = Column(
+        LargeBinary,
+        nullable=True
+    )
+    # Bit n à 1 = le joueur d'id n appartient à une équipe de la ligue
+    # NULL = à reconstruire depuis les rosters
+    
     # La ligue est-elle active?
     is_active = Column(
         Boolean,
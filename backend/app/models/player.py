@@ -4,12 +4,13 @@ Modèle SQLAlchemy pour la table Player (Joueur NBA)
 Représente un joueur de la NBA avec ses statistiques fantasy.
 Les données sont synchronisées avec l'API balldontlie.io
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import enum
 
 from app.core.database import Base
+from app.core.search import normalize_name
 
 
 class Position(enum.Enum):
@@ -39,6 +40,7 @@ class Player(Base):
         first_name: Prénom du joueur
         last_name: Nom de famille du joueur
         full_name: Nom complet (pour faciliter les recherches)
+        search_name: Nom normalisé pour la recherche (minuscules, sans accents)
         position: Poste du joueur (PG, SG, SF, PF, C)
         team: Équipe NBA actuelle (ex: "Lakers", "Warriors")
         team_abbreviation: Code de l'équipe (ex: "LAL", "GSW")
@@ -56,6 +58,7 @@ class Player(Base):
     Relations:
         game_scores: Tous les scores de ce joueur par match
         fantasy_team_players: Équipes fantasy qui ont ce joueur
+        team_history: Historique des équipes NBA (trades)
     """
     
     __tablename__ = "players"
@@ -91,6 +94,15 @@ class Player(Base):
     )
     # Exemple: "LeBron James", "Stephen Curry"
     
+    # Nom normalisé pour la recherche (minuscules, sans accents)
+    search_name = Column(
+        String(100),
+        nullable=True
+    )
+    # Exemple: "Nikola Jokić" → "nikola jokic"
+    # Rempli automatiquement à partir de full_name (voir _sync_search_name)
+    # Indexé en trigramme via ix_players_search_name_trgm
+    
     # === INFORMATIONS DE JEU ===
     
     # Poste du joueur
@@ -200,5 +212,30 @@ class Player(Base):
         cascade="all, delete-orphan"
     )
     
+    # Historique des équipes NBA du joueur
+    team_history = relationship(
+        "PlayerTeamHistory",
+        back_populates="player",
+        cascade="all, delete-orphan"
+    )
+    
+    # === INDEX ===
+    
+    __table_args__ = (
+        # Recherche par nom : LIKE '%...%' et similarité trigramme (PostgreSQL + pg_trgm)
+        Index(
+            'ix_players_search_name_trgm',
+            'search_name',
+            postgresql_using='gin',
+            postgresql_ops={'search_name': 'gin_trgm_ops'}
+        ),
+    )
+    
+    @validates("full_name")
+    def _sync_search_name(self, key, value):
+        """Maintient search_name à jour quand full_name change"""
+        self.search_name = normalize_name(value)
+        return value
+    
     def __repr__(self):
         return f"<Player(id={self.id}, name='{self.full_name}', pos={self.position.value}, cost=${self.fantasy_cost:,})>"
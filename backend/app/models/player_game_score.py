@@ -54,6 +54,9 @@ class PlayerGameScore(Base):
         
         # Détails du calcul (pour debug et transparence)
         calculation_breakdown: JSON détaillant chaque composant du score
+        
+        # Réconciliation
+        stat_hash: Empreinte de la ligne de stats (détection des corrections)
     
     Relations:
         player: Le joueur qui a joué ce match
@@ -198,6 +201,17 @@ class PlayerGameScore(Base):
     #     "final": 52.6
     # }
     
+    # === RÉCONCILIATION (corrections de stats NBA) ===
+    
+    stat_hash = Column(
+        String(64),
+        nullable=True
+    )
+    # Empreinte SHA-256 de la ligne de stats brute (voir stat_hash() dans
+    # app.worker.tasks.fetch_boxscores) : la réconciliation ne réécrit que
+    # les lignes dont l'empreinte a changé
+    # NULL = ligne enregistrée avant l'empreinte (réécrite une fois)
+    
     # === RELATIONS ===
     
     player = relationship(
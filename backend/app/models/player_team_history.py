@@ -0,0 +1,126 @@
+"""
+Modèle SQLAlchemy pour la table PlayerTeamHistory
+
+Historique des équipes NBA de chaque joueur.
+Chaque ligne = un intervalle [valid_from, valid_to) pendant lequel
+le joueur appartenait à une équipe donnée.
+"""
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, and_, or_, text
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class PlayerTeamHistory(Base):
+    """
+    Modèle PlayerTeamHistory - Passage d'un joueur dans une équipe NBA
+
+    Exemple:
+    - Luka Doncic : DAL du 2018-07-01 au 2025-02-02
+    - Luka Doncic : LAL depuis le 2025-02-02 (valid_to = NULL)
+
+    Attributs:
+        id: Identifiant unique
+        player_id: ID du joueur NBA
+        team: Code de l'équipe NBA (ex: "LAL")
+        valid_from: Premier jour dans l'équipe (inclus)
+        valid_to: Premier jour hors de l'équipe (exclu), NULL si toujours en cours
+        date_creation: Date d'enregistrement de la ligne
+
+    Relations:
+        player: Le joueur concerné
+
+    Requêtes "as-of" (équipe d'un joueur à une date donnée):
+        Utiliser PlayerTeamHistory.covers(date) dans la condition de jointure:
+
+        db.query(PlayerGameScore, PlayerTeamHistory.team).outerjoin(
+            PlayerTeamHistory,
+            and_(
+                PlayerTeamHistory.player_id == PlayerGameScore.player_id,
+                PlayerTeamHistory.covers(PlayerGameScore.game_date)
+            )
+        )
+    """
+
+    __tablename__ = "player_team_history"
+
+    # === COLONNES ===
+
+    id = Column(
+        Integer,
+        primary_key=True,
+        index=True,
+        autoincrement=True
+    )
+
+    player_id = Column(
+        Integer,
+        ForeignKey("players.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    # Indexé via ix_player_team_history_asof (player_id en tête)
+
+    # Code de l'équipe NBA
+    team = Column(
+        String(50),
+        nullable=False
+    )
+    # Exemple: "LAL", "GSW", "FA" (agent libre)
+
+    # Début de l'intervalle (inclus)
+    valid_from = Column(
+        Date,
+        nullable=False
+    )
+
+    # Fin de l'intervalle (exclue)
+    valid_to = Column(
+        Date,
+        nullable=True
+    )
+    # NULL = le joueur est toujours dans cette équipe
+
+    date_creation = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # === RELATIONS ===
+
+    player = relationship(
+        "Player",
+        back_populates="team_history"
+    )
+
+    # === INDEX ===
+
+    __table_args__ = (
+        # Jointure as-of: player_id = ? AND valid_from <= date AND (valid_to > date OR NULL)
+        Index('ix_player_team_history_asof', 'player_id', 'valid_from', 'valid_to'),
+        # Un seul intervalle ouvert par joueur
+        Index(
+            'uq_player_team_history_open',
+            'player_id',
+            unique=True,
+            postgresql_where=text('valid_to IS NULL'),
+            sqlite_where=text('valid_to IS NULL')
+        ),
+    )
+
+    @classmethod
+    def covers(cls, as_of):
+        """
+        Condition SQL: l'intervalle contient la date `as_of`
+
+        Args:
+            as_of: Une date Python ou une colonne (ex: PlayerGameScore.game_date)
+        """
+        return and_(
+            cls.valid_from <= as_of,
+            or_(cls.valid_to.is_(None), cls.valid_to > as_of)
+        )
+
+    def __repr__(self):
+        return f"<PlayerTeamHistory(player_id={self.player_id}, team='{self.team}', from={self.valid_from}, to={self.valid_to})>"
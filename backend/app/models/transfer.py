@@ -64,6 +64,7 @@ class Transfer(Base):
         salary_at_transfer: Salaire du joueur au moment du transfert
         reason: Raison du rejet (si applicable)
         waiver_priority_used: Priorité waiver utilisée (PRIVATE leagues)
+        bid_amount: Enchère FAAB (PRIVATE leagues en mode FAAB)
         processed_at: Date de traitement du transfert
         date_creation: Date de demande du transfert
     
@@ -148,6 +149,12 @@ class Transfer(Base):
     # Priorité waiver au moment du transfert
     # NULL pour SOLO leagues
     
+    bid_amount = Column(
+        Integer,
+        nullable=True
+    )
+    # Enchère FAAB (ligues en mode FAAB), NULL en mode ROLLING
+    
     # === DATES ===
     
     # Date de demande du transfert
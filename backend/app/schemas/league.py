@@ -24,6 +24,16 @@ class LeagueTypeEnum(str, Enum):
     PRIVATE = "PRIVATE"
 
 
+class WaiverModeEnum(str, Enum):
+    """
+    Mode d'attribution des waivers (ROLLING ou FAAB)
+    
+    Correspond au WaiverMode de SQLAlchemy mais pour Pydantic.
+    """
+    ROLLING = "ROLLING"
+    FAAB = "FAAB"
+
+
 class LeagueBase(BaseModel):
     """
     Schema de base pour League
@@ -64,6 +74,18 @@ class LeagueBase(BaseModel):
         description="Plafond salarial en dollars (60M$ par défaut)"
     )
 
+    waiver_mode: WaiverModeEnum = Field(
+        default=WaiverModeEnum.ROLLING,
+        description="Mode d'attribution des waivers (ROLLING ou FAAB)"
+    )
+    
+    faab_budget: int = Field(
+        default=100,
+        ge=0,
+        le=1000,
+        description="Budget FAAB de chaque équipe pour la saison (mode FAAB)"
+    )
+
 
 class LeagueCreate(BaseModel):
     """
@@ -106,6 +128,18 @@ class LeagueCreate(BaseModel):
         description="Plafond salarial en dollars (60M$ par défaut)"
     )
 
+    waiver_mode: WaiverModeEnum = Field(
+        default=WaiverModeEnum.ROLLING,
+        description="Mode d'attribution des waivers (ROLLING ou FAAB)"
+    )
+    
+    faab_budget: int = Field(
+        default=100,
+        ge=0,
+        le=1000,
+        description="Budget FAAB de chaque équipe pour la saison (mode FAAB)"
+    )
+
 
 class LeagueRead(LeagueBase):
     """
@@ -123,6 +157,8 @@ class LeagueRead(LeagueBase):
         "commissioner_id": null,
         "max_teams": null,
         "salary_cap": 60000000,
+        "waiver_mode": "ROLLING",
+        "faab_budget": 100,
         "is_active": true,
         "start_date": null,
         "end_date": null,
@@ -171,6 +207,7 @@ class LeagueUpdate(BaseModel):
         le=12
     )
     is_active: Optional[bool] = None
+    waiver_mode: Optional[WaiverModeEnum] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
 
@@ -6,8 +6,8 @@ Ces schémas définissent la structure des données pour:
 - Filtrer par position, équipe, salaire
 - Afficher les détails d'un joueur
 """
-from pydantic import BaseModel, Field, ConfigDict, computed_field
-from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, computed_field
+from typing import List, Optional
 from datetime import datetime
 from app.models.player import Position
 
@@ -58,6 +58,30 @@ class PlayerRead(PlayerBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Validation d'une liste entière en un seul appel à pydantic-core
+# (au lieu d'un PlayerRead.model_validate() par joueur)
+# Usage: PlayerReadList.validate_python(rows, from_attributes=True)
+PlayerReadList = TypeAdapter(List[PlayerRead])
+
+
+# ========================================
+# SCHÉMA D'AUTOCOMPLÉTION
+# ========================================
+
+class PlayerSuggestion(BaseModel):
+    """
+    Suggestion de joueur pour la barre de recherche
+    Version allégée de PlayerRead (GET /players/autocomplete)
+    """
+    id: int
+    full_name: str
+    player_position: Position = Field(alias="position", serialization_alias="player_position")
+    team_abbreviation: Optional[str] = None
+    fantasy_cost: float
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ========================================
 # SCHÉMA DE LECTURE DÉTAILLÉE
 # ========================================
@@ -90,9 +114,16 @@ class PlayerList(BaseModel):
     Schéma pour lister les joueurs avec pagination et filtres
     """
     players: list[PlayerRead]
-    total: int
+    total: Optional[int] = Field(
+        default=None,
+        description="Nombre total de résultats (calculé seulement sur la première page)"
+    )
     skip: int
     limit: int
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Curseur de la page suivante (None = dernière page)"
+    )
     filters_applied: dict = Field(
         default_factory=dict,
         description="Filtres appliqués (position, team, etc.)"
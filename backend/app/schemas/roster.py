@@ -123,6 +123,42 @@ class AddPlayerResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# ========================================
+# SCHÉMAS POUR SOUMETTRE UN LINEUP COMPLET
+# ========================================
+
+class LineupSlot(BaseModel):
+    """Un poste du lineup et le joueur qui l'occupe"""
+    position_slot: RosterSlot
+    player_id: int
+
+
+class LineupSubmit(BaseModel):
+    """
+    Requête pour remplacer tout le roster en une fois (PUT /teams/{team_id}/lineup)
+    
+    Validations automatiques :
+    - Exactement 6 postes (PG, SG, SF, PF, C, UTIL), chacun une seule fois
+    - Un joueur ne peut apparaître qu'une fois
+    """
+    lineup: List[LineupSlot] = Field(
+        min_length=6,
+        max_length=6,
+        description="Les 6 postes avec leur joueur"
+    )
+    
+    @field_validator('lineup')
+    def validate_lineup(cls, v):
+        """Vérifie que chaque poste et chaque joueur n'apparaissent qu'une fois"""
+        slots = [slot.position_slot for slot in v]
+        if len(set(slots)) != len(slots):
+            raise ValueError("Chaque position doit apparaître une seule fois")
+        player_ids = [slot.player_id for slot in v]
+        if len(set(player_ids)) != len(player_ids):
+            raise ValueError("Un joueur ne peut occuper qu'une seule position")
+        return v
+
+
 # ========================================
 # SCHÉMAS POUR LISTER LES JOUEURS DISPONIBLES
 # ========================================
@@ -167,6 +203,50 @@ class AvailablePlayersResponse(BaseModel):
         description="Positions encore libres dans le roster"
     )
     players: List[AvailablePlayerRead]
-    total_count: int
+    total_count: Optional[int] = Field(
+        None,
+        description="Nombre total de joueurs disponibles (première page uniquement)"
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Curseur de la page suivante (None = dernière page)"
+    )
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ========================================
+# SCHÉMAS POUR LES DEMANDES DE WAIVER (LIGUES PRIVÉES)
+# ========================================
+
+class WaiverClaimCreate(BaseModel):
+    """
+    Demande de waiver (traitée le lundi par process_waiver_claims)
+    
+    - Le joueur qui occupe le poste visé sera libéré si la demande est accordée
+    - bid_amount est obligatoire dans les ligues en mode FAAB (ignoré sinon)
+    """
+    player_id: int = Field(description="ID du joueur demandé")
+    position_slot: RosterSlot = Field(
+        description="Poste visé (PG, SG, SF, PF, C, UTIL)"
+    )
+    bid_amount: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Enchère FAAB (ligues en mode FAAB uniquement)"
+    )
+
+
+class WaiverClaimRead(BaseModel):
+    """
+    Une demande de waiver enregistrée
+    """
+    id: int
+    fantasy_team_id: int
+    player_id: int
+    roster_slot: str
+    bid_amount: Optional[int] = None
+    status: str
+    date_creation: datetime
     
     model_config = ConfigDict(from_attributes=True)
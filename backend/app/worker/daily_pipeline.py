@@ -7,6 +7,7 @@ Ce script orchestre toutes les tâches nécessaires pour :
 2. Calculer les scores fantasy des joueurs
 3. Calculer les scores d'équipe
 4. Mettre à jour le leaderboard
+5. Archiver la journée en Parquet (analyses historiques)
 
 Utilisation :
     python backend/app/worker/daily_pipeline.py
@@ -27,6 +28,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.worker.tasks.fetch_boxscores import fetch_yesterday_boxscores
 from app.worker.tasks.calculate_team_scores import calculate_yesterday_team_scores
 from app.worker.tasks.update_leaderboards import update_leaderboards
+from app.worker.tasks.archive_scores import archive_scores
 
 # Configuration du logging (avec création du dossier)
 import os
@@ -98,7 +100,7 @@ def run_daily_pipeline(target_date: date = None):
         # ÉTAPE 1 : RÉCUPÉRATION DES BOXSCORES NBA
         # ========================================================================
         logger.info("\n" + "─" * 80)
-        logger.info("📊 ÉTAPE 1/3 : Récupération des boxscores NBA")
+        logger.info("📊 ÉTAPE 1/4 : Récupération des boxscores NBA")
         logger.info("─" * 80)
         
         fetch_yesterday_boxscores()
@@ -108,7 +110,7 @@ def run_daily_pipeline(target_date: date = None):
         # ÉTAPE 2 : CALCUL DES SCORES D'ÉQUIPE
         # ========================================================================
         logger.info("\n" + "─" * 80)
-        logger.info("🏀 ÉTAPE 2/3 : Calcul des scores d'équipe")
+        logger.info("🏀 ÉTAPE 2/4 : Calcul des scores d'équipe")
         logger.info("─" * 80)
         
         calculate_yesterday_team_scores()
@@ -118,12 +120,21 @@ def run_daily_pipeline(target_date: date = None):
         # ÉTAPE 3 : MISE À JOUR DU LEADERBOARD
         # ========================================================================
         logger.info("\n" + "─" * 80)
-        logger.info("🏆 ÉTAPE 3/3 : Mise à jour du leaderboard")
+        logger.info("🏆 ÉTAPE 3/4 : Mise à jour du leaderboard")
         logger.info("─" * 80)
         
         update_leaderboards()
         logger.info("✅ Leaderboard mis à jour avec succès")
         
+        # ========================================================================
+        # ÉTAPE 4 : ARCHIVE PARQUET
+        # ========================================================================
+        logger.info("\n" + "─" * 80)
+        logger.info("🗄️  ÉTAPE 4/4 : Archivage Parquet des scores")
+        logger.info("─" * 80)
+        
+        archive_scores(game_date)
+        
         # ========================================================================
         # RÉSUMÉ
         # ========================================================================
@@ -4,6 +4,7 @@ Gère toutes les tâches planifiées du worker
 
 Horaires (America/New_York - Eastern Time) :
 - 08h00 : Pipeline quotidien complet (boxscores + scores équipes + leaderboard)
+- 00h00 (Lundi) : Remise à zéro des compteurs de transferts
 - 10h00 (Lundi) : Mise à jour des salaires hebdomadaire
 
 Version MVP Solo League : Simplifié sans trades ni waivers
@@ -15,6 +16,8 @@ from apscheduler.triggers.cron import CronTrigger
 # Import du pipeline quotidien
 from app.worker.daily_pipeline import run_daily_pipeline
 from app.worker.tasks.update_salaries import update_all_player_salaries
+from app.worker.tasks.reset_weekly_transfers import reset_weekly_transfers
+from app.worker.tasks.reconcile_boxscores import reconcile_boxscores
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,7 @@ def start_scheduler():
     
     MODE MVP SOLO LEAGUE :
     - Pipeline quotidien à 8h ET (après les matchs de la nuit)
+    - Reset des transferts le lundi à 0h ET
     - Mise à jour salaires le lundi à 10h ET
     """
     
@@ -54,10 +58,32 @@ def start_scheduler():
     logger.info("   ├─ Calcul scores équipes")
     logger.info("   └─ Mise à jour leaderboard")
     
+    # 14h00 ET : Corrections de stats NBA des derniers jours (lignes modifiées seulement)
+    scheduler.add_job(
+        reconcile_boxscores,
+        CronTrigger(hour=14, minute=0),
+        id="reconcile_boxscores",
+        name="🔁 Réconciliation boxscores",
+        replace_existing=True,
+        misfire_grace_time=3600
+    )
+    logger.info("📅 Tâche planifiée : 🔁 Réconciliation boxscores (14h00 ET)")
+    
     # ========================================
     # TÂCHE HEBDOMADAIRE (LUNDI)
     # ========================================
     
+    # 00h00 (Lundi) : Nouvelle semaine de transferts (1 UPDATE pour toutes les équipes)
+    scheduler.add_job(
+        reset_weekly_transfers,
+        CronTrigger(day_of_week='mon', hour=0, minute=0),
+        id="reset_weekly_transfers",
+        name="🔄 Reset transferts hebdomadaires",
+        replace_existing=True,
+        misfire_grace_time=86400  # 24h de tolérance : le reset ne doit pas être sauté
+    )
+    logger.info("📅 Tâche planifiée : 🔄 Reset transferts hebdomadaires (Lundi 00h00 ET)")
+    
     # 10h00 (Lundi) : Mise à jour hebdomadaire des salaires
     scheduler.add_job(
         update_all_player_salaries,
@@ -9,6 +9,9 @@ from .calculate_team_scores import calculate_yesterday_team_scores
 from .update_salaries import update_all_player_salaries
 from .process_waivers import process_waiver_claims
 from .update_leaderboards import update_leaderboards
+from .reset_weekly_transfers import reset_weekly_transfers
+from .archive_scores import archive_scores
+from .reconcile_boxscores import reconcile_boxscores
 
 __all__ = [
     'detect_nba_trades',
@@ -18,4 +21,7 @@ __all__ = [
     'update_all_player_salaries',
     'process_waiver_claims',
     'update_leaderboards',
+    'reset_weekly_transfers',
+    'archive_scores',
+    'reconcile_boxscores',
 ]
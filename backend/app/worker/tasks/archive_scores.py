@@ -0,0 +1,208 @@
+"""
+Tâche : Archivage Parquet des scores par match
+Exécution : Fin du pipeline quotidien (après le calcul des scores)
+
+1. La journée traitée est écrite dans son fichier
+   season=.../month=.../day-AAAA-MM-JJ.parquet (réécrit si la journée
+   est retraitée : la tâche est idempotente)
+2. Chaque saison terminée qui contient encore des fichiers journaliers
+   est compactée : un seul fichier part-0.parquet par mois, relu depuis
+   la base (corrections de stats comprises)
+
+Voir app.core.archive pour l'organisation des fichiers et la lecture.
+"""
+import logging
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.archive import SCORES_SCHEMA, archive_root, day_file, month_dir, season_end, season_of, season_start
+from app.core.database import SessionLocal
+from app.models.player import Player
+from app.models.player_game_score import PlayerGameScore
+from app.models.player_team_history import PlayerTeamHistory
+
+logger = logging.getLogger(__name__)
+
+# Lignes lues par paquet (yield_per) et écrites par row group Parquet
+ARCHIVE_BATCH_ROWS = 10_000
+
+
+def _scores_statement():
+    """
+    SELECT des colonnes de SCORES_SCHEMA (joueur joint pour nom et poste)
+
+    L'équipe est celle du joueur le jour du match (PlayerTeamHistory),
+    à défaut son équipe actuelle.
+    """
+    columns = {
+        "player_name": Player.full_name,
+        "team": func.coalesce(PlayerTeamHistory.team, Player.team_abbreviation),
+        "position": Player.position,
+    }
+    return select(*[
+        columns[name].label(name) if name in columns else getattr(PlayerGameScore, name)
+        for name in SCORES_SCHEMA.names
+    ]).join(
+        Player, Player.id == PlayerGameScore.player_id
+    ).outerjoin(
+        PlayerTeamHistory,
+        and_(
+            PlayerTeamHistory.player_id == PlayerGameScore.player_id,
+            PlayerTeamHistory.covers(PlayerGameScore.game_date)
+        )
+    )
+
+
+def _to_batch(rows) -> pa.RecordBatch:
+    """Paquet de lignes SQL → RecordBatch Arrow (colonnes typées)"""
+    columns = list(zip(*rows))
+    arrays = []
+    for index, field in enumerate(SCORES_SCHEMA):
+        values = columns[index]
+        if field.name == "position":
+            values = [getattr(value, "value", value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=SCORES_SCHEMA)
+
+
+def _write_atomic(path: Path, batches) -> int:
+    """
+    Écrit les batches dans un fichier temporaire puis le renomme
+
+    Un lecteur ne voit jamais de fichier à moitié écrit.
+
+    Returns:
+        Nombre de lignes écrites
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    rows = 0
+
+    # Sans compression : les lecteurs mappent les fichiers en mémoire (mmap)
+    with pq.ParquetWriter(str(temporary), SCORES_SCHEMA, compression="none") as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+
+    os.replace(temporary, path)
+    return rows
+
+
+def archive_day(db: Session, day: date, root: Optional[str] = None) -> int:
+    """
+    Écrit les scores d'une journée dans son fichier Parquet
+
+    Returns:
+        Nombre de scores archivés (0 = aucun match, pas de fichier)
+    """
+    statement = _scores_statement().where(PlayerGameScore.game_date == day).order_by(PlayerGameScore.id)
+    rows = db.execute(statement).all()
+
+    path = day_file(day, root)
+    if not rows:
+        if path.exists():
+            path.unlink()
+        return 0
+
+    return _write_atomic(path, [_to_batch(rows)])
+
+
+def archive_season(db: Session, season: str, root: Optional[str] = None) -> int:
+    """
+    Compacte une saison terminée : un fichier par mois, relu depuis la base
+
+    La saison est lue en flux (yield_per) et chaque mois est écrit dès
+    qu'il est complet : la mémoire ne dépend pas de la taille de la saison.
+
+    Returns:
+        Nombre de scores archivés
+    """
+    statement = _scores_statement().where(
+        PlayerGameScore.game_date >= season_start(season),
+        PlayerGameScore.game_date <= season_end(season)
+    ).order_by(PlayerGameScore.game_date, PlayerGameScore.id)
+
+    result = db.execute(statement.execution_options(yield_per=ARCHIVE_BATCH_ROWS))
+
+    def month_batches(first_row, rows_iterator, state):
+        """Batches d'un mois ; state["next"] reçoit la 1re ligne du mois suivant"""
+        month = (first_row.game_date.year, first_row.game_date.month)
+        buffer = [first_row]
+        for row in rows_iterator:
+            if (row.game_date.year, row.game_date.month) != month:
+                state["next"] = row
+                break
+            buffer.append(row)
+            if len(buffer) >= ARCHIVE_BATCH_ROWS:
+                yield _to_batch(buffer)
+                buffer = []
+        else:
+            state["next"] = None
+        if buffer:
+            yield _to_batch(buffer)
+
+    total = 0
+    rows_iterator = iter(result)
+    state = {"next": next(rows_iterator, None)}
+
+    while state["next"] is not None:
+        first_row = state["next"]
+        directory = month_dir(first_row.game_date, root)
+        total += _write_atomic(directory / "part-0.parquet", month_batches(first_row, rows_iterator, state))
+
+        # Les fichiers journaliers du mois sont remplacés par part-0.parquet
+        for daily in directory.glob("day-*.parquet"):
+            daily.unlink()
+
+    return total
+
+
+def closed_seasons_to_compact(today: date, root: Optional[str] = None) -> list:
+    """Saisons terminées qui contiennent encore des fichiers journaliers"""
+    seasons = []
+    for season_path in sorted(archive_root(root).glob("season=*")):
+        season = season_path.name.split("=", 1)[1]
+        if season_end(season) < today and any(season_path.glob("month=*/day-*.parquet")):
+            seasons.append(season)
+    return seasons
+
+
+def archive_scores(game_date: Optional[date] = None):
+    """
+    Archive la journée traitée et compacte les saisons terminées
+
+    Args:
+        game_date: Journée à archiver (défaut: hier)
+    """
+    game_date = game_date or (datetime.now().date() - timedelta(days=1))
+    logger.info(f"🗄️  ARCHIVAGE PARQUET - {game_date} (saison {season_of(game_date)})")
+
+    db: Session = SessionLocal()
+
+    try:
+        rows = archive_day(db, game_date)
+        logger.info(f"   ✅ {rows} score(s) archivé(s) → {day_file(game_date)}")
+
+        for season in closed_seasons_to_compact(datetime.now().date()):
+            rows = archive_season(db, season)
+            logger.info(f"   📦 Saison {season} compactée ({rows} scores, 1 fichier par mois)")
+
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de l'archivage Parquet : {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # Pour tester la tâche manuellement
+    logging.basicConfig(level=logging.INFO)
+    archive_scores()
@@ -3,133 +3,260 @@ Tâche : Calcul des scores d'équipes fantasy
 Exécution : Tous les jours à 09h00
 
 Calcule le score total de chaque équipe fantasy en additionnant
-les scores de ses 6 joueurs pour la journée précédente
+les scores de ses 6 joueurs pour la journée précédente.
+
+Traitement en masse, par paquets de SCORING_BATCH_TEAMS équipes :
+- 1 requête pour les rosters, 1 pour les scores des joueurs du jour,
+  1 pour les scores d'équipes déjà enregistrés
+- Écriture groupée des FantasyTeamScore (total + joueurs ayant joué)
+  et de la lineup du jour avec la contribution de chaque joueur
+  (FantasyTeamScorePlayer)
+
+Recalcul ciblé (correction de stats, match tardif) : voir
+rescore_teams_for_players(), qui ne touche que les équipes ayant
+aligné les joueurs concernés ce jour-là.
 """
 import logging
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.models.fantasy_team import FantasyTeam
 from app.models.fantasy_team_player import FantasyTeamPlayer
 from app.models.fantasy_team_score import FantasyTeamScore
+from app.models.fantasy_team_score_player import FantasyTeamScorePlayer
 from app.models.player_game_score import PlayerGameScore
 
 logger = logging.getLogger(__name__)
 
+# Équipes traitées (et committées) par paquet
+SCORING_BATCH_TEAMS = 500
+
+
+def score_teams(db: Session, team_ids: List[int], score_date: date) -> Dict[int, float]:
+    """
+    Calcule et enregistre le score de plusieurs équipes pour un jour
+
+    1. Récupère les rosters (une requête), ignore les rosters incomplets
+    2. Récupère les scores fantasy du jour de tous les joueurs concernés
+    3. Enregistre total et joueurs ayant joué dans FantasyTeamScore
+       (UPDATE groupé des scores existants, INSERT groupé des nouveaux)
+    4. Remplace la lineup du jour (FantasyTeamScorePlayer) : joueur,
+       poste et points de chacun
+
+    Le commit reste à l'appelant.
+
+    Returns:
+        Score total par équipe calculée ({team_id: total})
+    """
+    if not team_ids:
+        return {}
+
+    # 1. Rosters complets uniquement (6 joueurs)
+    rosters = defaultdict(list)
+    for row in db.query(
+        FantasyTeamPlayer.fantasy_team_id,
+        FantasyTeamPlayer.player_id,
+        FantasyTeamPlayer.roster_slot
+    ).filter(FantasyTeamPlayer.fantasy_team_id.in_(team_ids)).order_by(FantasyTeamPlayer.id):
+        rosters[row.fantasy_team_id].append(row)
+
+    incomplete = [team_id for team_id in team_ids if len(rosters.get(team_id, [])) != 6]
+    if incomplete:
+        logger.warning(f"   ⚠️  {len(incomplete)} équipe(s) ignorée(s) : roster incomplet")
+    rosters = {team_id: slots for team_id, slots in rosters.items() if len(slots) == 6}
+    if not rosters:
+        return {}
+
+    # 2. Score du jour de chaque joueur (absent = n'a pas joué)
+    player_ids = {slot.player_id for slots in rosters.values() for slot in slots}
+    points_by_player = dict(
+        db.query(PlayerGameScore.player_id, PlayerGameScore.fantasy_score).filter(
+            PlayerGameScore.player_id.in_(list(player_ids)),
+            PlayerGameScore.game_date == score_date
+        ).all()
+    )
+
+    # 3. Scores d'équipes : mise à jour des existants, création des autres
+    existing = dict(
+        db.query(FantasyTeamScore.fantasy_team_id, FantasyTeamScore.id).filter(
+            FantasyTeamScore.fantasy_team_id.in_(list(rosters)),
+            FantasyTeamScore.score_date == score_date
+        ).all()
+    )
+
+    totals = {}
+    score_rows = {}
+    for team_id, slots in rosters.items():
+        played = [points_by_player[slot.player_id] for slot in slots if slot.player_id in points_by_player]
+        totals[team_id] = sum(played, 0.0)
+        score_rows[team_id] = {
+            "total_score": totals[team_id],
+            "players_who_played": len(played),
+        }
+
+    to_update = [
+        {"id": existing[team_id], **values}
+        for team_id, values in score_rows.items() if team_id in existing
+    ]
+    to_insert = [
+        {"fantasy_team_id": team_id, "score_date": score_date, **values}
+        for team_id, values in score_rows.items() if team_id not in existing
+    ]
+
+    score_ids = {team_id: existing[team_id] for team_id in score_rows if team_id in existing}
+    if to_update:
+        db.execute(update(FantasyTeamScore), to_update)
+    if to_insert:
+        inserted = db.execute(
+            insert(FantasyTeamScore).returning(FantasyTeamScore.fantasy_team_id, FantasyTeamScore.id),
+            to_insert
+        )
+        score_ids.update({row.fantasy_team_id: row.id for row in inserted})
+
+    # 4. Lineup du jour avec la contribution de chaque joueur
+    db.execute(
+        delete(FantasyTeamScorePlayer)
+        .where(FantasyTeamScorePlayer.team_score_id.in_(list(score_ids.values())))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(insert(FantasyTeamScorePlayer), [
+        {
+            "team_score_id": score_ids[team_id],
+            "score_date": score_date,
+            "player_id": slot.player_id,
+            "roster_slot": slot.roster_slot,
+            "points": points_by_player.get(slot.player_id),
+        }
+        for team_id, slots in rosters.items()
+        for slot in slots
+    ])
+
+    return totals
+
+
+def rescore_teams_for_players(db: Session, player_ids: Iterable[int], score_date: date) -> List[int]:
+    """
+    Recalcule uniquement les équipes qui alignaient ces joueurs ce jour-là
+
+    Utilise l'index joueur → équipes des lineups enregistrées
+    (ix_team_score_players_player_date) : la lineup figée au calcul est
+    conservée, même si le roster a changé depuis.
+
+    1. Équipes concernées (lecture de l'index)
+    2. Points des joueurs relus depuis PlayerGameScore (NULL si plus de match)
+    3. Total et joueurs ayant joué recalculés depuis la lineup, pour ces
+       équipes seulement
+
+    Les jours pas encore calculés ne sont pas concernés : le calcul
+    quotidien lira directement les scores à jour. Le commit reste à
+    l'appelant.
+
+    Returns:
+        IDs des scores d'équipes recalculés
+    """
+    player_ids = list(set(player_ids))
+    if not player_ids:
+        return []
+
+    # 1. Scores d'équipes qui alignaient au moins un de ces joueurs
+    team_score_ids = [
+        team_score_id for (team_score_id,) in db.query(FantasyTeamScorePlayer.team_score_id).filter(
+            FantasyTeamScorePlayer.player_id.in_(player_ids),
+            FantasyTeamScorePlayer.score_date == score_date
+        ).distinct()
+    ]
+    if not team_score_ids:
+        return []
+
+    # 2. Contribution de ces joueurs relue depuis leur score du jour
+    game_points = select(PlayerGameScore.fantasy_score).where(
+        PlayerGameScore.player_id == FantasyTeamScorePlayer.player_id,
+        PlayerGameScore.game_date == FantasyTeamScorePlayer.score_date
+    ).scalar_subquery()
+    db.execute(
+        update(FantasyTeamScorePlayer)
+        .where(
+            FantasyTeamScorePlayer.player_id.in_(player_ids),
+            FantasyTeamScorePlayer.score_date == score_date
+        )
+        .values(points=game_points)
+        .execution_options(synchronize_session=False)
+    )
+
+    # 3. Totaux des équipes concernées, depuis leur lineup
+    lineup_total = select(func.coalesce(func.sum(FantasyTeamScorePlayer.points), 0.0)).where(
+        FantasyTeamScorePlayer.team_score_id == FantasyTeamScore.id
+    ).scalar_subquery()
+    lineup_played = select(func.count(FantasyTeamScorePlayer.points)).where(
+        FantasyTeamScorePlayer.team_score_id == FantasyTeamScore.id
+    ).scalar_subquery()
+    db.execute(
+        update(FantasyTeamScore)
+        .where(FantasyTeamScore.id.in_(team_score_ids))
+        .values(total_score=lineup_total, players_who_played=lineup_played)
+        .execution_options(synchronize_session=False)
+    )
+
+    return team_score_ids
+
 
 def calculate_yesterday_team_scores():
     """
     Calcule le score de chaque équipe fantasy pour la veille
-    
-    Pour chaque équipe :
-    1. Récupère les 6 joueurs du roster
-    2. Somme leurs scores fantasy de la veille
-    3. Enregistre le total dans FantasyTeamScore
-    
+
+    Les équipes sont traitées par paquets par score_teams() (voir ses
+    étapes), avec un commit par paquet.
+
     Note : Si un joueur n'a pas joué, son score = 0
     """
     logger.info("=" * 80)
     logger.info("🏆 CALCUL DES SCORES D'ÉQUIPES - DÉBUT")
     logger.info("=" * 80)
-    
+
     db: Session = SessionLocal()
     teams_processed = 0
-    
+
     try:
         # Date d'hier
         yesterday = datetime.now() - timedelta(days=1)
         score_date = yesterday.date()
-        
+
         logger.info(f"📅 Date cible : {score_date}")
-        
+
         # Récupérer toutes les équipes actives
-        teams = db.query(FantasyTeam).all()
-        
-        logger.info(f"👥 {len(teams)} équipes à traiter")
-        
-        for team in teams:
+        team_ids = [team_id for (team_id,) in db.query(FantasyTeam.id).order_by(FantasyTeam.id)]
+
+        logger.info(f"👥 {len(team_ids)} équipes à traiter")
+
+        best_team_id, best_total = None, None
+        for start in range(0, len(team_ids), SCORING_BATCH_TEAMS):
+            batch = team_ids[start:start + SCORING_BATCH_TEAMS]
             try:
-                # Récupérer les joueurs de l'équipe
-                team_players = db.query(FantasyTeamPlayer).filter(
-                    FantasyTeamPlayer.fantasy_team_id == team.id
-                ).all()
-                
-                if len(team_players) != 6:
-                    logger.warning(f"   ⚠️  {team.name} : roster incomplet ({len(team_players)}/6 joueurs)")
-                    continue
-                
-                # Calculer le score total
-                total_score = 0.0
-                player_scores = []
-                
-                for team_player in team_players:
-                    # Récupérer le score du joueur pour hier
-                    player_game_score = db.query(PlayerGameScore).filter(
-                        PlayerGameScore.player_id == team_player.player_id,
-                        PlayerGameScore.game_date == score_date
-                    ).first()
-                    
-                    if player_game_score:
-                        score = player_game_score.fantasy_score
-                        total_score += score
-                        player_scores.append({
-                            'player': team_player.player.full_name,
-                            'score': score
-                        })
-                    else:
-                        # Joueur n'a pas joué (repos ou blessé)
-                        player_scores.append({
-                            'player': team_player.player.full_name,
-                            'score': 0.0
-                        })
-                
-                # Vérifier si le score existe déjà
-                existing_score = db.query(FantasyTeamScore).filter(
-                    FantasyTeamScore.fantasy_team_id == team.id,
-                    FantasyTeamScore.score_date == score_date
-                ).first()
-                
-                if existing_score:
-                    # Mettre à jour
-                    existing_score.total_score = total_score
-                else:
-                    # Créer nouveau score
-                    team_score = FantasyTeamScore(
-                        fantasy_team_id=team.id,
-                        score_date=score_date,
-                        total_score=total_score
-                    )
-                    db.add(team_score)
-                
-                teams_processed += 1
-                
-                # Logger les détails
-                logger.info(f"\n✅ {team.name} : {total_score:.1f} pts")
-                for ps in player_scores:
-                    if ps['score'] > 0:
-                        logger.info(f"   - {ps['player']}: {ps['score']:.1f}")
-                    else:
-                        logger.info(f"   - {ps['player']}: DNP (repos/blessé)")
-                
-                # Commit toutes les 20 équipes
-                if teams_processed % 20 == 0:
-                    db.commit()
-                    logger.info(f"\n💾 {teams_processed} équipes traitées...")
-                
+                totals = score_teams(db, batch, score_date)
+                db.commit()
             except Exception as e:
-                logger.error(f"   ❌ Erreur pour l'équipe {team.name} : {e}")
+                db.rollback()
+                logger.error(f"   ❌ Erreur pour le paquet d'équipes {batch[0]}-{batch[-1]} : {e}")
                 continue
-        
-        # Commit final
-        db.commit()
-        
+
+            teams_processed += len(totals)
+            for team_id, total in totals.items():
+                if best_total is None or total > best_total:
+                    best_team_id, best_total = team_id, total
+            logger.info(f"💾 {teams_processed} équipes traitées...")
+
         logger.info("")
         logger.info("=" * 80)
         logger.info(f"✅ CALCUL TERMINÉ")
-        logger.info(f"   Équipes traitées : {teams_processed}/{len(teams)}")
+        logger.info(f"   Équipes traitées : {teams_processed}/{len(team_ids)}")
+        if best_team_id is not None:
+            logger.info(f"   Meilleur score : équipe {best_team_id} ({best_total:.1f} pts)")
         logger.info("=" * 80)
-        
+
     except Exception as e:
         logger.error(f"❌ Erreur lors du calcul des scores : {e}")
         db.rollback()
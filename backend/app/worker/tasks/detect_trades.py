@@ -10,106 +10,246 @@ Crée un historique des transferts dans la table PlayerTeamHistory
 import logging
 import time
 from datetime import datetime
+import pytz
 from sqlalchemy.orm import Session
-from nba_api.stats.endpoints import commonplayerinfo
+from sqlalchemy import func, update, insert
+from nba_api.stats.endpoints import commonallplayers, commonteamroster
+from nba_api.stats.static import teams as nba_teams
 
+from app.core.archive import season_of, season_start
 from app.core.database import SessionLocal
+from app.core.player_catalog import invalidate_catalog
 from app.models.player import Player
+from app.models.player_game_score import PlayerGameScore
+from app.models.player_team_history import PlayerTeamHistory
 
 logger = logging.getLogger(__name__)
 
+# Code utilisé pour un joueur sans équipe (même convention que sync_players)
+FREE_AGENT = "FA"
+
+
+def fetch_current_teams() -> dict:
+    """
+    Récupère l'équipe actuelle de TOUS les joueurs NBA en une seule requête
+
+    commonallplayers retourne l'ensemble des joueurs de la saison en cours
+    avec leur TEAM_ABBREVIATION (vide pour un agent libre).
+
+    Returns:
+        Dictionnaire {external_api_id: code équipe}
+    """
+    all_players = commonallplayers.CommonAllPlayers(is_only_current_season=1)
+    players_df = all_players.get_data_frames()[0]
+
+    current_teams = {}
+    for person_id, team_abbrev in zip(players_df['PERSON_ID'], players_df['TEAM_ABBREVIATION']):
+        team_abbrev = str(team_abbrev) if team_abbrev else ""
+        if team_abbrev in ("", "nan", "None"):
+            team_abbrev = FREE_AGENT
+        current_teams[int(person_id)] = team_abbrev
+
+    return current_teams
+
+
+def fetch_current_teams_from_rosters() -> dict:
+    """
+    Fallback : reconstruit la même table à partir des 30 rosters NBA
+
+    30 requêtes (une par équipe) au lieu d'une requête par joueur,
+    soit ~20s avec le rate limiting au lieu de plusieurs minutes.
+    Les joueurs absents de tous les rosters ne sont pas retournés.
+
+    Returns:
+        Dictionnaire {external_api_id: code équipe}
+    """
+    current_teams = {}
+
+    for team in nba_teams.get_teams():
+        # Rate limiting : 0.6s entre chaque requête
+        time.sleep(0.6)
+
+        roster = commonteamroster.CommonTeamRoster(team_id=team['id'])
+        roster_df = roster.get_data_frames()[0]
+
+        for person_id in roster_df['PLAYER_ID']:
+            current_teams[int(person_id)] = team['abbreviation']
+
+    return current_teams
+
+
+def record_team_history(db: Session, new_teams: dict, as_of) -> int:
+    """
+    Enregistre des changements d'équipe dans PlayerTeamHistory (en bulk)
+
+    2 requêtes quel que soit le nombre de joueurs :
+    1. UPDATE : ferme les intervalles ouverts (valid_to = as_of)
+    2. INSERT : ouvre les nouveaux intervalles (valid_from = as_of)
+
+    Args:
+        db: Session de base de données (le commit reste à l'appelant)
+        new_teams: Dictionnaire {player_id: nouveau code équipe}
+        as_of: Date du changement
+
+    Returns:
+        Nombre d'intervalles ouverts
+    """
+    if not new_teams:
+        return 0
+
+    db.query(PlayerTeamHistory).filter(
+        PlayerTeamHistory.player_id.in_(list(new_teams)),
+        PlayerTeamHistory.valid_to.is_(None)
+    ).update({PlayerTeamHistory.valid_to: as_of}, synchronize_session=False)
+
+    db.execute(insert(PlayerTeamHistory), [
+        {"player_id": player_id, "team": team, "valid_from": as_of}
+        for player_id, team in new_teams.items()
+    ])
+
+    return len(new_teams)
+
+
+def seed_team_history(db: Session, teams: dict, default_start) -> int:
+    """
+    Ouvre le premier intervalle de joueurs sans aucun historique (en bulk)
+
+    Un premier intervalle daté du jour de la synchronisation laisserait les
+    matchs déjà joués sans équipe à leur date : ils retomberaient sur
+    l'équipe actuelle, même après un futur transfert. L'intervalle part
+    donc du premier match enregistré du joueur, ou de default_start (début
+    de saison) s'il est plus ancien ou si le joueur n'a pas encore joué.
+
+    Args:
+        db: Session de base de données (le commit reste à l'appelant)
+        teams: Dictionnaire {player_id: code équipe}
+        default_start: Début d'intervalle par défaut
+
+    Returns:
+        Nombre d'intervalles ouverts
+    """
+    if not teams:
+        return 0
+
+    first_games = dict(
+        db.query(PlayerGameScore.player_id, func.min(PlayerGameScore.game_date)).filter(
+            PlayerGameScore.player_id.in_(list(teams))
+        ).group_by(PlayerGameScore.player_id).all()
+    )
+
+    db.execute(insert(PlayerTeamHistory), [
+        {
+            "player_id": player_id,
+            "team": team,
+            "valid_from": min(first_games.get(player_id, default_start), default_start)
+        }
+        for player_id, team in teams.items()
+    ])
+
+    return len(teams)
+
+
 def detect_nba_trades():
     """
     Détecte les trades/transferts NBA via nba_api
-    
-    Pour chaque joueur de notre BDD :
-    1. Récupère son équipe actuelle via commonplayerinfo
-    2. Compare avec l'équipe en base de données
-    3. Si changement → met à jour et log le trade
-    
-    Note : L'historique complet sera géré par PlayerTeamHistory
-          (table à créer plus tard)
-    
-    ⚠️ Rate limiting : 0.6s entre chaque requête (max ~100 joueurs/minute)
+
+    Processus :
+    1. Récupère l'équipe actuelle de tous les joueurs NBA (1 requête,
+       fallback sur les 30 rosters si l'endpoint échoue)
+    2. Compare en mémoire avec l'équipe en base pour TOUS les joueurs actifs
+    3. Applique les changements en bulk :
+       - UPDATE des joueurs transférés
+       - Fermeture de leur intervalle courant dans PlayerTeamHistory
+       - INSERT du nouvel intervalle
+
+    Contrairement à l'ancienne version (1 requête par joueur, limitée
+    aux 50 premiers), toute la population active est couverte à chaque exécution.
     """
     logger.info("=" * 80)
     logger.info("🔍 DÉTECTION DES TRADES NBA - DÉBUT")
     logger.info("=" * 80)
-    
+
     db: Session = SessionLocal()
     trades_detected = 0
     players_checked = 0
-    
+
     try:
-        # Récupérer tous les joueurs actifs de notre BDD
-        logger.info("📡 Récupération des joueurs en base...")
-        
-        active_players = db.query(Player).filter(
+        # Récupérer l'équipe actuelle de tous les joueurs depuis nba_api
+        logger.info("📡 Récupération des équipes depuis nba_api...")
+
+        try:
+            current_teams = fetch_current_teams()
+        except Exception as e:
+            logger.warning(f"⚠️  commonallplayers indisponible ({e}), fallback sur les rosters d'équipes...")
+            current_teams = fetch_current_teams_from_rosters()
+
+        logger.info(f"✅ {len(current_teams)} joueurs NBA récupérés")
+
+        # Récupérer tous les joueurs actifs de notre BDD (colonnes utiles uniquement)
+        active_players = db.query(
+            Player.id,
+            Player.external_api_id,
+            Player.full_name,
+            Player.team
+        ).filter(
             Player.is_active == True
         ).all()
-        
+
         logger.info(f"✅ {len(active_players)} joueurs actifs à vérifier")
-        logger.info("⚠️  Vérification limitée aux 50 premiers joueurs (rate limiting)")
-        
-        # Limiter à 50 joueurs pour éviter les rate limits (600s = 10min max)
-        # En production, on ferait ça par batch sur plusieurs heures
-        check_limit = min(50, len(active_players))
-        
         logger.info("🔎 Analyse des changements d'équipe...")
-        today = datetime.now().date()
-        
-        for player in active_players[:check_limit]:
-            try:
-                # Rate limiting : 0.6s entre chaque requête
-                time.sleep(0.6)
-                
-                # Récupérer les infos du joueur depuis nba_api
-                player_info = commonplayerinfo.CommonPlayerInfo(player_id=player.external_api_id)
-                info_df = player_info.get_data_frames()[0]
-                
-                if info_df.empty:
-                    continue
-                
-                # Extraire l'équipe actuelle
-                new_team = info_df['TEAM_ABBREVIATION'].values[0]
-                old_team = player.team
-                
-                players_checked += 1
-                
-                if new_team != old_team and old_team != "UNK":
-                    logger.info("")
-                    logger.info(f"🔄 TRADE DÉTECTÉ !")
-                    logger.info(f"   Joueur : {player.first_name} {player.last_name}")
-                    logger.info(f"   {old_team} → {new_team}")
-                    logger.info(f"   Date : {today}")
-                    
-                    # Mettre à jour l'équipe du joueur
-                    player.team = new_team
-                    player.team_abbreviation = new_team
-                    
-                    # TODO: Créer une entrée dans PlayerTeamHistory
-                    # (à implémenter plus tard avec la table d'historique)
-                    
-                    trades_detected += 1
-                
-                # Log progression tous les 10 joueurs
-                if players_checked % 10 == 0:
-                    logger.info(f"   Progression : {players_checked}/{check_limit} joueurs vérifiés...")
-                
-            except Exception as e:
-                logger.warning(f"   ⚠️  Erreur pour {player.full_name} : {e}")
+        # Jour NBA (heure de l'Est), comme le pipeline quotidien
+        today = datetime.now(pytz.timezone('America/New_York')).date()
+
+        trades = []
+        for player in active_players:
+            new_team = current_teams.get(player.external_api_id)
+            if new_team is None:
+                # Joueur inconnu de l'API : on ne conclut rien
                 continue
-        
+
+            players_checked += 1
+            old_team = player.team
+
+            if new_team != old_team and old_team != "UNK":
+                logger.info(f"🔄 TRADE DÉTECTÉ : {player.full_name} {old_team} → {new_team}")
+                trades.append({"id": player.id, "team": new_team, "team_abbreviation": new_team,
+                               "old_team": old_team})
+
+        if trades:
+            # Mettre à jour l'équipe des joueurs (bulk UPDATE par clé primaire)
+            db.execute(update(Player), [
+                {key: value for key, value in trade.items() if key != "old_team"} for trade in trades
+            ])
+
+            # Joueurs sans historique : l'ancienne équipe couvre d'abord leurs
+            # matchs déjà joués (fermée ci-dessous, au jour du trade)
+            traded_ids = [trade["id"] for trade in trades]
+            known_players = {
+                player_id for (player_id,) in db.query(PlayerTeamHistory.player_id).filter(
+                    PlayerTeamHistory.player_id.in_(traded_ids)
+                ).distinct()
+            }
+            seed_team_history(db, {
+                trade["id"]: trade["old_team"]
+                for trade in trades if trade["id"] not in known_players and trade["old_team"]
+            }, season_start(season_of(today)))
+
+            # Historiser : fermer l'intervalle en cours et ouvrir le nouveau
+            record_team_history(db, {trade["id"]: trade["team"] for trade in trades}, today)
+
+            trades_detected = len(trades)
+
         # Sauvegarder tous les changements
         db.commit()
-        
+        invalidate_catalog()
+
         logger.info("")
         logger.info("=" * 80)
         logger.info(f"✅ DÉTECTION TERMINÉE")
         logger.info(f"   Joueurs vérifiés : {players_checked}/{len(active_players)}")
         logger.info(f"   Trades détectés : {trades_detected}")
         logger.info("=" * 80)
-        
+
     except Exception as e:
         logger.error(f"❌ Erreur lors de la détection des trades : {e}")
         db.rollback()
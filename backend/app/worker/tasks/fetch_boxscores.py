@@ -6,14 +6,20 @@ VERSION AMÉLIORÉE utilisant nba_api.live.nba pour accès temps réel
 Récupère les statistiques détaillées de tous les matchs de la veille
 Calcule les scores fantasy et les enregistre dans PlayerGameScore
 """
+import hashlib
+import json
 import logging
+import os
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
 from sqlalchemy.orm import Session
 
 from nba_api.live.nba.endpoints import scoreboard, boxscore
 from nba_api.stats.endpoints import scoreboardv2, boxscoretraditionalv2
 
+from app.core.config import settings
 from app.core.database import SessionLocal
 from app.models.player import Player
 from app.models.player_game_score import PlayerGameScore
@@ -133,6 +139,66 @@ def parse_minutes(minutes_str: str) -> int:
         return 0
 
 
+def stat_line(stats: dict) -> dict:
+    """
+    Ligne de stats de l'API live → colonnes de PlayerGameScore
+
+    Exemple: {"points": 25, "reboundsTotal": 9, ...} → {"points": 25, "rebounds": 9, ...}
+    """
+    return {
+        "minutes_played": parse_minutes(stats.get('minutes', 'PT0M')),
+        "points": stats.get('points', 0) or 0,
+        "rebounds": stats.get('reboundsTotal', 0) or 0,
+        "offensive_rebounds": stats.get('reboundsOffensive', 0) or 0,
+        "defensive_rebounds": stats.get('reboundsDefensive', 0) or 0,
+        "assists": stats.get('assists', 0) or 0,
+        "steals": stats.get('steals', 0) or 0,
+        "blocks": stats.get('blocks', 0) or 0,
+        "turnovers": stats.get('turnovers', 0) or 0,
+        "personal_fouls": stats.get('foulsPersonal', 0) or 0,
+        "field_goals_made": stats.get('fieldGoalsMade', 0) or 0,
+        "field_goals_attempted": stats.get('fieldGoalsAttempted', 0) or 0,
+        "three_pointers_made": stats.get('threePointersMade', 0) or 0,
+        "three_pointers_attempted": stats.get('threePointersAttempted', 0) or 0,
+        "free_throws_made": stats.get('freeThrowsMade', 0) or 0,
+        "free_throws_attempted": stats.get('freeThrowsAttempted', 0) or 0,
+    }
+
+
+def stat_hash(line: dict) -> str:
+    """
+    Empreinte SHA-256 d'une ligne de stats (stockée dans PlayerGameScore.stat_hash)
+
+    Même ligne → même empreinte : une correction de la NBA (un rebond,
+    une passe...) change l'empreinte, une ligne inchangée est ignorée.
+    """
+    return hashlib.sha256(json.dumps(line, sort_keys=True).encode()).hexdigest()
+
+
+def load_boxscore(game_id: str, max_age_seconds: Optional[int] = None, cache_dir: Optional[str] = None) -> dict:
+    """
+    Boxscore live d'un match, avec cache disque (un fichier JSON par match)
+
+    Le fichier en cache est réutilisé s'il a moins de max_age_seconds
+    (BOXSCORE_CACHE_TTL_SECONDS par défaut, 0 = toujours interroger l'API).
+    Sinon l'API est appelée et le fichier remplacé (écriture atomique).
+    """
+    if max_age_seconds is None:
+        max_age_seconds = settings.BOXSCORE_CACHE_TTL_SECONDS
+    path = Path(cache_dir or settings.BOXSCORE_CACHE_DIR) / f"{game_id}.json"
+
+    if max_age_seconds > 0 and path.exists() and time.time() - path.stat().st_mtime < max_age_seconds:
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    box_data = boxscore.BoxScore(game_id=game_id).get_dict()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(json.dumps(box_data), encoding="utf-8")
+    os.replace(temporary, path)
+    return box_data
+
+
 def fetch_yesterday_boxscores():
     """
     Récupère tous les boxscores des matchs de la veille via API LIVE
@@ -211,8 +277,8 @@ def fetch_yesterday_boxscores():
             try:
                 time.sleep(0.5)
                 
-                box = boxscore.BoxScore(game_id=game_id)
-                box_data = box.get_dict()
+                # Toujours l'API ici ; le fichier en cache ne sert qu'aux relances
+                box_data = load_boxscore(game_id, max_age_seconds=0)
                 
                 game_info = box_data.get('game', {})
                 home_players = game_info.get('homeTeam', {}).get('players', [])
@@ -249,18 +315,14 @@ def fetch_yesterday_boxscores():
                         continue
                     
                     fantasy_score = calculate_fantasy_score(stats)
+                    line = stat_line(stats)
                     
                     game_score = PlayerGameScore(
                         player_id=player.id,
                         game_date=yesterday.date(),
                         fantasy_score=fantasy_score,
-                        minutes_played=parse_minutes(minutes_str),
-                        points=stats.get('points', 0),
-                        rebounds=stats.get('reboundsTotal', 0),
-                        assists=stats.get('assists', 0),
-                        steals=stats.get('steals', 0),
-                        blocks=stats.get('blocks', 0),
-                        turnovers=stats.get('turnovers', 0)
+                        stat_hash=stat_hash(line),
+                        **line
                     )
                     db.add(game_score)
                     scores_saved += 1
@@ -4,200 +4,554 @@ Exécution : Tous les lundis à 13h00
 
 Traite toutes les demandes de transfert en attente pour les ligues privées
 Attribution selon l'ordre de priorité (waiver priority)
+
+Une demande (claim) = un Transfer PENDING de type ADD :
+- player_id : joueur demandé
+- roster_slot : poste visé (le joueur qui l'occupe est libéré si la demande passe)
 """
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, update, insert, delete, text
 
+from app.core.config import settings
 from app.core.database import SessionLocal
-from app.models.league import League, LeagueType
+from app.core.ownership import OwnershipBitmap, get_league_bitmap, lock_league
+from app.models.league import League, LeagueType, WaiverMode
 from app.models.fantasy_team import FantasyTeam
-from app.models.fantasy_team_player import FantasyTeamPlayer
+from app.models.fantasy_team_player import FantasyTeamPlayer, RosterSlot
 from app.models.transfer import Transfer, TransferStatus, TransferType
 from app.models.player import Player
 
 logger = logging.getLogger(__name__)
 
+# Espace de noms des advisory locks Postgres de cette tâche
+# (clé du verrou = (WAIVER_LOCK_NAMESPACE, league_id))
+WAIVER_LOCK_NAMESPACE = 2801
+
+
+def check_claim(team: dict, claim: dict, player: dict, owned: OwnershipBitmap, slots_filled: set, salary_cap: int):
+    """
+    Valide une demande contre l'état courant (en mémoire) de la ligue
+
+    Returns:
+        (raison du refus ou None, nouveau salary cap de l'équipe)
+    """
+    slot = claim["roster_slot"]
+    player_out = team["roster"].get(slot)
+
+    if slot not in RosterSlot.__members__:
+        return f"Invalid roster slot ({slot})", None
+    if player is None or not player["is_active"]:
+        return "Player not found or inactive", None
+    if claim["player_id"] in owned:
+        return "Player already owned by another team (PRIVATE league)", None
+    if (claim["team_id"], slot) in slots_filled:
+        return f"Slot {slot} already filled during this waiver run", None
+    if slot != RosterSlot.UTIL.value and player["position"] != slot:
+        return f"Player is {player['position']}, not {slot}", None
+
+    new_cap = team["cap_used"] + player["cost"] - (player_out["salary"] if player_out else 0)
+    if new_cap > salary_cap:
+        return f"Salary cap exceeded (${new_cap/1_000_000:.1f}M > ${salary_cap/1_000_000:.0f}M)", None
+
+    return None, new_cap
+
+
+def grant_claim(team: dict, claim: dict, player: dict, owned: OwnershipBitmap, slots_filled: set, new_cap: int):
+    """
+    Attribue le joueur en mémoire (roster, cap, joueurs pris)
+
+    Returns:
+        Le joueur libéré du poste visé ({"player_id", "salary", "row_id"}) ou None
+    """
+    slot = claim["roster_slot"]
+    player_out = team["roster"].get(slot)
+
+    if player_out:
+        owned.discard(player_out["player_id"])
+    owned.add(claim["player_id"])
+    slots_filled.add((claim["team_id"], slot))
+    team["roster"][slot] = {"player_id": claim["player_id"], "salary": player["cost"], "row_id": None}
+    team["cap_used"] = new_cap
+
+    return player_out
+
+
+def priority_order(teams: dict) -> list:
+    """Équipes triées par waiver priority (les équipes sans priorité passent en dernier)"""
+    return sorted(
+        teams,
+        key=lambda team_id: (teams[team_id]["priority"] is None, teams[team_id]["priority"] or 0, team_id)
+    )
+
+
+def owned_players(teams: dict) -> OwnershipBitmap:
+    """Joueurs déjà pris dans la ligue (joueurs uniques), d'après les rosters"""
+    return OwnershipBitmap.from_ids(
+        slot_data["player_id"]
+        for team in teams.values()
+        for slot_data in team["roster"].values()
+    )
+
+
+def resolve_waiver_claims(teams: dict, claims: list, players: dict, salary_cap: int, owned=None) -> list:
+    """
+    Résout en mémoire toutes les demandes de waiver d'une ligue (mode ROLLING)
+
+    Règle de rotation (rolling waiver) :
+    - L'équipe avec la meilleure priorité (1 = première) ayant encore une
+      demande en attente voit sa prochaine demande examinée
+    - Si la demande est accordée, l'équipe passe en dernière position
+    - Sinon la demande est refusée et l'équipe garde sa place
+
+    Aucune requête SQL : l'état (rosters, salary cap, joueurs pris) est
+    mis à jour en mémoire au fil des attributions. Le coût est linéaire
+    en nombre de demandes (le nombre d'équipes d'une ligue privée est borné à 12).
+
+    Args:
+        teams: {team_id: {"priority": int|None, "cap_used": int,
+                          "roster": {slot: {"player_id", "salary", "row_id"}}}}
+               Modifié en place (priorités, cap, rosters finaux)
+        claims: Demandes dans l'ordre de soumission
+                [{"id", "team_id", "player_id", "roster_slot"}]
+        players: {player_id: {"cost": int, "position": "PG", "is_active": bool}}
+        salary_cap: Plafond salarial de la ligue
+        owned: Joueurs pris dans la ligue (OwnershipBitmap de la ligue, modifié
+               en place) ; reconstruit depuis les rosters si absent
+
+    Returns:
+        Liste de décisions (dans l'ordre de traitement) :
+        [{"claim": claim, "granted": bool, "reason": str|None,
+          "player_out": {"player_id", "salary", "row_id"}|None, "priority_used": int}]
+    """
+    order = priority_order(teams)
+
+    # File de demandes par équipe (ordre de soumission)
+    queues = {team_id: deque() for team_id in teams}
+    for claim in claims:
+        if claim["team_id"] in queues:
+            queues[claim["team_id"]].append(claim)
+
+    if owned is None:
+        owned = owned_players(teams)
+    # Postes déjà attribués pendant ce traitement (un seul changement par poste)
+    slots_filled = set()
+
+    decisions = []
+    while True:
+        team_id = next((t for t in order if queues[t]), None)
+        if team_id is None:
+            break
+
+        claim = queues[team_id].popleft()
+        team = teams[team_id]
+        player = players.get(claim["player_id"])
+        decision = {"claim": claim, "granted": False, "reason": None, "player_out": None,
+                    "priority_used": order.index(team_id) + 1}
+        decisions.append(decision)
+
+        reason, new_cap = check_claim(team, claim, player, owned, slots_filled, salary_cap)
+        if reason:
+            decision["reason"] = reason
+            continue
+
+        decision["granted"] = True
+        decision["player_out"] = grant_claim(team, claim, player, owned, slots_filled, new_cap)
+
+        # L'équipe servie passe en fin de priorité
+        order.remove(team_id)
+        order.append(team_id)
+
+    # Priorités finales normalisées (1..N)
+    for position, team_id in enumerate(order, 1):
+        teams[team_id]["priority"] = position
+
+    return decisions
+
+
+def resolve_faab_claims(teams: dict, claims: list, players: dict, salary_cap: int, owned=None) -> list:
+    """
+    Résout en mémoire toutes les enchères FAAB d'une ligue (mode FAAB)
+
+    Enchères à l'aveugle résolues en une seule passe triée :
+    - Toutes les demandes de la ligue sont triées par
+      (enchère décroissante, waiver priority, ordre de soumission)
+    - Chaque demande est examinée une seule fois dans cet ordre : la plus
+      grosse enchère sur un joueur l'emporte, les autres sont refusées
+      (joueur déjà pris) et chaque équipe perdante retombe naturellement
+      sur sa demande suivante
+    - Une enchère gagnante est déduite du budget de l'équipe ; une enchère
+      supérieure au budget restant est refusée
+
+    La waiver priority ne tourne pas pendant le traitement (elle ne sert qu'à
+    départager les égalités). Coût : O(n log n) pour n demandes (le tri).
+
+    Args:
+        teams: Comme resolve_waiver_claims, avec en plus "faab_remaining": int
+        claims: Comme resolve_waiver_claims, avec en plus "bid": int|None
+        players: Comme resolve_waiver_claims
+        salary_cap: Plafond salarial de la ligue
+        owned: Comme resolve_waiver_claims
+
+    Returns:
+        Liste de décisions (dans l'ordre de traitement), avec "bid"
+    """
+    order = priority_order(teams)
+    rank = {team_id: position for position, team_id in enumerate(order, 1)}
+
+    ranked_claims = sorted(
+        (claim for claim in claims if claim["team_id"] in teams),
+        key=lambda claim: (-(claim["bid"] or 0), rank[claim["team_id"]], claim["id"])
+    )
+
+    if owned is None:
+        owned = owned_players(teams)
+    slots_filled = set()
+
+    decisions = []
+    for claim in ranked_claims:
+        team = teams[claim["team_id"]]
+        player = players.get(claim["player_id"])
+        bid = claim["bid"] or 0
+        decision = {"claim": claim, "granted": False, "reason": None, "player_out": None,
+                    "priority_used": rank[claim["team_id"]], "bid": bid}
+        decisions.append(decision)
+
+        if bid > team["faab_remaining"]:
+            decision["reason"] = f"FAAB budget exceeded (bid ${bid} > ${team['faab_remaining']} remaining)"
+            continue
+
+        reason, new_cap = check_claim(team, claim, player, owned, slots_filled, salary_cap)
+        if reason:
+            decision["reason"] = reason
+            continue
+
+        decision["granted"] = True
+        decision["player_out"] = grant_claim(team, claim, player, owned, slots_filled, new_cap)
+        team["faab_remaining"] -= bid
+
+    for team_id, position in rank.items():
+        teams[team_id]["priority"] = position
+
+    return decisions
+
+
+def process_league_waivers(db: Session, league: League) -> dict:
+    """
+    Traite les waivers d'une ligue privée en un nombre constant de requêtes
+
+    1. Chargement (4 requêtes) : équipes, rosters, demandes PENDING, joueurs demandés
+    2. Résolution en mémoire (resolve_waiver_claims ou resolve_faab_claims
+       selon le waiver_mode de la ligue)
+    3. Écriture en bulk : DELETE des joueurs libérés, INSERT des nouveaux,
+       UPDATE des équipes et des demandes, INSERT des DROP
+    4. Un seul commit pour toute la ligue
+
+    Returns:
+        Statistiques {"processed", "granted", "denied"}
+    """
+    now = datetime.now()
+    is_faab = league.waiver_mode == WaiverMode.FAAB
+
+    # 1. Équipes de la ligue
+    team_rows = db.query(
+        FantasyTeam.id,
+        FantasyTeam.name,
+        FantasyTeam.waiver_priority,
+        FantasyTeam.salary_cap_used,
+        FantasyTeam.faab_remaining,
+        FantasyTeam.transfers_this_week
+    ).filter(FantasyTeam.league_id == league.id).all()
+
+    teams = {
+        row.id: {
+            "name": row.name,
+            "priority": row.waiver_priority,
+            "cap_used": row.salary_cap_used or 0,
+            # NULL = budget complet de la ligue
+            "faab_remaining": league.faab_budget if row.faab_remaining is None else row.faab_remaining,
+            "transfers_this_week": row.transfers_this_week or 0,
+            "roster": {}
+        }
+        for row in team_rows
+    }
+
+    # 2. Rosters de toute la ligue
+    roster_rows = db.query(
+        FantasyTeamPlayer.id,
+        FantasyTeamPlayer.fantasy_team_id,
+        FantasyTeamPlayer.player_id,
+        FantasyTeamPlayer.roster_slot,
+        FantasyTeamPlayer.salary_at_acquisition
+    ).join(FantasyTeam).filter(FantasyTeam.league_id == league.id).all()
+
+    for row in roster_rows:
+        teams[row.fantasy_team_id]["roster"][row.roster_slot.value] = {
+            "player_id": row.player_id,
+            "salary": row.salary_at_acquisition,
+            "row_id": row.id
+        }
+
+    # 3. Demandes en attente (ordre de soumission)
+    claim_rows = db.query(
+        Transfer.id,
+        Transfer.fantasy_team_id,
+        Transfer.player_id,
+        Transfer.roster_slot,
+        Transfer.bid_amount
+    ).join(FantasyTeam).filter(
+        and_(
+            FantasyTeam.league_id == league.id,
+            Transfer.status == TransferStatus.PENDING,
+            Transfer.transfer_type == TransferType.ADD
+        )
+    ).order_by(Transfer.id).all()
+
+    if not claim_rows:
+        logger.info(f"   [{league.name}] ℹ️  Aucune demande en attente")
+        return {"processed": 0, "granted": 0, "denied": 0}
+
+    logger.info(f"   [{league.name}] 📋 {len(claim_rows)} demande(s) en attente")
+
+    claims = [
+        {"id": row.id, "team_id": row.fantasy_team_id, "player_id": row.player_id,
+         "roster_slot": row.roster_slot, "bid": row.bid_amount}
+        for row in claim_rows
+    ]
+
+    # 4. Coût et poste des joueurs demandés
+    player_rows = db.query(
+        Player.id,
+        Player.full_name,
+        Player.fantasy_cost,
+        Player.position,
+        Player.is_active
+    ).filter(Player.id.in_({claim["player_id"] for claim in claims})).all()
+
+    players = {
+        row.id: {"name": row.full_name, "cost": row.fantasy_cost, "position": row.position.value, "is_active": row.is_active}
+        for row in player_rows
+    }
+
+    # Résolution en mémoire (disponibilité = lecture du bitmap de la ligue)
+    ownership = get_league_bitmap(db, league)
+    if is_faab:
+        decisions = resolve_faab_claims(teams, claims, players, league.salary_cap, ownership)
+    else:
+        decisions = resolve_waiver_claims(teams, claims, players, league.salary_cap, ownership)
+
+    # Écriture en bulk
+    transfer_updates = []
+    drop_transfers = []
+    freed_row_ids = []
+    new_roster_rows = []
+    granted = 0
+
+    for decision in decisions:
+        claim = decision["claim"]
+        team = teams[claim["team_id"]]
+        player = players.get(claim["player_id"])
+        player_name = player["name"] if player else f"#{claim['player_id']}"
+
+        if not decision["granted"]:
+            logger.warning(f"   [{league.name}] ❌ REFUSÉ : {team['name']} → {player_name} ({decision['reason']})")
+            transfer_updates.append({
+                "id": claim["id"],
+                "status": TransferStatus.REJECTED,
+                "reason": decision["reason"],
+                "waiver_priority_used": decision["priority_used"],
+                "processed_at": now
+            })
+            continue
+
+        granted += 1
+        if is_faab:
+            logger.info(f"   [{league.name}] ✅ ACCORDÉ : {team['name']} (enchère ${decision['bid']}) recrute {player_name}")
+        else:
+            logger.info(f"   [{league.name}] ✅ ACCORDÉ : {team['name']} (priorité #{decision['priority_used']}) recrute {player_name}")
+
+        # Compteur hebdomadaire : l'ajout (+ le DROP éventuel)
+        team["transfers_this_week"] += 1
+        player_out = decision["player_out"]
+        if player_out:
+            team["transfers_this_week"] += 1
+            freed_row_ids.append(player_out["row_id"])
+            drop_transfers.append({
+                "fantasy_team_id": claim["team_id"],
+                "player_id": player_out["player_id"],
+                "transfer_type": TransferType.DROP,
+                "status": TransferStatus.COMPLETED,
+                "roster_slot": claim["roster_slot"],
+                "salary_at_transfer": player_out["salary"],
+                "waiver_priority_used": decision["priority_used"],
+                "processed_at": now
+            })
+
+        new_roster_rows.append({
+            "fantasy_team_id": claim["team_id"],
+            "player_id": claim["player_id"],
+            "roster_slot": RosterSlot(claim["roster_slot"]),
+            "salary_at_acquisition": player["cost"],
+            "date_acquired": now
+        })
+        transfer_updates.append({
+            "id": claim["id"],
+            "status": TransferStatus.COMPLETED,
+            "reason": None,
+            "salary_at_transfer": player["cost"],
+            "waiver_priority_used": decision["priority_used"],
+            "processed_at": now
+        })
+
+    if freed_row_ids:
+        db.execute(delete(FantasyTeamPlayer).where(FantasyTeamPlayer.id.in_(freed_row_ids)))
+    if new_roster_rows:
+        db.execute(insert(FantasyTeamPlayer), new_roster_rows)
+    if drop_transfers:
+        db.execute(insert(Transfer), drop_transfers)
+
+    # Salary cap, nouvelles priorités, compteurs de transferts (et budget FAAB) de toutes les équipes
+    team_updates = []
+    for team_id, team in teams.items():
+        team_update = {
+            "id": team_id,
+            "salary_cap_used": team["cap_used"],
+            "waiver_priority": team["priority"],
+            "transfers_this_week": team["transfers_this_week"]
+        }
+        if is_faab:
+            team_update["faab_remaining"] = team["faab_remaining"]
+        team_updates.append(team_update)
+    db.execute(update(FantasyTeam), team_updates)
+    db.execute(update(Transfer), transfer_updates)
+    league.ownership_bitmap = ownership.to_bytes()
+
+    # Un seul commit pour toute la ligue
+    db.commit()
+
+    return {"processed": len(decisions), "granted": granted, "denied": len(decisions) - granted}
+
+
+def try_lock_league(db: Session, league_id: int) -> bool:
+    """
+    Prend l'advisory lock Postgres de la ligue pour la transaction en cours
+
+    pg_try_advisory_xact_lock ne bloque pas : si un autre réplica du worker
+    traite déjà la ligue, on obtient False et la ligue est ignorée.
+    Le verrou est libéré automatiquement au commit/rollback.
+
+    Hors PostgreSQL (tests SQLite), il n'y a pas de verrou : retourne True.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+
+    return db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:namespace, :league_id)"),
+        {"namespace": WAIVER_LOCK_NAMESPACE, "league_id": league_id}
+    ).scalar()
+
+
+def process_league_job(league_id: int) -> dict:
+    """
+    Traite une ligue dans sa propre session et sa propre transaction
+
+    Exécuté dans un thread du pool : une erreur n'affecte que cette ligue
+    (rollback de sa transaction), les autres ligues continuent.
+
+    Returns:
+        Statistiques {"processed", "granted", "denied"} + "skipped" / "failed"
+    """
+    db: Session = SessionLocal()
+    stats = {"processed": 0, "granted": 0, "denied": 0, "skipped": False, "failed": False}
+
+    try:
+        # Le verrou est pris AVANT de lire les demandes
+        if not try_lock_league(db, league_id):
+            logger.info(f"   🔒 Ligue #{league_id} déjà en cours de traitement par un autre worker, ignorée")
+            stats["skipped"] = True
+            return stats
+
+        # Verrou de la ligue : les ajouts/retraits de l'API attendent la fin du traitement
+        league = lock_league(db, league_id)
+        logger.info(f"🏆 Ligue : {league.name}")
+
+        stats.update(process_league_waivers(db, league))
+
+    except Exception as e:
+        logger.error(f"❌ Erreur lors du traitement de la ligue #{league_id} : {e}")
+        db.rollback()
+        stats["failed"] = True
+        import traceback
+        traceback.print_exc()
+    finally:
+        # Libère aussi l'advisory lock si la transaction est encore ouverte
+        db.close()
+
+    return stats
+
 
 def process_waiver_claims():
     """
     Traite les demandes de waiver pour les ligues privées
-    
-    Processus (pour chaque ligue privée) :
-    1. Récupère toutes les demandes PENDING triées par waiver_priority
-    2. Pour chaque demande :
+
+    Processus (pour chaque ligue privée, en parallèle) :
+    1. Prend l'advisory lock Postgres de la ligue (sinon : ligue ignorée,
+       un autre réplica du worker s'en occupe)
+    2. Charge en une fois équipes, rosters, demandes PENDING et joueurs demandés
+    3. Résout toutes les demandes en mémoire selon la waiver priority :
        - Vérifie que le joueur est toujours disponible
-       - Vérifie le salary cap
-       - Si OK : exécute le transfert (drop + add)
+       - Vérifie le poste et le salary cap
+       - Si OK : attribue le joueur (drop du poste visé + add)
        - Si KO : refuse la demande
-    3. Met à jour la waiver_priority (dernier servi passe en dernier)
-    
+       - L'équipe servie passe en fin de priorité
+    4. Applique tous les changements dans une seule transaction par ligue
+
+    Les ligues sont indépendantes : elles sont réparties sur un pool de
+    settings.WAIVER_WORKERS threads, chacune avec sa session.
+
     Note : Dans les ligues privées, chaque joueur ne peut appartenir
            qu'à une seule équipe (joueurs uniques)
     """
     logger.info("=" * 80)
     logger.info("🔄 TRAITEMENT DES WAIVERS - DÉBUT")
     logger.info("=" * 80)
-    
+
+    # Récupérer toutes les ligues privées actives (session courte)
     db: Session = SessionLocal()
-    total_claims_processed = 0
-    total_claims_granted = 0
-    total_claims_denied = 0
-    
     try:
-        # Récupérer toutes les ligues privées actives
-        private_leagues = db.query(League).filter(
-            and_(
-                League.type == LeagueType.PRIVATE,
-                League.is_active == True
-            )
-        ).all()
-        
-        logger.info(f"🏆 {len(private_leagues)} ligues privées à traiter")
-        
-        for league in private_leagues:
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"🏆 Ligue : {league.name}")
-            logger.info(f"{'=' * 60}")
-            
-            # Récupérer toutes les demandes en attente
-            pending_transfers = db.query(Transfer).filter(
+        league_ids = [
+            league_id for (league_id,) in db.query(League.id).filter(
                 and_(
-                    Transfer.team_id.in_(
-                        db.query(FantasyTeam.id).filter(FantasyTeam.league_id == league.id)
-                    ),
-                    Transfer.status == TransferStatus.PENDING
+                    League.type == LeagueType.PRIVATE,
+                    League.is_active == True
                 )
-            ).order_by(
-                # Trier par waiver_priority de l'équipe (jointure nécessaire)
-                db.query(FantasyTeam.waiver_priority).filter(
-                    FantasyTeam.id == Transfer.team_id
-                ).correlate(Transfer).as_scalar()
-            ).all()
-            
-            if not pending_transfers:
-                logger.info("   ℹ️  Aucune demande en attente")
-                continue
-            
-            logger.info(f"   📋 {len(pending_transfers)} demande(s) en attente")
-            
-            # Traiter chaque demande dans l'ordre de priorité
-            for transfer in pending_transfers:
-                total_claims_processed += 1
-                
-                team = transfer.team
-                player_in = db.query(Player).filter(Player.id == transfer.player_in_id).first()
-                player_out = db.query(Player).filter(Player.id == transfer.player_out_id).first() if transfer.player_out_id else None
-                
-                logger.info(f"\n   👤 {team.name} (Priorité #{team.waiver_priority})")
-                logger.info(f"      ➡️  Recrute : {player_in.full_name}")
-                if player_out:
-                    logger.info(f"      ⬅️  Libère : {player_out.full_name}")
-                
-                # 1. Vérifier que le joueur IN est disponible (pas déjà pris)
-                existing_roster = db.query(FantasyTeamPlayer).filter(
-                    and_(
-                        FantasyTeamPlayer.player_id == player_in.id,
-                        FantasyTeamPlayer.team_id.in_(
-                            db.query(FantasyTeam.id).filter(FantasyTeam.league_id == league.id)
-                        )
-                    )
-                ).first()
-                
-                if existing_roster:
-                    # Joueur déjà pris par une autre équipe
-                    transfer.status = TransferStatus.REJECTED
-                    transfer.processed_at = datetime.now()
-                    logger.warning(f"      ❌ REFUSÉ : {player_in.full_name} déjà pris")
-                    total_claims_denied += 1
-                    continue
-                
-                # 2. Calculer le nouveau salary cap
-                current_cap = team.salary_cap_used or 0
-                new_cap = current_cap + player_in.fantasy_cost
-                if player_out:
-                    new_cap -= player_out.fantasy_cost
-                
-                if new_cap > 60_000_000:
-                    # Dépassement du salary cap
-                    transfer.status = TransferStatus.REJECTED
-                    transfer.processed_at = datetime.now()
-                    logger.warning(
-                        f"      ❌ REFUSÉ : Salary cap dépassé "
-                        f"(${new_cap/1_000_000:.1f}M > $60M)"
-                    )
-                    total_claims_denied += 1
-                    continue
-                
-                # 3. Exécuter le transfert
-                try:
-                    # Libérer le joueur OUT
-                    if player_out:
-                        roster_out = db.query(FantasyTeamPlayer).filter(
-                            and_(
-                                FantasyTeamPlayer.team_id == team.id,
-                                FantasyTeamPlayer.player_id == player_out.id
-                            )
-                        ).first()
-                        if roster_out:
-                            db.delete(roster_out)
-                    
-                    # Ajouter le joueur IN
-                    roster_in = FantasyTeamPlayer(
-                        team_id=team.id,
-                        player_id=player_in.id,
-                        position=player_in.position,
-                        added_at=datetime.now()
-                    )
-                    db.add(roster_in)
-                    
-                    # Mettre à jour le salary cap
-                    team.salary_cap_used = new_cap
-                    
-                    # Marquer le transfert comme complété
-                    transfer.status = TransferStatus.COMPLETED
-                    transfer.processed_at = datetime.now()
-                    
-                    # Mettre l'équipe en fin de priorité (pénalité)
-                    max_priority = db.query(func.max(FantasyTeam.waiver_priority)).filter(
-                        FantasyTeam.league_id == league.id
-                    ).scalar() or 0
-                    team.waiver_priority = max_priority + 1
-                    
-                    logger.info(
-                        f"      ✅ ACCORDÉ : ${new_cap/1_000_000:.1f}M utilisés "
-                        f"(nouvelle priorité #{team.waiver_priority})"
-                    )
-                    total_claims_granted += 1
-                    
-                except Exception as e:
-                    logger.error(f"      ❌ Erreur lors de l'exécution : {e}")
-                    db.rollback()
-                    transfer.status = TransferStatus.REJECTED
-                    transfer.processed_at = datetime.now()
-                    total_claims_denied += 1
-            
-            # Commit après chaque ligue
-            db.commit()
-        
-        # Statistiques finales
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info(f"✅ TRAITEMENT TERMINÉ")
-        logger.info(f"   Demandes traitées : {total_claims_processed}")
-        logger.info(f"   Accordées : {total_claims_granted}")
-        logger.info(f"   Refusées : {total_claims_denied}")
-        logger.info("=" * 80)
-        
-    except Exception as e:
-        logger.error(f"❌ Erreur lors du traitement des waivers : {e}")
-        db.rollback()
-        import traceback
-        traceback.print_exc()
+            ).order_by(League.id).all()
+        ]
     finally:
         db.close()
 
+    logger.info(f"🏆 {len(league_ids)} ligues privées à traiter ({settings.WAIVER_WORKERS} workers)")
+
+    if not league_ids:
+        return
+
+    with ThreadPoolExecutor(max_workers=settings.WAIVER_WORKERS, thread_name_prefix="waivers") as pool:
+        results = list(pool.map(process_league_job, league_ids))
+
+    # Statistiques finales
+    logger.info("")
+    logger.info("=" * 80)
+    logger.info(f"✅ TRAITEMENT TERMINÉ")
+    logger.info(f"   Demandes traitées : {sum(r['processed'] for r in results)}")
+    logger.info(f"   Accordées : {sum(r['granted'] for r in results)}")
+    logger.info(f"   Refusées : {sum(r['denied'] for r in results)}")
+    logger.info(f"   Ligues ignorées (verrouillées) : {sum(r['skipped'] for r in results)}")
+    logger.info(f"   Ligues en erreur : {sum(r['failed'] for r in results)}")
+    logger.info("=" * 80)
+
 
 if __name__ == "__main__":
     # Pour tester la tâche manuellement
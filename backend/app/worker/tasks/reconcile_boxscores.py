@@ -0,0 +1,207 @@
+"""
+Tâche : Réconciliation des boxscores (corrections de stats NBA)
+Exécution : Tous les jours à 14h00
+
+La NBA corrige les feuilles de match après coup (un rebond, une passe
+réattribuée...). La récupération quotidienne ignore les lignes déjà
+enregistrées : sans cette tâche, les corrections ne seraient jamais prises.
+
+Pour chaque jour des RECONCILE_DAYS derniers jours :
+1. Relit les boxscores des matchs terminés auprès de l'API (un passage
+   par jour : le cache disque, plus court, ne sert qu'aux relances)
+2. Calcule l'empreinte de chaque ligne de stats et la compare à
+   PlayerGameScore.stat_hash
+3. Recalcule le score fantasy et écrit uniquement les lignes modifiées
+   ou nouvelles (UPDATE / INSERT groupés)
+4. Recalcule uniquement les équipes qui alignaient ces joueurs ce jour-là
+   (rescore_teams_for_players), puis les classements si besoin
+5. Réécrit l'archive Parquet des jours modifiés
+
+Le coût est proportionnel au nombre de lignes corrigées, pas au
+nombre de matchs ou d'équipes.
+"""
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+import pytz
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from nba_api.stats.endpoints import scoreboardv2
+
+from app.core.archive import month_dir, season_of
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.player import Player
+from app.models.player_game_score import PlayerGameScore
+from app.worker.tasks.archive_scores import archive_day, archive_season
+from app.worker.tasks.calculate_team_scores import rescore_teams_for_players
+from app.worker.tasks.fetch_boxscores import calculate_fantasy_score, load_boxscore, stat_hash, stat_line
+from app.worker.tasks.update_leaderboards import update_leaderboards
+
+logger = logging.getLogger(__name__)
+
+# Statut "match terminé" du scoreboard stats.nba.com
+GAME_STATUS_FINAL = 3
+
+
+def reconcile_day(db: Session, game_date: date, player_lines: Iterable[Tuple[int, dict]]) -> dict:
+    """
+    Compare les lignes de stats d'un jour à la base et écrit les différences
+
+    Args:
+        db: Session de base de données
+        game_date: Jour des matchs
+        player_lines: (personId NBA, statistiques de l'API live) par joueur
+
+    Le commit reste à l'appelant. Les lignes absentes des boxscores
+    relus ne sont pas supprimées.
+
+    Returns:
+        {"checked", "updated", "inserted", "teams_rescored"}
+    """
+    # Lignes jouées uniquement (même règle que la récupération quotidienne)
+    lines = {
+        external_id: stats for external_id, stats in player_lines
+        if external_id and stats.get('minutes', 'PT0M') not in ('PT0M', '', None)
+    }
+    stats_result = {"checked": len(lines), "updated": 0, "inserted": 0, "teams_rescored": 0}
+    if not lines:
+        return stats_result
+
+    # 1. Joueurs connus (une requête)
+    player_ids = dict(
+        db.query(Player.external_api_id, Player.id).filter(
+            Player.external_api_id.in_(list(lines))
+        ).all()
+    )
+
+    # 2. Empreintes déjà enregistrées pour ce jour (une requête)
+    existing = {
+        row.player_id: row
+        for row in db.query(PlayerGameScore.id, PlayerGameScore.player_id, PlayerGameScore.stat_hash).filter(
+            PlayerGameScore.player_id.in_(list(player_ids.values())),
+            PlayerGameScore.game_date == game_date
+        )
+    }
+
+    # 3. Lignes modifiées ou nouvelles seulement
+    to_update, to_insert, changed_players = [], [], []
+    for external_id, stats in lines.items():
+        player_id = player_ids.get(external_id)
+        if player_id is None:
+            continue
+
+        line = stat_line(stats)
+        digest = stat_hash(line)
+        current = existing.get(player_id)
+        if current is not None and current.stat_hash == digest:
+            continue
+
+        values = {**line, "fantasy_score": calculate_fantasy_score(stats), "stat_hash": digest}
+        if current is not None:
+            to_update.append({"id": current.id, **values})
+        else:
+            to_insert.append({"player_id": player_id, "game_date": game_date, **values})
+        changed_players.append(player_id)
+
+    if to_update:
+        db.execute(update(PlayerGameScore), to_update)
+    if to_insert:
+        db.execute(insert(PlayerGameScore), to_insert)
+
+    # 4. Équipes qui alignaient ces joueurs ce jour-là
+    rescored = rescore_teams_for_players(db, changed_players, game_date)
+
+    stats_result.update(updated=len(to_update), inserted=len(to_insert), teams_rescored=len(rescored))
+    return stats_result
+
+
+def finished_game_ids(game_date: date) -> List[str]:
+    """IDs des matchs terminés d'un jour (scoreboard stats.nba.com)"""
+    time.sleep(0.5)  # Rate limiting stats.nba.com (comme fetch_boxscores)
+    board = scoreboardv2.ScoreboardV2(game_date=game_date.strftime("%Y-%m-%d"))
+    headers = board.get_normalized_dict().get("GameHeader", [])
+    return [game["GAME_ID"] for game in headers if game.get("GAME_STATUS_ID") == GAME_STATUS_FINAL]
+
+
+def boxscore_lines(box_data: dict) -> List[Tuple[int, dict]]:
+    """(personId, statistics) de chaque joueur d'un boxscore live"""
+    game_info = box_data.get('game', {})
+    players = game_info.get('homeTeam', {}).get('players', []) + game_info.get('awayTeam', {}).get('players', [])
+    return [(player.get('personId'), player.get('statistics', {})) for player in players]
+
+
+def reconcile_boxscores(days: Optional[int] = None):
+    """
+    Réconcilie les boxscores des derniers jours avec la base
+
+    Args:
+        days: Nombre de jours re-vérifiés (défaut: RECONCILE_DAYS)
+    """
+    days = days or settings.RECONCILE_DAYS
+    # Jour NBA (heure de l'Est), comme le pipeline quotidien
+    today = datetime.now(pytz.timezone('America/New_York')).date()
+
+    logger.info("=" * 80)
+    logger.info(f"🔁 RÉCONCILIATION DES BOXSCORES - {days} dernier(s) jour(s)")
+    logger.info("=" * 80)
+
+    db: Session = SessionLocal()
+    teams_rescored = 0
+
+    try:
+        for offset in range(days, 0, -1):
+            game_date = today - timedelta(days=offset)
+
+            try:
+                player_lines = []
+                for game_id in finished_game_ids(game_date):
+                    time.sleep(0.5)  # Rate limiting entre deux appels API
+                    player_lines.extend(boxscore_lines(load_boxscore(game_id)))
+
+                result = reconcile_day(db, game_date, player_lines)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"   ❌ Erreur pour le {game_date} : {e}")
+                continue
+
+            teams_rescored += result["teams_rescored"]
+            logger.info(
+                f"   📅 {game_date} : {result['checked']} lignes, "
+                f"{result['updated']} corrigée(s), {result['inserted']} nouvelle(s), "
+                f"{result['teams_rescored']} équipe(s) recalculée(s)"
+            )
+
+            # Archive Parquet de la journée à jour des corrections
+            if result["updated"] + result["inserted"]:
+                try:
+                    if (month_dir(game_date) / "part-0.parquet").exists():
+                        # Mois déjà compacté : un fichier journalier ferait doublon
+                        archive_season(db, season_of(game_date))
+                    else:
+                        archive_day(db, game_date)
+                except Exception as e:
+                    logger.error(f"   ❌ Archivage Parquet du {game_date} : {e}")
+
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de la réconciliation : {e}")
+        db.rollback()
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+    # Classements à jour si des scores d'équipes ont changé
+    if teams_rescored:
+        update_leaderboards()
+
+    logger.info(f"✅ RÉCONCILIATION TERMINÉE ({teams_rescored} score(s) d'équipes recalculé(s))")
+
+
+if __name__ == "__main__":
+    # Pour tester la tâche manuellement
+    logging.basicConfig(level=logging.INFO)
+    reconcile_boxscores()
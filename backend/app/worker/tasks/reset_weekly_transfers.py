@@ -0,0 +1,61 @@
+"""
+Tâche : Remise à zéro des compteurs de transferts hebdomadaires
+Exécution : Tous les lundis à 00h00
+
+FantasyTeam.transfers_this_week est incrémenté par l'API (ajout, retrait,
+lineup) et par le traitement des waivers, dans la même transaction que le
+Transfer créé. Chaque lundi, tous les compteurs repartent de 0 en un seul
+UPDATE : les lectures du roster n'ont plus à compter les transferts.
+"""
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy import update
+
+from app.core.database import SessionLocal
+from app.models.fantasy_team import FantasyTeam
+
+logger = logging.getLogger(__name__)
+
+
+def reset_transfer_counters(db: Session) -> int:
+    """
+    Remet transfers_this_week à 0 pour toutes les équipes (1 requête)
+
+    Le commit reste à l'appelant.
+
+    Returns:
+        Nombre d'équipes qui avaient au moins un transfert
+    """
+    result = db.execute(
+        update(FantasyTeam)
+        .where(FantasyTeam.transfers_this_week != 0)
+        .values(transfers_this_week=0)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def reset_weekly_transfers():
+    """Nouvelle semaine : compteurs de transferts remis à zéro"""
+    logger.info("🔄 RESET DES TRANSFERTS HEBDOMADAIRES - DÉBUT")
+
+    db: Session = SessionLocal()
+
+    try:
+        teams_reset = reset_transfer_counters(db)
+        db.commit()
+        logger.info(f"✅ {teams_reset} équipe(s) remise(s) à 0 transfert")
+
+    except Exception as e:
+        logger.error(f"❌ Erreur lors du reset des transferts : {e}")
+        db.rollback()
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # Pour tester la tâche manuellement
+    logging.basicConfig(level=logging.INFO)
+    reset_weekly_transfers()
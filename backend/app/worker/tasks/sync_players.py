@@ -7,12 +7,18 @@ Ajoute les nouveaux joueurs et met à jour les joueurs existants
 """
 import logging
 import time
+from datetime import datetime
+import pytz
 from sqlalchemy.orm import Session
 from nba_api.stats.static import players as nba_players
 from nba_api.stats.endpoints import commonplayerinfo
 
+from app.core.archive import season_of, season_start
 from app.core.database import SessionLocal
+from app.core.player_catalog import invalidate_catalog
 from app.models.player import Player
+from app.models.player_team_history import PlayerTeamHistory
+from app.worker.tasks.detect_trades import record_team_history, seed_team_history
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +66,8 @@ def sync_nba_players():
     2. Si nouveau → insert
     3. Si existant → update (nom, équipe, position)
     4. Active/désactive selon le statut API
+    5. Historise en bulk les équipes dans PlayerTeamHistory
+       (nouveaux joueurs + joueurs dont l'équipe a changé)
     
     Note: nba_api.stats.static.players retourne la liste complète sans API call
     """
@@ -70,6 +78,7 @@ def sync_nba_players():
     db: Session = SessionLocal()
     new_players = 0
     updated_players = 0
+    unknown_team_players = []  # Joueurs dont commonplayerinfo a échoué
     
     try:
         # Récupérer tous les joueurs actifs depuis nba_api (local, pas de requête HTTP)
@@ -95,6 +104,7 @@ def sync_nba_players():
             # Tenter de récupérer l'équipe et la position via commonplayerinfo
             mapped_position = None
             team_abbrev = "FA"  # Free Agent par défaut
+            lookup_failed = False
             
             try:
                 # Respecter le rate limit de l'API NBA (0.6s entre chaque requête)
@@ -123,7 +133,9 @@ def sync_nba_players():
                         team_abbrev = raw_team
                         
             except Exception as e:
-                # En cas d'erreur d'API, continuer avec les valeurs par défaut
+                # En cas d'erreur d'API, équipe inconnue : ni mise à jour ni historique
+                # (sinon une erreur passagère ouvrirait un faux passage en "FA")
+                lookup_failed = True
                 logger.debug(f"Erreur API pour {full_name}: {e}")
             
             # Si toujours pas de position, assigner de manière équilibrée
@@ -141,9 +153,13 @@ def sync_nba_players():
                 player.first_name = first_name
                 player.last_name = last_name
                 player.full_name = full_name
-                player.team = team_abbrev
-                player.team_abbreviation = team_abbrev
-                player.position = mapped_position
+                if lookup_failed:
+                    # Garder l'équipe et la position connues
+                    unknown_team_players.append(player)
+                else:
+                    player.team = team_abbrev
+                    player.team_abbreviation = team_abbrev
+                    player.position = mapped_position
                 player.is_active = api_player.get("is_active", True)
                 # Ne pas modifier fantasy_cost ici (sera calculé par calculate_salaries)
                 updated_players += 1
@@ -167,19 +183,52 @@ def sync_nba_players():
                     is_active=api_player.get("is_active", True)
                 )
                 db.add(new_player)
+                if lookup_failed:
+                    unknown_team_players.append(new_player)
                 new_players += 1
                 
                 if new_players % 50 == 0:
                     logger.info(f"   {new_players} nouveaux joueurs ajoutés...")
         
+        # Historiser les équipes : comparer en mémoire avec les intervalles ouverts
+        db.flush()  # Attribue les IDs des nouveaux joueurs
+        
+        open_intervals = dict(
+            db.query(PlayerTeamHistory.player_id, PlayerTeamHistory.team).filter(
+                PlayerTeamHistory.valid_to.is_(None)
+            ).all()
+        )
+        unknown_team_ids = {player.id for player in unknown_team_players}
+        team_changes = {
+            player_id: team
+            for player_id, team in db.query(Player.id, Player.team).all()
+            if team and open_intervals.get(player_id) != team and player_id not in unknown_team_ids
+        }
+        # Jour NBA (heure de l'Est), comme le pipeline quotidien
+        today = datetime.now(pytz.timezone('America/New_York')).date()
+        
+        # Joueurs sans aucun historique : premier intervalle depuis leur
+        # premier match (ou le début de saison), pas depuis aujourd'hui
+        known_players = {player_id for (player_id,) in db.query(PlayerTeamHistory.player_id).distinct()}
+        first_teams = {
+            player_id: team for player_id, team in team_changes.items() if player_id not in known_players
+        }
+        team_changes = {
+            player_id: team for player_id, team in team_changes.items() if player_id in known_players
+        }
+        history_rows = seed_team_history(db, first_teams, season_start(season_of(today)))
+        history_rows += record_team_history(db, team_changes, today)
+        
         # Sauvegarder tous les changements
         db.commit()
+        invalidate_catalog()
         
         logger.info("")
         logger.info("=" * 80)
         logger.info(f"✅ SYNCHRONISATION TERMINÉE")
         logger.info(f"   Nouveaux joueurs : {new_players}")
         logger.info(f"   Joueurs mis à jour : {updated_players}")
+        logger.info(f"   Intervalles d'équipe historisés : {history_rows}")
         logger.info(f"   Total : {len(all_api_players)} joueurs")
         logger.info("=" * 80)
         
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.core.database import SessionLocal
+from app.core.player_catalog import invalidate_catalog
 from app.models.player import Player
 from app.models.player_game_score import PlayerGameScore
 
@@ -143,6 +144,7 @@ def update_all_player_salaries():
         
         # Commit final
         db.commit()
+        invalidate_catalog()
         
         # Statistiques finales
         logger.info("")
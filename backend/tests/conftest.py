@@ -3,16 +3,22 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_async_db
 from app.models.utilisateur import Utilisateur
 from app.models.player import Player
-from app.core.auth import hash_password
+from app.core.auth import hash_password, clear_user_cache
+from app.core.player_catalog import invalidate_catalog
+from app.core.idempotency import clear_idempotency_store
 
-# Base de données de test en mémoire
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Base de données de test en mémoire, partagée entre l'engine sync et
+# l'engine async (cache partagé : la base vit tant que la connexion
+# StaticPool de l'engine sync reste ouverte)
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:starting6_test?mode=memory&cache=shared&uri=true"
+SQLALCHEMY_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///file:starting6_test?mode=memory&cache=shared&uri=true"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -21,17 +27,27 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# NullPool : chaque session async ouvre sa connexion dans la boucle du test en cours
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db_session():
     """Crée une nouvelle session de base de données pour chaque test"""
     Base.metadata.create_all(bind=engine)
+    invalidate_catalog()
     session = TestingSessionLocal()
     try:
         yield session
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+        invalidate_catalog()
+        clear_idempotency_store()
+        clear_user_cache()
 
 
 @pytest.fixture(scope="function")
@@ -43,7 +59,12 @@ def client(db_session):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,74 @@
+"""Tests pour l'archive Parquet des scores par match"""
+from datetime import date
+
+
+class TestArchive:
+    """Tests de l'écriture et de la lecture de l'archive"""
+
+    def test_archive_day_then_compact_season(self, db_session, sample_players, tmp_path):
+        """Test : fichiers journaliers, moyennes vectorisées, compactage de saison"""
+        from app.core.archive import load_scores, player_season_averages, season_of
+        from app.models.player_game_score import PlayerGameScore
+        from app.models.player_team_history import PlayerTeamHistory
+        from app.worker.tasks.archive_scores import archive_day, archive_season, closed_seasons_to_compact
+
+        lebron, curry, _ = sample_players
+        days = [date(2024, 10, 22), date(2024, 10, 24), date(2024, 11, 2)]
+        db_session.add_all([
+            PlayerGameScore(player_id=lebron.id, game_date=days[0], points=20, fantasy_score=30.0),
+            PlayerGameScore(player_id=lebron.id, game_date=days[1], points=30, fantasy_score=50.0),
+            PlayerGameScore(player_id=curry.id, game_date=days[1], points=35, fantasy_score=55.0),
+            PlayerGameScore(player_id=curry.id, game_date=days[2], points=25, fantasy_score=35.0),
+            # LeBron à CLE jusqu'au 23 : l'équipe archivée est celle du jour du match
+            PlayerTeamHistory(player_id=lebron.id, team="CLE", valid_from=date(2024, 7, 1),
+                              valid_to=date(2024, 10, 23)),
+        ])
+        db_session.commit()
+
+        root = str(tmp_path)
+        assert [archive_day(db_session, day, root) for day in days] == [1, 2, 1]
+        assert season_of(days[0]) == "2024-25"
+
+        averages = player_season_averages("2024-25", root=root).to_pylist()
+        assert averages[0]["player_id"] == curry.id
+        assert averages[0]["games"] == 2
+        assert averages[1]["avg_fantasy_score"] == 40.0
+
+        # Saison terminée : un fichier par mois, mêmes données
+        assert closed_seasons_to_compact(date(2025, 10, 1), root) == ["2024-25"]
+        assert archive_season(db_session, "2024-25", root) == 4
+        season_dir = tmp_path / "player_game_scores" / "season=2024-25"
+        assert sorted(p.name for p in season_dir.rglob("*.parquet")) == ["part-0.parquet", "part-0.parquet"]
+        assert closed_seasons_to_compact(date(2025, 10, 1), root) == []
+
+        table = load_scores(season="2024-25", player_id=lebron.id, root=root)
+        assert table.column("fantasy_score").to_pylist() == [30.0, 50.0]
+        assert table.column("player_name").to_pylist() == [lebron.full_name] * 2
+        assert table.column("team").to_pylist() == ["CLE", "LAL"]
+
+    def test_archive_is_read_through_mmap(self, db_session, sample_players, tmp_path):
+        """Test : fichiers non compressés, relus par mmap"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from pyarrow import fs
+        from app.core.archive import day_file, open_archive
+        from app.models.player_game_score import PlayerGameScore
+        from app.worker.tasks.archive_scores import archive_day
+
+        lebron, _, _ = sample_players
+        day = date(2024, 10, 22)
+        db_session.add(PlayerGameScore(player_id=lebron.id, game_date=day, points=20, fantasy_score=30.0))
+        db_session.commit()
+
+        root = str(tmp_path)
+        assert archive_day(db_session, day, root) == 1
+        path = day_file(day, root)
+        columns = pq.ParquetFile(str(path)).metadata.row_group(0)
+        assert {columns.column(i).compression for i in range(columns.num_columns)} == {"UNCOMPRESSED"}
+
+        dataset = open_archive(root)
+        assert dataset.filesystem.equals(fs.LocalFileSystem(use_mmap=True))
+        assert dataset.to_table(columns=["fantasy_score"]).column(0).to_pylist() == [30.0]
+
+        with pa.memory_map(str(path)) as source:
+            assert pq.read_table(source, columns=["player_id"]).column(0).to_pylist() == [lebron.id]
@@ -56,6 +56,22 @@ class TestAuthentication:
         assert "access_token" in data
         assert data["token_type"] == "bearer"
 
+    def test_connexion_rehash_on_cost_change(self, client, db_session, test_user, monkeypatch):
+        """Test du re-hashage à la connexion quand BCRYPT_ROUNDS change"""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+        response = client.post(
+            "/api/v1/auth/connexion",
+            json={
+                "nom_utilisateur": "testuser",
+                "mot_de_passe": "testpass123"
+            }
+        )
+        assert response.status_code == 200
+        db_session.refresh(test_user)
+        assert test_user.mot_de_passe_hash.startswith("$2b$04$")
+
     def test_connexion_wrong_password(self, client, test_user):
         """Test de connexion avec mauvais mot de passe"""
         response = client.post(
@@ -105,3 +121,34 @@ class TestAdminEndpoints:
         """Test de récupération des utilisateurs sans authentification"""
         response = client.get("/api/v1/utilisateurs/admin/all")
         assert response.status_code == 401
+
+    def test_promote_invalidates_cached_user(self, client, admin_headers, auth_headers, test_user):
+        """Test du cache utilisateur : aucune requête, puis droits relus après promotion"""
+        from sqlalchemy import event
+        from tests.conftest import engine, async_engine
+
+        response = client.get("/api/v1/utilisateurs/admin/all", headers=auth_headers)
+        assert response.status_code == 403
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            if "utilisateurs" in statement:
+                statements.append(statement)
+
+        engines = [engine, async_engine.sync_engine]
+        for listened in engines:
+            event.listen(listened, "before_cursor_execute", count_statement)
+        try:
+            response = client.get("/api/v1/utilisateurs/admin/all", headers=auth_headers)
+        finally:
+            for listened in engines:
+                event.remove(listened, "before_cursor_execute", count_statement)
+        assert response.status_code == 403
+        assert statements == []
+
+        response = client.patch(f"/api/v1/utilisateurs/admin/{test_user.id}/promote", headers=admin_headers)
+        assert response.status_code == 200
+
+        response = client.get("/api/v1/utilisateurs/admin/all", headers=auth_headers)
+        assert response.status_code == 200
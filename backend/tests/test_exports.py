@@ -0,0 +1,51 @@
+"""Tests pour les exports en flux (NDJSON / CSV)"""
+import json
+from datetime import date
+
+
+class TestExports:
+    """Tests des endpoints d'export"""
+
+    def test_export_player_game_scores(self, client, db_session, auth_headers, sample_players):
+        """Test de l'export des scores par match : filtres, NDJSON et CSV"""
+        from app.models.player_game_score import PlayerGameScore
+        from app.models.player_team_history import PlayerTeamHistory
+
+        lebron, curry, _ = sample_players
+        db_session.add_all([
+            PlayerGameScore(player_id=lebron.id, game_date=date(2025, 10, 21), points=25, fantasy_score=40.5),
+            PlayerGameScore(player_id=lebron.id, game_date=date(2025, 10, 23), points=31, fantasy_score=52.0),
+            PlayerGameScore(player_id=curry.id, game_date=date(2025, 10, 23), points=28, fantasy_score=45.0),
+            # Échangé le 22 : le premier match reste attribué à CLE
+            PlayerTeamHistory(player_id=lebron.id, team="CLE", valid_from=date(2025, 7, 1),
+                              valid_to=date(2025, 10, 22)),
+        ])
+        db_session.commit()
+
+        response = client.get(
+            f"/api/v1/exports/player-game-scores?player_id={lebron.id}",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["game_date"] for row in rows] == ["2025-10-21", "2025-10-23"]
+        assert rows[1]["fantasy_score"] == 52.0
+        assert [row["team"] for row in rows] == ["CLE", "LAL"]
+
+        response = client.get("/api/v1/exports/player-game-scores?team=cle", headers=auth_headers)
+        assert [json.loads(line)["game_date"] for line in response.text.splitlines()] == ["2025-10-21"]
+
+        response = client.get(
+            "/api/v1/exports/player-game-scores?format=csv&start_date=2025-10-22",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        lines = response.text.strip().splitlines()
+        assert lines[0].startswith("id,game_date,player_id,player_name")
+        assert len(lines) == 3
+
+    def test_export_requires_authentication(self, client):
+        """Test de l'export sans authentification"""
+        response = client.get("/api/v1/exports/team-scores")
+        assert response.status_code == 401
@@ -13,6 +13,17 @@ class TestPlayers:
         assert "players" in data
         assert isinstance(data["players"], list)
 
+    def test_get_players_fast_serialization(self, client, sample_players):
+        """Test de la sérialisation directe : même JSON que PlayerRead"""
+        from app.schemas.player import PlayerRead
+
+        response = client.get("/api/v1/players?sort_by=fantasy_cost&sort_order=desc")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        first = max(sample_players, key=lambda p: p.fantasy_cost)
+        expected = PlayerRead.model_validate(first).model_dump(mode="json", by_alias=True)
+        assert response.json()["players"][0] == expected
+
     def test_get_players_search_by_name(self, client, sample_players):
         """Test de recherche de joueurs par nom"""
         response = client.get("/api/v1/players?search=LeBron")
@@ -20,3 +31,79 @@ class TestPlayers:
         data = response.json()
         assert "players" in data
         assert isinstance(data["players"], list)
+
+    def test_autocomplete_ignores_accents(self, client, db_session, sample_players):
+        """Test de l'autocomplétion insensible aux accents"""
+        from app.models.player import Player, Position
+        db_session.add(Player(
+            external_api_id=203999,
+            full_name="Nikola Jokić",
+            first_name="Nikola",
+            last_name="Jokić",
+            position=Position.C,
+            team="Denver Nuggets",
+            team_abbreviation="DEN",
+            fantasy_cost=18000000.0,
+            is_active=True
+        ))
+        db_session.commit()
+
+        response = client.get("/api/v1/players/autocomplete?q=jokic")
+        assert response.status_code == 200
+        suggestions = response.json()
+        assert [s["full_name"] for s in suggestions] == ["Nikola Jokić"]
+
+    def test_get_players_cursor_pagination(self, client, sample_players):
+        """Test de la pagination par curseur (pas de doublon entre les pages)"""
+        first = client.get("/api/v1/players?limit=2").json()
+        assert first["total"] == 3
+        assert first["next_cursor"]
+
+        second = client.get(f"/api/v1/players?limit=2&cursor={first['next_cursor']}").json()
+        assert second["total"] is None
+        assert second["next_cursor"] is None
+
+        ids = [p["id"] for p in first["players"] + second["players"]]
+        assert len(ids) == len(set(ids)) == 3
+
+        # Curseur modifié : valeur de tri du mauvais type → 400 (pas de 500)
+        from app.core.pagination import decode_cursor, encode_cursor
+        sort_key = "fantasy_cost:desc"
+        decode_cursor(first["next_cursor"], sort_key)
+        tampered = encode_cursor(sort_key, "pas un nombre", ids[0])
+        assert client.get(f"/api/v1/players?limit=2&cursor={tampered}").status_code == 400
+
+    def test_get_players_filters_from_catalog(self, client, sample_players):
+        """Test des filtres servis par le catalogue en mémoire"""
+        response = client.get("/api/v1/players?position=PG&max_salary=16000000")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["players"][0]["last_name"] == "Curry"
+
+
+def test_seed_team_history_starts_at_first_game(db_session, sample_players):
+    """Premier intervalle d'équipe : depuis le premier match, pas depuis la synchronisation"""
+    from datetime import date
+    from app.models.player_game_score import PlayerGameScore
+    from app.models.player_team_history import PlayerTeamHistory
+    from app.worker.tasks.detect_trades import record_team_history, seed_team_history
+
+    lebron, curry, _ = sample_players
+    db_session.add(PlayerGameScore(player_id=lebron.id, game_date=date(2024, 3, 2), fantasy_score=40.0))
+    db_session.commit()
+
+    season_start = date(2025, 10, 1)
+    assert seed_team_history(db_session, {lebron.id: "LAL", curry.id: "GSW"}, season_start) == 2
+    record_team_history(db_session, {lebron.id: "DAL"}, date(2025, 12, 1))
+    db_session.commit()
+
+    def team_on(player_id, day):
+        return db_session.query(PlayerTeamHistory.team).filter(
+            PlayerTeamHistory.player_id == player_id, PlayerTeamHistory.covers(day)
+        ).scalar()
+
+    assert team_on(lebron.id, date(2024, 3, 2)) == "LAL"
+    assert team_on(lebron.id, date(2025, 12, 1)) == "DAL"
+    assert team_on(curry.id, season_start) == "GSW"
+    assert team_on(curry.id, date(2025, 9, 30)) is None
@@ -0,0 +1,229 @@
+"""Tests pour le calcul et la consultation des scores d'équipes"""
+from datetime import date
+
+import pytest
+
+from app.models.league import League, LeagueType
+from app.models.player import Player, Position
+from app.models.fantasy_team import FantasyTeam
+from app.models.fantasy_team_player import FantasyTeamPlayer, RosterSlot
+from app.models.player_game_score import PlayerGameScore
+
+GAME_DATE = date(2025, 1, 15)
+
+
+def make_team(db_session, owner, sample_players, name="Monstars"):
+    """Équipe au roster complet : les 3 joueurs de test + 3 joueurs créés ici"""
+    league = League(name=f"Ligue {name}", type=LeagueType.PRIVATE, max_teams=8)
+    db_session.add(league)
+    db_session.flush()
+
+    players = list(sample_players)
+    for index, position in enumerate([Position.SG, Position.C, Position.PF]):
+        external_id = 900 + index
+        player = db_session.query(Player).filter_by(external_api_id=external_id).first()
+        if player is None:
+            player = Player(external_api_id=external_id, full_name=f"Joueur {index}", first_name="Joueur",
+                            last_name=str(index), position=position, team="Boston Celtics",
+                            team_abbreviation="BOS", fantasy_cost=5_000_000.0, is_active=True)
+            db_session.add(player)
+            db_session.flush()
+        players.append(player)
+
+    team = FantasyTeam(name=name, owner_id=owner.id, league_id=league.id)
+    db_session.add(team)
+    db_session.flush()
+
+    slots = [RosterSlot.SF, RosterSlot.PG, RosterSlot.UTIL, RosterSlot.SG, RosterSlot.C, RosterSlot.PF]
+    for player, slot in zip(players, slots):
+        db_session.add(FantasyTeamPlayer(fantasy_team_id=team.id, player_id=player.id,
+                                         roster_slot=slot, salary_at_acquisition=int(player.fantasy_cost)))
+    db_session.commit()
+    return team, players
+
+
+class TestTeamScoreDetail:
+    """Tests du détail d'un score quotidien"""
+
+    def test_detail_uses_lineup_of_the_day(self, client, db_session, auth_headers, test_user, sample_players):
+        """Test : le détail montre la lineup figée au calcul, en une requête"""
+        from sqlalchemy import event
+        from app.models.player_team_history import PlayerTeamHistory
+        from app.worker.tasks.calculate_team_scores import score_teams
+        from tests.conftest import engine
+
+        team, players = make_team(db_session, test_user, sample_players)
+        lebron, curry = players[0], players[1]
+        db_session.add_all([
+            PlayerGameScore(player_id=lebron.id, game_date=GAME_DATE, minutes_played=36,
+                            points=30, rebounds=8, assists=9, fantasy_score=55.5),
+            PlayerGameScore(player_id=curry.id, game_date=GAME_DATE, minutes_played=34,
+                            points=28, fantasy_score=40.0),
+            # Échangé depuis : l'équipe NBA affichée est celle du jour du match
+            PlayerTeamHistory(player_id=lebron.id, team="CLE", valid_from=date(2024, 7, 1),
+                              valid_to=date(2025, 2, 1)),
+        ])
+        db_session.commit()
+
+        assert score_teams(db_session, [team.id], GAME_DATE) == {team.id: 95.5}
+        db_session.commit()
+
+        # Le roster change après le match : le détail du jour ne bouge pas
+        db_session.query(FantasyTeamPlayer).filter_by(player_id=lebron.id).delete()
+        db_session.commit()
+
+        url = f"/api/v1/teams/{team.id}/scores"
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            if "utilisateurs" not in statement:
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = client.get(f"{url}/{GAME_DATE}", headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert response.status_code == 200
+        assert len(statements) == 1
+        data = response.json()
+        assert data["total_score"] == 95.5
+        assert data["players_who_played"] == 2
+        assert len(data["player_scores"]) == 6
+
+        by_player = {entry["player"]["id"]: entry for entry in data["player_scores"]}
+        assert by_player[lebron.id]["position_slot"] == "SF"
+        assert by_player[lebron.id]["player"]["team"] == "CLE"
+        assert by_player[lebron.id]["stats"]["assists"] == 9
+        assert by_player[players[3].id]["played"] is False
+        assert by_player[players[3].id]["stats"] is None
+
+        response = client.get(f"{url}/2025-01-16", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_bulk_scoring_persists_contributions(self, client, db_session, auth_headers, test_user, sample_players):
+        """Test : scores de plusieurs équipes écrits en masse, recalcul idempotent"""
+        from datetime import timedelta
+        from app.models.fantasy_team_score import FantasyTeamScore
+        from app.models.fantasy_team_score_player import FantasyTeamScorePlayer
+        from app.worker.tasks.calculate_team_scores import score_teams
+
+        team, players = make_team(db_session, test_user, sample_players)
+        other, _ = make_team(db_session, test_user, sample_players, name="Dream Squad")
+        incomplete, _ = make_team(db_session, test_user, sample_players, name="Incomplète")
+        db_session.query(FantasyTeamPlayer).filter_by(fantasy_team_id=incomplete.id, roster_slot=RosterSlot.C).delete()
+        yesterday = date.today() - timedelta(days=1)
+        db_session.add_all([
+            PlayerGameScore(player_id=players[0].id, game_date=yesterday, fantasy_score=40.0),
+            PlayerGameScore(player_id=players[4].id, game_date=yesterday, fantasy_score=-2.0),
+        ])
+        db_session.commit()
+        team_ids = [team.id, other.id, incomplete.id]
+
+        assert score_teams(db_session, team_ids, yesterday) == {team.id: 38.0, other.id: 38.0}
+        db_session.commit()
+
+        # Correction de stats puis recalcul : mise à jour, pas de doublon
+        db_session.query(PlayerGameScore).filter_by(player_id=players[0].id).update({"fantasy_score": 50.0})
+        assert score_teams(db_session, team_ids, yesterday)[team.id] == 48.0
+        db_session.commit()
+
+        team_score = db_session.query(FantasyTeamScore).filter_by(fantasy_team_id=team.id).one()
+        assert team_score.players_who_played == 2
+        lineup = db_session.query(FantasyTeamScorePlayer).filter_by(team_score_id=team_score.id).all()
+        assert len(lineup) == 6
+        assert {row.player_id: row.points for row in lineup if row.points is not None} == {
+            players[0].id: 50.0, players[4].id: -2.0
+        }
+
+        response = client.get(f"/api/v1/teams/{team.id}/scores", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["daily_scores"][0]["players_who_played"] == 2
+        assert [c["player_id"] for c in data["best_contributors"]] == [players[0].id, players[4].id]
+        assert data["best_contributors"][0]["total_points"] == 50.0
+
+    def test_rescore_only_teams_that_fielded_player(self, db_session, test_user, sample_players):
+        """Test : correction d'un joueur → seules ses équipes du jour sont recalculées"""
+        from app.models.fantasy_team_score import FantasyTeamScore
+        from app.worker.tasks.calculate_team_scores import rescore_teams_for_players, score_teams
+
+        team, players = make_team(db_session, test_user, sample_players)
+        other, _ = make_team(db_session, test_user, sample_players, name="Dream Squad")
+        lebron, curry = players[0], players[1]
+        # Dream Squad aligne un autre SF que LeBron
+        rookie = Player(external_api_id=999, full_name="Rookie", first_name="Rookie", last_name="Test",
+                        position=Position.SF, team="Boston Celtics", team_abbreviation="BOS",
+                        fantasy_cost=5_000_000.0, is_active=True)
+        db_session.add(rookie)
+        db_session.flush()
+        db_session.query(FantasyTeamPlayer).filter_by(fantasy_team_id=other.id, player_id=lebron.id).update(
+            {"player_id": rookie.id}
+        )
+        db_session.add_all([
+            PlayerGameScore(player_id=lebron.id, game_date=GAME_DATE, fantasy_score=30.0),
+            PlayerGameScore(player_id=curry.id, game_date=GAME_DATE, fantasy_score=20.0),
+        ])
+        db_session.commit()
+        assert score_teams(db_session, [team.id, other.id], GAME_DATE) == {team.id: 50.0, other.id: 20.0}
+        db_session.commit()
+
+        # LeBron quitte le roster après le match, puis sa ligne de stats est corrigée
+        db_session.query(FantasyTeamPlayer).filter_by(fantasy_team_id=team.id, player_id=lebron.id).delete()
+        db_session.query(PlayerGameScore).filter_by(player_id=lebron.id).update({"fantasy_score": 42.0})
+
+        team_score, other_score = (
+            db_session.query(FantasyTeamScore).filter_by(fantasy_team_id=team_id).one()
+            for team_id in (team.id, other.id)
+        )
+        assert rescore_teams_for_players(db_session, [lebron.id], GAME_DATE) == [team_score.id]
+        assert rescore_teams_for_players(db_session, [lebron.id], date(2025, 1, 16)) == []
+        db_session.commit()
+        db_session.expire_all()
+
+        assert team_score.total_score == 62.0
+        assert team_score.players_who_played == 2
+        assert other_score.total_score == 20.0
+
+
+def live_stats(points, rebounds=5, assists=5):
+    """Ligne de stats au format de l'API live"""
+    return {"minutes": "PT32M10S", "points": points, "reboundsTotal": rebounds, "assists": assists,
+            "fieldGoalsMade": 8, "fieldGoalsAttempted": 16}
+
+
+def test_reconcile_day_writes_only_changed_lines(db_session, test_user, sample_players):
+    """Réconciliation : seules les lignes corrigées sont réécrites et leurs équipes recalculées"""
+    from app.models.fantasy_team_score import FantasyTeamScore
+    from app.worker.tasks.calculate_team_scores import score_teams
+    from app.worker.tasks.reconcile_boxscores import reconcile_day
+
+    team, players = make_team(db_session, test_user, sample_players)
+    lebron, curry, giannis = sample_players
+    lines = [(lebron.external_api_id, live_stats(20)), (curry.external_api_id, live_stats(30)),
+             (99999, live_stats(10)), (giannis.external_api_id, {"minutes": "PT0M"})]
+
+    # Premier passage : lignes absentes → insérées
+    assert reconcile_day(db_session, GAME_DATE, lines)["inserted"] == 2
+    db_session.commit()
+    score_teams(db_session, [team.id], GAME_DATE)
+    db_session.commit()
+    team_score = db_session.query(FantasyTeamScore).filter_by(fantasy_team_id=team.id).one()
+    total_before = team_score.total_score
+
+    # Même boxscore : aucune écriture
+    assert reconcile_day(db_session, GAME_DATE, lines) == {
+        "checked": 3, "updated": 0, "inserted": 0, "teams_rescored": 0
+    }
+
+    # Correction NBA : +2 rebonds pour LeBron seulement
+    lines[0] = (lebron.external_api_id, live_stats(20, rebounds=7))
+    result = reconcile_day(db_session, GAME_DATE, lines)
+    db_session.commit()
+    db_session.expire_all()
+
+    assert result == {"checked": 3, "updated": 1, "inserted": 0, "teams_rescored": 1}
+    corrected = db_session.query(PlayerGameScore).filter_by(player_id=lebron.id).one()
+    assert corrected.rebounds == 7
+    assert team_score.total_score == pytest.approx(total_before + 2 * 1.2)
@@ -22,3 +22,225 @@ class TestFantasyTeams:
         assert response.status_code == 200
         teams = response.json()
         assert isinstance(teams, list)
+
+    def test_available_players_excludes_roster(self, client, db_session, auth_headers, sample_players):
+        """Test des joueurs disponibles : roster exclu, postes libres calculés"""
+        from app.models.league import League, LeagueType
+        league = League(name="Solo Test", type=LeagueType.SOLO)
+        db_session.add(league)
+        db_session.commit()
+
+        team = client.post(
+            "/api/v1/teams/",
+            json={"name": "Equipe Test", "league_id": league.id},
+            headers=auth_headers
+        ).json()
+        lebron = sample_players[0]
+        client.post(
+            f"/api/v1/teams/{team['id']}/roster",
+            json={"player_id": lebron.id, "position_slot": "SF"},
+            headers=auth_headers
+        )
+
+        response = client.get(f"/api/v1/teams/{team['id']}/available-players", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert "SF" not in data["available_positions"]
+        assert lebron.id not in [p["player"]["id"] for p in data["players"]]
+        assert data["total_count"] == 2
+
+    def test_get_roster_single_query(self, client, db_session, auth_headers, sample_players):
+        """Test du roster : équipe, joueurs et transferts chargés en une requête"""
+        from sqlalchemy import event
+        from app.models.league import League, LeagueType
+        from tests.conftest import engine
+
+        league = League(name="Solo Test", type=LeagueType.SOLO)
+        db_session.add(league)
+        db_session.commit()
+        team = client.post(
+            "/api/v1/teams/",
+            json={"name": "Equipe Test", "league_id": league.id},
+            headers=auth_headers
+        ).json()
+        for player, slot in zip(sample_players, ["SF", "PG", "PF"]):
+            client.post(
+                f"/api/v1/teams/{team['id']}/roster",
+                json={"player_id": player.id, "position_slot": slot},
+                headers=auth_headers
+            )
+        db_session.expire_all()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            if "utilisateurs" not in statement:
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = client.get(f"/api/v1/teams/{team['id']}/roster", headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert response.status_code == 200
+        filled = [slot for slot in response.json()["roster"] if slot["player"]]
+        assert len(filled) == 3
+        assert len(statements) == 1
+
+    def test_submit_lineup(self, client, db_session, auth_headers, sample_players):
+        """Test de la soumission d'un lineup complet en une requête"""
+        from app.models.league import League, LeagueType
+        from app.models.player import Player, Position
+
+        league = League(name="Solo Test", type=LeagueType.SOLO)
+        extra = [
+            Player(external_api_id=1000 + i, full_name=f"Joueur {i}", first_name="Joueur", last_name=str(i),
+                   position=position, team="Test", team_abbreviation="TST", fantasy_cost=3_000_000, is_active=True)
+            for i, position in enumerate([Position.SG, Position.C, Position.C])
+        ]
+        db_session.add_all([league] + extra)
+        db_session.commit()
+        team = client.post(
+            "/api/v1/teams/",
+            json={"name": "Equipe Test", "league_id": league.id},
+            headers=auth_headers
+        ).json()
+
+        lebron, curry, giannis = sample_players
+        lineup = [
+            {"position_slot": "PG", "player_id": curry.id},
+            {"position_slot": "SG", "player_id": extra[0].id},
+            {"position_slot": "SF", "player_id": lebron.id},
+            {"position_slot": "PF", "player_id": giannis.id},
+            {"position_slot": "C", "player_id": extra[1].id},
+            {"position_slot": "UTIL", "player_id": extra[2].id},
+        ]
+        response = client.put(f"/api/v1/teams/{team['id']}/lineup", json={"lineup": lineup}, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["is_roster_complete"] is True
+        assert data["salary_cap_used"] == 57_500_000
+
+        # Mauvais poste : rien n'est modifié
+        lineup[0] = {"position_slot": "PG", "player_id": extra[0].id}
+        lineup[1] = {"position_slot": "SG", "player_id": curry.id}
+        response = client.put(f"/api/v1/teams/{team['id']}/lineup", json={"lineup": lineup}, headers=auth_headers)
+        assert response.status_code == 400
+
+        # Cap déjà consommé par une écriture concurrente : l'UPDATE conditionnel refuse
+        from app.models.fantasy_team import FantasyTeam
+        backup = Player(external_api_id=1003, full_name="Joueur 3", first_name="Joueur", last_name="3",
+                        position=Position.C, team="Test", team_abbreviation="TST", fantasy_cost=4_000_000, is_active=True)
+        db_session.add(backup)
+        db_session.query(FantasyTeam).filter_by(id=team["id"]).update({"salary_cap_used": 62_000_000})
+        db_session.commit()
+        lineup[0] = {"position_slot": "PG", "player_id": curry.id}
+        lineup[1] = {"position_slot": "SG", "player_id": extra[0].id}
+        lineup[5] = {"position_slot": "UTIL", "player_id": backup.id}
+        response = client.put(f"/api/v1/teams/{team['id']}/lineup", json={"lineup": lineup}, headers=auth_headers)
+        assert response.status_code == 400
+        db_session.expire_all()
+        assert db_session.get(FantasyTeam, team["id"]).salary_cap_used == 62_000_000
+
+    def test_add_player_salary_cap_atomic(self, client, db_session, auth_headers, sample_players):
+        """Test de l'ajout au-delà du salary cap : refusé, cap et roster inchangés"""
+        from app.models.league import League, LeagueType
+        from app.models.player import Player, Position
+
+        league = League(name="Solo Test", type=LeagueType.SOLO)
+        expensive = Player(external_api_id=2000, full_name="Joueur Cher", first_name="Joueur", last_name="Cher",
+                           position=Position.C, team="Test", team_abbreviation="TST", fantasy_cost=12_000_000, is_active=True)
+        db_session.add_all([league, expensive])
+        db_session.commit()
+        team = client.post(
+            "/api/v1/teams/",
+            json={"name": "Equipe Test", "league_id": league.id},
+            headers=auth_headers
+        ).json()
+        for player, slot in zip(sample_players, ["SF", "PG", "PF"]):
+            response = client.post(
+                f"/api/v1/teams/{team['id']}/roster",
+                json={"player_id": player.id, "position_slot": slot},
+                headers=auth_headers
+            )
+            assert response.status_code == 201
+
+        response = client.post(
+            f"/api/v1/teams/{team['id']}/roster",
+            json={"player_id": expensive.id, "position_slot": "C"},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+        assert "Salary cap" in response.json()["detail"]
+
+        roster = client.get(f"/api/v1/teams/{team['id']}/roster", headers=auth_headers).json()
+        assert roster["salary_cap_used"] == 48_500_000
+        assert len([slot for slot in roster["roster"] if slot["player"]]) == 3
+
+        # Retrait : le cap est libéré par un UPDATE atomique
+        response = client.delete(f"/api/v1/teams/{team['id']}/roster/{sample_players[0].id}", headers=auth_headers)
+        assert response.status_code == 200
+        roster = client.get(f"/api/v1/teams/{team['id']}/roster", headers=auth_headers).json()
+        assert roster["salary_cap_used"] == 48_500_000 - sample_players[0].fantasy_cost
+
+    def test_idempotency_key_replays_response(self, client, db_session, auth_headers, sample_players):
+        """Test de l'Idempotency-Key : un essai rejoué renvoie la réponse d'origine"""
+        from app.models.league import League, LeagueType
+        from app.models.fantasy_team import FantasyTeam
+
+        league = League(name="Solo Test", type=LeagueType.SOLO)
+        db_session.add(league)
+        db_session.commit()
+
+        headers = {**auth_headers, "Idempotency-Key": "creation-equipe-1"}
+        payload = {"name": "Equipe Test", "league_id": league.id}
+        first = client.post("/api/v1/teams/", json=payload, headers=headers)
+        retry = client.post("/api/v1/teams/", json=payload, headers=headers)
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+        assert db_session.query(FantasyTeam).count() == 1
+
+        team_id = first.json()["id"]
+        headers = {**auth_headers, "Idempotency-Key": "ajout-lebron-1"}
+        payload = {"player_id": sample_players[0].id, "position_slot": "SF"}
+        first = client.post(f"/api/v1/teams/{team_id}/roster", json=payload, headers=headers)
+        retry = client.post(f"/api/v1/teams/{team_id}/roster", json=payload, headers=headers)
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+
+        # Même clé, autre requête : refusée
+        payload = {"player_id": sample_players[1].id, "position_slot": "PG"}
+        response = client.post(f"/api/v1/teams/{team_id}/roster", json=payload, headers=headers)
+        assert response.status_code == 422
+
+    def test_transfers_this_week_counter(self, client, db_session, auth_headers, sample_players):
+        """Test du compteur de transferts : incrémenté au retrait, remis à 0 par le worker"""
+        from app.models.league import League, LeagueType
+        from app.models.fantasy_team import FantasyTeam
+        from app.worker.tasks.reset_weekly_transfers import reset_transfer_counters
+
+        league = League(name="Solo Test", type=LeagueType.SOLO)
+        db_session.add(league)
+        db_session.commit()
+        team_id = client.post(
+            "/api/v1/teams/",
+            json={"name": "Equipe Test", "league_id": league.id},
+            headers=auth_headers
+        ).json()["id"]
+        for player, slot in zip(sample_players[:2], ["SF", "PG"]):
+            client.post(
+                f"/api/v1/teams/{team_id}/roster",
+                json={"player_id": player.id, "position_slot": slot},
+                headers=auth_headers
+            )
+        client.delete(f"/api/v1/teams/{team_id}/roster/{sample_players[0].id}", headers=auth_headers)
+
+        team = db_session.get(FantasyTeam, team_id)
+        db_session.refresh(team)
+        assert team.transfers_this_week == 1
+
+        assert reset_transfer_counters(db_session) == 1
+        db_session.commit()
+        db_session.refresh(team)
+        assert team.transfers_this_week == 0
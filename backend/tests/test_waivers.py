@@ -0,0 +1,161 @@
+"""Tests pour la résolution des demandes de waiver"""
+import pytest
+
+from app.core.ownership import OwnershipBitmap
+from app.models.league import League, LeagueType, WaiverMode
+from app.models.fantasy_team import FantasyTeam
+from app.models.fantasy_team_player import FantasyTeamPlayer, RosterSlot
+from app.models.transfer import Transfer, TransferType, TransferStatus
+from app.worker.tasks.process_waivers import (
+    resolve_waiver_claims,
+    resolve_faab_claims,
+    process_league_waivers
+)
+
+
+SALARY_CAP = 60_000_000
+
+
+def make_teams():
+    """Deux équipes : A (priorité 1) et B (priorité 2), un PG chacune"""
+    return {
+        1: {"priority": 1, "cap_used": 10_000_000,
+            "roster": {"PG": {"player_id": 100, "salary": 10_000_000, "row_id": 1}}},
+        2: {"priority": 2, "cap_used": 8_000_000,
+            "roster": {"PG": {"player_id": 200, "salary": 8_000_000, "row_id": 2}}},
+    }
+
+
+PLAYERS = {
+    300: {"cost": 12_000_000, "position": "PG", "is_active": True},
+    301: {"cost": 5_000_000, "position": "C", "is_active": True},
+    302: {"cost": 70_000_000, "position": "SF", "is_active": True},
+}
+
+
+class TestWaiverResolution:
+    """Tests du moteur de résolution en mémoire"""
+
+    def test_priority_wins_contested_player(self):
+        """L'équipe prioritaire obtient le joueur, l'autre est refusée"""
+        teams = make_teams()
+        claims = [
+            {"id": 1, "team_id": 2, "player_id": 300, "roster_slot": "PG"},
+            {"id": 2, "team_id": 1, "player_id": 300, "roster_slot": "PG"},
+        ]
+
+        decisions = resolve_waiver_claims(teams, claims, PLAYERS, SALARY_CAP)
+
+        by_claim = {d["claim"]["id"]: d for d in decisions}
+        assert by_claim[2]["granted"] is True
+        assert by_claim[2]["player_out"]["player_id"] == 100
+        assert by_claim[1]["granted"] is False
+        assert teams[1]["roster"]["PG"]["player_id"] == 300
+        assert teams[1]["cap_used"] == 12_000_000
+
+    def test_granted_team_moves_to_back(self):
+        """L'équipe servie passe en dernière priorité"""
+        teams = make_teams()
+        claims = [
+            {"id": 1, "team_id": 1, "player_id": 301, "roster_slot": "C"},
+            {"id": 2, "team_id": 1, "player_id": 300, "roster_slot": "PG"},
+            {"id": 3, "team_id": 2, "player_id": 300, "roster_slot": "PG"},
+        ]
+
+        decisions = resolve_waiver_claims(teams, claims, PLAYERS, SALARY_CAP)
+
+        # A obtient son C, puis B passe devant pour le PG
+        assert [d["claim"]["id"] for d in decisions if d["granted"]] == [1, 3]
+        assert teams[1]["priority"] == 1
+        assert teams[2]["priority"] == 2
+
+    def test_position_and_salary_cap_checks(self):
+        """Refus si le poste ne correspond pas ou si le cap est dépassé"""
+        teams = make_teams()
+        claims = [
+            {"id": 1, "team_id": 1, "player_id": 301, "roster_slot": "PG"},
+            {"id": 2, "team_id": 2, "player_id": 302, "roster_slot": "UTIL"},
+        ]
+
+        decisions = resolve_waiver_claims(teams, claims, PLAYERS, SALARY_CAP)
+
+        assert not any(d["granted"] for d in decisions)
+        assert teams[1]["priority"] == 1
+        assert teams[2]["roster"] == make_teams()[2]["roster"]
+
+
+class TestFaabResolution:
+    """Tests des enchères FAAB"""
+
+    def test_highest_bid_wins_and_loser_cascades(self):
+        """La plus grosse enchère l'emporte, le perdant passe à sa demande suivante"""
+        teams = make_teams()
+        for team in teams.values():
+            team["faab_remaining"] = 100
+        claims = [
+            {"id": 1, "team_id": 1, "player_id": 300, "roster_slot": "PG", "bid": 20},
+            {"id": 2, "team_id": 1, "player_id": 301, "roster_slot": "C", "bid": 5},
+            {"id": 3, "team_id": 2, "player_id": 300, "roster_slot": "PG", "bid": 35},
+        ]
+
+        decisions = resolve_faab_claims(teams, claims, PLAYERS, SALARY_CAP)
+
+        by_claim = {d["claim"]["id"]: d for d in decisions}
+        assert by_claim[3]["granted"] is True
+        assert by_claim[1]["granted"] is False
+        assert by_claim[2]["granted"] is True
+        assert teams[2]["faab_remaining"] == 65
+        assert teams[1]["faab_remaining"] == 95
+
+    def test_tie_broken_by_priority_and_budget_enforced(self):
+        """Égalité départagée par la priorité, enchère hors budget refusée"""
+        teams = make_teams()
+        teams[1]["faab_remaining"] = 10
+        teams[2]["faab_remaining"] = 10
+        claims = [
+            {"id": 1, "team_id": 2, "player_id": 301, "roster_slot": "C", "bid": 10},
+            {"id": 2, "team_id": 1, "player_id": 301, "roster_slot": "C", "bid": 10},
+            {"id": 3, "team_id": 2, "player_id": 300, "roster_slot": "PG", "bid": 50},
+        ]
+
+        decisions = resolve_faab_claims(teams, claims, PLAYERS, SALARY_CAP)
+
+        by_claim = {d["claim"]["id"]: d for d in decisions}
+        assert by_claim[2]["granted"] is True
+        assert by_claim[1]["granted"] is False
+        assert by_claim[3]["granted"] is False
+        assert "FAAB" in by_claim[3]["reason"]
+
+
+def test_process_league_waivers_applies_changes(db_session, test_user, sample_players):
+    """Le traitement d'une ligue met à jour roster, cap, budget et demandes"""
+    lebron, curry, giannis = sample_players
+    league = League(name="Ligue FAAB", type=LeagueType.PRIVATE, max_teams=8,
+                    waiver_mode=WaiverMode.FAAB, faab_budget=100)
+    db_session.add(league)
+    db_session.flush()
+
+    team = FantasyTeam(name="Monstars", owner_id=test_user.id, league_id=league.id,
+                       waiver_priority=1, salary_cap_used=16_000_000)
+    db_session.add(team)
+    db_session.flush()
+
+    db_session.add(FantasyTeamPlayer(fantasy_team_id=team.id, player_id=lebron.id,
+                                     roster_slot=RosterSlot.UTIL, salary_at_acquisition=16_000_000))
+    db_session.add(Transfer(fantasy_team_id=team.id, player_id=giannis.id, transfer_type=TransferType.ADD,
+                            status=TransferStatus.PENDING, roster_slot="UTIL",
+                            salary_at_transfer=17_000_000, bid_amount=30))
+    db_session.commit()
+
+    stats = process_league_waivers(db_session, league)
+    db_session.expire_all()
+
+    assert stats == {"processed": 1, "granted": 1, "denied": 0}
+    roster = db_session.query(FantasyTeamPlayer).filter_by(fantasy_team_id=team.id).all()
+    assert [slot.player_id for slot in roster] == [giannis.id]
+    assert team.salary_cap_used == 17_000_000
+    assert team.faab_remaining == 70
+    drop = db_session.query(Transfer).filter_by(transfer_type=TransferType.DROP).one()
+    assert drop.player_id == lebron.id
+    assert giannis.id in OwnershipBitmap(league.ownership_bitmap)
+    assert lebron.id not in OwnershipBitmap(league.ownership_bitmap)